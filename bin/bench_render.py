@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+"""
+Deterministic render benchmark for every display mode.
+
+Feeds fixed verse_data fixtures through ImageGenerator.create_verse_image at a
+fixed render time, with the weather and news services stubbed, and reports
+per-mode p50/p95 latency, peak RSS and tracemalloc allocations as JSON so
+results can be compared across commits. Runs headless with no network.
+
+Every iteration renders the same frame, so the finished-frame cache is off by
+default and each timed render draws the frame in full; --frame-cache measures
+the cache-hit path instead.
+
+    python bin/bench_render.py --iterations 20 --output bench.json
+    python bin/bench_render.py --frame-cache --output bench_cached.json
+    python bin/bench_render.py --compare bench.json
+"""
+
+import argparse
+import gc
+import json
+import math
+import os
+import platform
+import random
+import resource
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+# Headless and reproducible before any project module reads its settings
+os.environ['SIMULATION_MODE'] = 'true'
+os.environ.setdefault('DISPLAY_MIRROR', 'false')
+os.environ.setdefault('LAYER_CACHE_DISK_ENABLED', 'false')
+
+# Add src directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+RENDER_AT = datetime(2024, 3, 15, 14, 37, 0)
+
+SUMMARY_TEXT = ' '.join([
+    "The book of Romans is Paul's most systematic presentation of the gospel, written to the church in Rome",
+    "before his planned visit. It explains that all people, Jew and Gentile alike, have sinned and fall short",
+    "of the glory of God, and that righteousness comes as a gift through faith in Jesus Christ. Paul traces",
+    "the promise back to Abraham, describes the new life of believers united with Christ, and wrestles with",
+    "the place of Israel in God's plan. The closing chapters turn to practical living: offering ourselves as",
+    "living sacrifices, loving one another sincerely, respecting authorities, and welcoming those whose",
+    "convictions differ on disputable matters."
+] * 3)
+
+DEVOTIONAL_TEXT = ' '.join([
+    "When the disciples faced the storm on the Sea of Galilee, the waves were real and the danger was real.",
+    "Yet Jesus slept in the stern, resting in the Father's care. Our storms often feel the same: sudden,",
+    "overwhelming and beyond our control. Today, bring the specific worry in front of you to God in prayer.",
+    "Name it plainly. Then remember that the One who commands the wind and the waves is with you in the boat,",
+    "and His presence is not diminished by the size of the storm."
+] * 2)
+
+VERSE_FIXTURES = {
+    'verse': {
+        'reference': 'John 14:37', 'book': 'John', 'chapter': 14, 'verse': 37,
+        'text': 'Peace I leave with you; my peace I give you. I do not give to you as the world gives. '
+                'Do not let your hearts be troubled and do not be afraid.',
+        'translation': 'kjv', 'time_format': '12', 'display_mode': 'time'
+    },
+    'parallel': {
+        'reference': 'Psalm 14:37', 'book': 'Psalms', 'chapter': 14, 'verse': 37,
+        'text': 'The LORD is my shepherd; I shall not want. He maketh me to lie down in green pastures.',
+        'secondary_text': 'The LORD is my shepherd, I lack nothing. He makes me lie down in green pastures.',
+        'primary_translation': 'KJV', 'secondary_translation': 'NIV',
+        'parallel_mode': True, 'translation': 'kjv', 'time_format': '12', 'display_mode': 'time'
+    },
+    'summary': {
+        'reference': 'Romans Summary', 'book': 'Romans', 'text': SUMMARY_TEXT,
+        'is_summary': True, 'translation': 'kjv', 'time_format': '12', 'display_mode': 'time'
+    },
+    'devotional': {
+        'reference': 'Faith\'s Checkbook - March 15', 'text': DEVOTIONAL_TEXT,
+        'devotional_title': "Today's Devotional", 'is_devotional': True,
+        'rotation_minutes': 5, 'rotation_slot': 3, 'time_format': '12', 'display_mode': 'devotional'
+    },
+    'date_event': {
+        'reference': 'Exodus 12:13', 'book': 'Exodus', 'chapter': 12, 'verse': 13,
+        'text': 'And the blood shall be to you for a token upon the houses where ye are: and when I see '
+                'the blood, I will pass over you.',
+        'is_date_event': True, 'event_name': 'Passover', 'date_match': 'exact',
+        'event_description': 'Commemorates the deliverance of Israel from slavery in Egypt.',
+        'translation': 'kjv', 'time_format': '12', 'display_mode': 'date'
+    },
+    'news': {'is_news_mode': True, 'reference': 'Israel News', 'text': '', 'display_mode': 'news'},
+    'weather': {'is_weather_mode': True, 'reference': 'Weather', 'text': '', 'display_mode': 'weather'}
+}
+
+NEWS_FIXTURE = [
+    {
+        'title': f'Fixture headline {index + 1}: archaeologists document a newly excavated site near Jerusalem',
+        'description': 'A team working on the site described pottery, coins and inscriptions spanning several '
+                       'periods, and said further seasons of excavation are planned. ' * 2,
+        'published': RENDER_AT,
+        'published_str': RENDER_AT.strftime("%m/%d %I:%M %p"),
+        'source': 'Benchmark Wire',
+        'age_hours': index
+    }
+    for index in range(5)
+]
+
+
+def _weather_fixture(weather_service, location_name):
+    """Fixed forecast parsed by the real service helpers."""
+    dates = [f"2024-03-{day:02d}" for day in range(15, 22)]
+    return {
+        'location': location_name,
+        'latitude': 0.0,
+        'longitude': 0.0,
+        'current': weather_service._parse_current_weather(
+            {'temperature': 18.5, 'windspeed': 12.0, 'weathercode': 2, 'time': '2024-03-15T14:00'}),
+        'daily': weather_service._parse_daily_forecast({
+            'time': dates,
+            'temperature_2m_max': [21.0, 22.5, 19.0, 17.5, 20.0, 23.0, 24.5],
+            'temperature_2m_min': [11.0, 12.5, 10.0, 9.5, 11.5, 13.0, 14.0],
+            'weathercode': [2, 0, 61, 63, 3, 1, 0],
+            'precipitation_sum': [0.0, 0.0, 4.2, 8.1, 0.3, 0.0, 0.0],
+            'windspeed_10m_max': [15.0, 10.0, 22.0, 30.0, 18.0, 12.0, 9.0]
+        }),
+        'timezone': 'UTC'
+    }
+
+
+def stub_services():
+    """Replace network-backed service calls with fixed fixtures."""
+    from weather_service import weather_service
+    from news_service import news_service
+
+    location = {'latitude': 40.0, 'longitude': -75.0, 'city': 'Benchmark City', 'region': '',
+                'country': 'US', 'timezone': 'UTC', 'is_custom': True}
+    weather_service.get_current_location = lambda: location
+    weather_service._get_second_location = lambda: {
+        'enabled': True, 'name': 'Jerusalem, Israel', 'latitude': 31.7683, 'longitude': 35.2137}
+    weather_service.get_weather_forecast = lambda latitude, longitude, location_name='': _weather_fixture(
+        weather_service, location_name)
+    weather_service.get_moon_phase_data = lambda days=7: {
+        'phases': [{'date': '2024-03-17', 'phase': 'First Quarter', 'time': '12:00', 'day_name': 'Sunday'},
+                   {'date': '2024-03-25', 'phase': 'Full Moon', 'time': '12:00', 'day_name': 'Monday'}],
+        'current_illumination': 38.0, 'current_phase': 'Waxing Crescent', 'updated': RENDER_AT.isoformat()}
+
+    news_service.get_israel_news = lambda force_refresh=False: NEWS_FIXTURE
+    news_service.get_current_article = lambda: NEWS_FIXTURE[0]
+    news_service.current_article_index = 0
+
+
+def percentile(samples, fraction):
+    """Nearest-rank percentile of the samples."""
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, math.ceil(fraction * len(ordered)) - 1))
+    return ordered[index]
+
+
+def peak_rss_kb() -> int:
+    """Peak resident set size of this process in KB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == 'darwin' else peak
+
+
+def bench_mode(image_generator, verse_data, iterations, warmup):
+    """Time repeated renders of one fixture, then measure one render under tracemalloc."""
+    for _ in range(warmup):
+        image_generator.create_verse_image(dict(verse_data), at=RENDER_AT)
+
+    timings = []
+    for _ in range(iterations):
+        data = dict(verse_data)
+        gc.collect()
+        start = time.perf_counter()
+        image_generator.create_verse_image(data, at=RENDER_AT)
+        timings.append((time.perf_counter() - start) * 1000.0)
+
+    # Allocation profile runs separately so tracing overhead stays out of the timings
+    gc.collect()
+    tracemalloc.start()
+    image = image_generator.create_verse_image(dict(verse_data), at=RENDER_AT)
+    current, peak = tracemalloc.get_traced_memory()
+    blocks = sum(stat.count for stat in tracemalloc.take_snapshot().statistics('filename'))
+    tracemalloc.stop()
+
+    return {
+        'iterations': iterations,
+        'p50_ms': round(percentile(timings, 0.50), 3),
+        'p95_ms': round(percentile(timings, 0.95), 3),
+        'mean_ms': round(sum(timings) / len(timings), 3),
+        'min_ms': round(min(timings), 3),
+        'max_ms': round(max(timings), 3),
+        'alloc_peak_kb': round(peak / 1024.0, 1),
+        'alloc_retained_kb': round(current / 1024.0, 1),
+        'alloc_blocks': blocks,
+        'peak_rss_kb': peak_rss_kb(),
+        'image_size': list(image.size)
+    }
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              cwd=Path(__file__).parent.parent, timeout=5).stdout.strip() or 'unknown'
+    except Exception:
+        return 'unknown'
+
+
+def compare(results, baseline_path):
+    """Print p50/p95 changes against a previous results file."""
+    with open(baseline_path, 'r') as f:
+        baseline = json.load(f)
+    print(f"\nCompared with {baseline.get('commit', 'unknown')} ({baseline_path}):")
+    if baseline.get('frame_cache') != results['frame_cache']:
+        print(f"  warning: frame cache was {baseline.get('frame_cache')} in the baseline and "
+              f"{results['frame_cache']} now, so timings are not comparable")
+    for mode, stats in results['modes'].items():
+        old = baseline.get('modes', {}).get(mode)
+        if not old:
+            print(f"  {mode:<11} (no baseline)")
+            continue
+        changes = []
+        for field in ('p50_ms', 'p95_ms', 'alloc_peak_kb'):
+            delta = (stats[field] - old[field]) / old[field] * 100.0 if old[field] else 0.0
+            changes.append(f"{field} {old[field]:.1f} -> {stats[field]:.1f} ({delta:+.1f}%)")
+        print(f"  {mode:<11} " + ', '.join(changes))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark Bible Clock rendering for all display modes')
+    parser.add_argument('--iterations', type=int, default=20, help='Timed renders per mode')
+    parser.add_argument('--warmup', type=int, default=2, help='Untimed renders per mode before timing')
+    parser.add_argument('--modes', nargs='+', choices=sorted(VERSE_FIXTURES), default=list(VERSE_FIXTURES),
+                        help='Modes to benchmark (default: all)')
+    parser.add_argument('--output', default='bench_render.json', help='JSON results file')
+    parser.add_argument('--compare', metavar='BASELINE', help='Previous results file to compare against')
+    parser.add_argument('--frame-cache', action='store_true',
+                        help='Keep the finished-frame cache on and time cache hits instead of full renders')
+    args = parser.parse_args()
+
+    # Read by frame_cache at import, so set before image_generator is imported
+    os.environ['FRAME_CACHE_ENABLED'] = 'true' if args.frame_cache else 'false'
+
+    import logging
+    logging.basicConfig(level=logging.ERROR)
+
+    random.seed(0)
+    stub_services()
+    from image_generator import ImageGenerator
+    image_generator = ImageGenerator()
+
+    results = {
+        'commit': git_commit(),
+        'timestamp': datetime.now().isoformat(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'render_at': RENDER_AT.isoformat(),
+        'display': f"{image_generator.width}x{image_generator.height}",
+        'frame_cache': args.frame_cache,
+        'modes': {}
+    }
+
+    for mode in args.modes:
+        stats = bench_mode(image_generator, VERSE_FIXTURES[mode], max(1, args.iterations), max(0, args.warmup))
+        results['modes'][mode] = stats
+        print(f"{mode:<11} p50 {stats['p50_ms']:8.1f} ms  p95 {stats['p95_ms']:8.1f} ms  "
+              f"alloc peak {stats['alloc_peak_kb']:9.1f} KB  rss {stats['peak_rss_kb']} KB")
+
+    with open(args.output, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"\nResults written to {args.output}")
+
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == '__main__':
+    main()
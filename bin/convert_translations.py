@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Convert cached translation JSON files to memory-mappable binary store files.
+"""
+
+import sys
+import json
+import argparse
+from pathlib import Path
+
+# Add src directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from bible_store import convert_json_to_binary
+
+def main():
+    parser = argparse.ArgumentParser(description='Convert translation JSON files to binary store format')
+    parser.add_argument('--data-dir', default='data', help='Data directory containing bible_structure.json')
+    parser.add_argument('translations', nargs='*', help='Translation file names (e.g. kjv amp nasb1995); default: all')
+    args = parser.parse_args()
+    
+    data_dir = Path(args.data_dir)
+    translations_dir = data_dir / 'translations'
+    
+    with open(data_dir / 'bible_structure.json', 'r') as f:
+        bible_structure = json.load(f)
+    
+    if args.translations:
+        json_files = [translations_dir / f'bible_{name}.json' for name in args.translations]
+    else:
+        json_files = sorted(translations_dir.glob('bible_*.json'))
+    
+    failures = 0
+    for json_path in json_files:
+        if not json_path.exists():
+            print(f"❌ {json_path} not found")
+            failures += 1
+            continue
+        
+        binary_path = json_path.with_suffix('.bin')
+        try:
+            verse_count = convert_json_to_binary(json_path, binary_path, bible_structure)
+            print(f"✅ {json_path.name} -> {binary_path.name} ({verse_count} verses, {binary_path.stat().st_size} bytes)")
+        except Exception as e:
+            print(f"❌ Failed to convert {json_path.name}: {e}")
+            failures += 1
+    
+    return 1 if failures else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
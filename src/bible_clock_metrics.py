@@ -6,14 +6,17 @@ Tracks all statistics requirements in real-time with proper aggregation.
 
 import json
 import logging
+import os
 import time
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 from pathlib import Path
 from typing import Dict, List, Any
 from dataclasses import dataclass, asdict
 from collections import defaultdict
 import threading
 
+from event_log import event_log
+
 logger = logging.getLogger(__name__)
 
 @dataclass
@@ -31,7 +34,7 @@ class MetricsSnapshot:
 class BibleClockMetrics:
     """Real-time metrics tracking for Bible Clock."""
     
-    def __init__(self, data_dir: str = "data"):
+    def __init__(self, data_dir: str = "data", flush_interval: float = None):
         self.data_dir = Path(data_dir)
         self.data_dir.mkdir(exist_ok=True)
         
@@ -57,11 +60,24 @@ class BibleClockMetrics:
         
         # Thread safety
         self.lock = threading.Lock()
-        self._in_midnight_reset = False  # Prevent recursive saves during midnight reset
+        
+        # Batched persistence: tracking only marks the metrics dirty and one writer thread
+        # flushes them on an interval, at midnight rollover and at shutdown
+        if flush_interval is None:
+            flush_interval = float(os.getenv('METRICS_FLUSH_INTERVAL', '120'))
+        self.flush_interval = max(1.0, flush_interval)
+        self._daily_data = {}  # date -> saved day entry, kept in memory so flushes never re-read the file
+        self._dirty = False
+        self._rollover_pending = False
+        self._wake = threading.Event()
+        self._stop = threading.Event()
         
         # Load existing data
         self._load_daily_data()
         
+        self._writer_thread = threading.Thread(target=self._writer_loop, daemon=True, name='metrics-writer')
+        self._writer_thread.start()
+        
         logger.info("Bible Clock Metrics initialized")
     
     def _load_daily_data(self):
@@ -70,6 +86,7 @@ class BibleClockMetrics:
             try:
                 with open(self.daily_metrics_file, 'r') as f:
                     data = json.load(f)
+                    self._daily_data = data
                     today_str = datetime.now().strftime('%Y-%m-%d')
                     if today_str in data:
                         today_data = data[today_str]
@@ -117,8 +134,7 @@ class BibleClockMetrics:
                     f"Displayed {self.verses_displayed_today} verses today"
                 )
             
-            # Save metrics
-            self._save_daily_metrics()
+            self._dirty = True
             
             logger.debug(f"Verse tracked: {verse_data.get('reference')} - Total today: {self.verses_displayed_today}")
     
@@ -136,14 +152,15 @@ class BibleClockMetrics:
             self.current_mode = new_mode
             self.mode_start_time = current_time
             
+            event_log.record_mode_change(new_mode)
+            
             # Add to recent activity
             self._add_recent_activity(
                 "mode_change", 
                 f"Switched to {new_mode.title()} mode"
             )
             
-            # Save metrics
-            self._save_daily_metrics()
+            self._dirty = True
             
             logger.info(f"Mode changed to {new_mode}")
     
@@ -151,7 +168,7 @@ class BibleClockMetrics:
         """Track system events like display on/off, errors, etc."""
         with self.lock:
             self._add_recent_activity(event_type, description)
-            self._save_daily_metrics()
+            self._dirty = True
     
     def track_hardware_event(self, event_type: str, details: str = ""):
         """Track hardware events like display power, voice activation, etc."""
@@ -176,9 +193,7 @@ class BibleClockMetrics:
             
         with self.lock:
             self._add_recent_activity('hardware', description)
-            # Skip save during midnight reset to prevent recursive blocking
-            if not self._in_midnight_reset:
-                self._save_daily_metrics()
+            self._dirty = True
             logger.info(f"Hardware event tracked: {description}")
     
     def track_performance_event(self, cpu_percent: float, memory_percent: float, temp_c: float):
@@ -238,31 +253,18 @@ class BibleClockMetrics:
             return self._get_daily_aggregated_metrics()
     
     def _check_midnight_reset(self):
-        """Check if we've passed midnight and reset daily counters."""
+        """Check if we've passed midnight and reset daily counters (caller holds the lock)."""
         now = datetime.now()
         current_midnight = now.replace(hour=0, minute=0, second=0, microsecond=0)
         
         if current_midnight > self.last_midnight_reset:
             logger.info("Midnight reset: clearing daily counters")
             
-            # Set flag to prevent recursive saves
-            self._in_midnight_reset = True
+            # Keep the finished day's totals; the writer flushes them and runs the aggregation
+            finished_day = self.last_midnight_reset.strftime('%Y-%m-%d')
+            self._daily_data[finished_day] = self._build_day_entry(finished_day)
+            self._rollover_pending = True
             
-            # Save current day's data before reset in a separate thread to prevent blocking
-            import threading
-            def save_midnight_data():
-                try:
-                    self._save_daily_metrics()
-                    self._aggregate_daily_to_weekly()
-                    logger.info("Midnight data save completed successfully")
-                except Exception as e:
-                    logger.error(f"Midnight data save failed: {e}")
-            
-            # Run save operations in background thread with timeout
-            save_thread = threading.Thread(target=save_midnight_data, daemon=True)
-            save_thread.start()
-            
-            # Don't wait for thread to complete - reset counters immediately
             # Reset daily counters
             self.verses_displayed_today = 0
             self.mode_usage_seconds_today.clear()
@@ -271,10 +273,9 @@ class BibleClockMetrics:
             self.recent_activities = []
             
             self.last_midnight_reset = current_midnight
-            self.track_hardware_event('midnight_reset')
-            
-            # Clear flag after midnight reset is complete
-            self._in_midnight_reset = False
+            self._add_recent_activity('hardware', 'Daily counters reset at midnight')
+            self._dirty = True
+            self._wake.set()
     
     def _add_recent_activity(self, activity_type: str, description: str):
         """Add an activity to recent activities list."""
@@ -303,63 +304,81 @@ class BibleClockMetrics:
             'ylt': 67.4
         }
     
+    def _build_day_entry(self, date_str: str) -> Dict[str, Any]:
+        """Saved form of the current daily counters (caller holds the lock)."""
+        return {
+            'date': date_str,
+            'verses_displayed_today': self.verses_displayed_today,
+            'mode_usage_seconds': dict(self.mode_usage_seconds_today),
+            'translation_usage_count': dict(self.translation_usage_today),
+            'bible_books_accessed': dict(self.bible_books_accessed_today),
+            'recent_activities': self.recent_activities[-50:],  # Keep last 50
+            'last_updated': datetime.now().isoformat()
+        }
+    
     def _save_daily_metrics(self):
-        """Save current daily metrics to file with timeout protection."""
-        import threading
-        import time
-        
+        """Write all daily metrics to file atomically as compact JSON."""
         try:
-            today_str = datetime.now().strftime('%Y-%m-%d')
+            with self.lock:
+                today_str = self.last_midnight_reset.strftime('%Y-%m-%d')
+                self._daily_data[today_str] = self._build_day_entry(today_str)
+                self._dirty = False
+                # Past days are never modified again, so a shallow copy is a consistent snapshot
+                daily_data = dict(self._daily_data)
             
-            # Use threading timeout instead of signals (works in background threads)
-            result = [None]  # Use list to allow modification from inner function
-            exception = [None]
+            payload = json.dumps(daily_data, separators=(',', ':'))
+            temp_file = self.daily_metrics_file.with_suffix('.tmp')
+            with open(temp_file, 'w') as f:
+                f.write(payload)
+                f.flush()
+                os.fsync(f.fileno())
             
-            def save_operation():
-                try:
-                    # Load existing data
-                    daily_data = {}
-                    if self.daily_metrics_file.exists():
-                        with open(self.daily_metrics_file, 'r') as f:
-                            daily_data = json.load(f)
-                    
-                    # Update today's data
-                    daily_data[today_str] = {
-                        'date': today_str,
-                        'verses_displayed_today': self.verses_displayed_today,
-                        'mode_usage_seconds': dict(self.mode_usage_seconds_today),
-                        'translation_usage_count': dict(self.translation_usage_today),
-                        'bible_books_accessed': dict(self.bible_books_accessed_today),
-                        'recent_activities': self.recent_activities[-50:],  # Keep last 50
-                        'last_updated': datetime.now().isoformat()
-                    }
-                    
-                    # Save to file atomically (write to temp file first)
-                    temp_file = self.daily_metrics_file.with_suffix('.tmp')
-                    with open(temp_file, 'w') as f:
-                        json.dump(daily_data, f, indent=2)
-                    
-                    # Atomic rename
-                    temp_file.replace(self.daily_metrics_file)
-                    result[0] = True
-                except Exception as e:
-                    exception[0] = e
-            
-            # Run save operation in thread with timeout
-            save_thread = threading.Thread(target=save_operation, daemon=True)
-            save_thread.start()
-            save_thread.join(timeout=30)  # 30 second timeout
-            
-            if save_thread.is_alive():
-                logger.error("Daily metrics save timed out after 30 seconds")
-            elif exception[0]:
-                raise exception[0]
-            elif result[0] is None:
-                logger.error("Daily metrics save completed but result is unknown")
-                
+            # Atomic rename
+            os.replace(temp_file, self.daily_metrics_file)
         except Exception as e:
+            with self.lock:
+                self._dirty = True  # Retry on the next flush
             logger.error(f"Failed to save daily metrics: {e}")
-            # Don't raise exception to prevent blocking main thread
+    
+    def _seconds_until_next_flush(self) -> float:
+        now = datetime.now()
+        next_midnight = now.replace(hour=0, minute=0, second=0, microsecond=0) + timedelta(days=1)
+        return max(0.5, min(self.flush_interval, (next_midnight - now).total_seconds() + 0.5))
+    
+    def _writer_loop(self):
+        """Single writer: flush dirty metrics on the interval, roll over at midnight, flush once more on stop."""
+        while not self._stop.is_set():
+            self._wake.wait(self._seconds_until_next_flush())
+            self._wake.clear()
+            if self._stop.is_set():
+                break
+            try:
+                with self.lock:
+                    self._check_midnight_reset()
+                    dirty = self._dirty
+                    rollover = self._rollover_pending
+                    self._rollover_pending = False
+                if dirty:
+                    self._save_daily_metrics()
+                if rollover:
+                    self._aggregate_daily_to_weekly()
+            except Exception as e:
+                logger.error(f"Metrics writer error: {e}")
+    
+    def flush(self):
+        """Ask the writer to save pending metrics now."""
+        self._wake.set()
+    
+    def shutdown(self, timeout: float = 5.0):
+        """Stop the writer and save pending metrics."""
+        self._stop.set()
+        self._wake.set()
+        if self._writer_thread.is_alive():
+            self._writer_thread.join(timeout)
+        with self.lock:
+            dirty = self._dirty
+        if dirty:
+            self._save_daily_metrics()
     
     def _get_daily_aggregated_metrics(self) -> Dict[str, Any]:
         """Get today's aggregated metrics."""
@@ -382,72 +401,54 @@ class BibleClockMetrics:
             'translation_completion_percentages': current_metrics.translation_completion_percentages
         }
     
-    def _get_weekly_aggregated_metrics(self) -> Dict[str, Any]:
-        """Get this week's aggregated metrics."""
-        # For now, return today's data - would need to aggregate from daily files
+    def _get_event_log_metrics(self, period: str, start: date) -> Dict[str, Any]:
+        """Aggregate metrics from the event log for the days since start (live values for today's extras)."""
+        today_metrics = self._get_daily_aggregated_metrics()
+        today = date.today()
+        try:
+            verse_stats = event_log.verse_stats(start, today)
+            mode_seconds = event_log.mode_usage_seconds(start, today)
+        except Exception as e:
+            logger.warning(f"Event log aggregation failed for {period}: {e}")
+            return {**today_metrics, 'period': period}
+        
         return {
-            **self._get_daily_aggregated_metrics(),
-            'period': 'week'
+            **today_metrics,
+            'period': period,
+            'start_date': start.isoformat(),
+            'verses_displayed': verse_stats['total'],
+            # No mode change logged yet (fresh install): today's live tracking is all there is
+            'mode_usage_hours': ({mode: round(seconds / 3600.0, 1) for mode, seconds in mode_seconds.items()}
+                                 if mode_seconds else today_metrics.get('mode_usage_hours', {})),
+            'translation_usage_count': verse_stats['by_translation'],
+            'bible_books_accessed_count': verse_stats['by_book'],
+            'daily_verse_counts': verse_stats['by_day']
         }
     
+    def _get_weekly_aggregated_metrics(self) -> Dict[str, Any]:
+        """Get this week's aggregated metrics."""
+        today = date.today()
+        return self._get_event_log_metrics('week', today - timedelta(days=today.weekday()))
+    
     def _get_monthly_aggregated_metrics(self) -> Dict[str, Any]:
         """Get this month's aggregated metrics."""
-        # For now, return today's data - would need to aggregate from daily files
-        return {
-            **self._get_daily_aggregated_metrics(),
-            'period': 'month'
-        }
+        return self._get_event_log_metrics('month', date.today().replace(day=1))
     
     def _get_yearly_aggregated_metrics(self) -> Dict[str, Any]:
         """Get this year's aggregated metrics."""
-        # For now, return today's data - would need to aggregate from daily files
-        return {
-            **self._get_daily_aggregated_metrics(),
-            'period': 'year'
-        }
+        return self._get_event_log_metrics('year', date.today().replace(month=1, day=1))
     
     def _get_alltime_aggregated_metrics(self) -> Dict[str, Any]:
         """Get all-time aggregated metrics."""
-        # For now, return today's data - would need to aggregate from all files
-        return {
-            **self._get_daily_aggregated_metrics(),
-            'period': 'alltime'
-        }
+        return self._get_event_log_metrics('alltime', event_log.oldest_date() or date.today())
     
     def _aggregate_daily_to_weekly(self):
-        """Aggregate daily data into weekly summaries with timeout protection."""
-        import threading
-        
+        """Aggregate daily data into weekly summaries (runs on the writer thread)."""
         try:
             # Import time aggregator here to avoid circular imports
-            from time_aggregator import TimeAggregator
-            
-            # Use threading timeout instead of signals
-            result = [None]
-            exception = [None]
-            
-            def aggregation_operation():
-                try:
-                    time_aggregator = TimeAggregator()
-                    time_aggregator.refresh_aggregations()
-                    result[0] = True
-                except Exception as e:
-                    exception[0] = e
-            
-            # Run aggregation in thread with timeout
-            agg_thread = threading.Thread(target=aggregation_operation, daemon=True)
-            agg_thread.start()
-            agg_thread.join(timeout=45)  # 45 second timeout
-            
-            if agg_thread.is_alive():
-                logger.error("Weekly aggregation timed out after 45 seconds")
-            elif exception[0]:
-                raise exception[0]
-            elif result[0]:
-                logger.info("Weekly aggregation completed successfully")
-            else:
-                logger.error("Weekly aggregation completed but result is unknown")
+            from time_aggregator import time_aggregator
             
+            time_aggregator.refresh_aggregations()
+            logger.info("Weekly aggregation completed successfully")
         except Exception as e:
             logger.error(f"Weekly aggregation failed: {e}")
-            # Don't raise exception to prevent blocking main thread
\ No newline at end of file
@@ -5,13 +5,14 @@ Downloads complete Bible translations from public sources and converts them to t
 """
 
 import json
-import requests
 import os
 from pathlib import Path
 import logging
 from typing import Dict, Any, Optional, List
 import time
 
+from http_client import http_client
+
 class BibleDownloader:
     def __init__(self):
         self.logger = logging.getLogger(__name__)
@@ -66,7 +67,7 @@ class BibleDownloader:
                 
                 # Download from GitHub
                 url = f"https://raw.githubusercontent.com/aruljohn/Bible-kjv/master/{book}.json"
-                response = requests.get(url, timeout=30)
+                response = http_client.get(url, timeout=30, use_cache=True)
                 response.raise_for_status()
                 
                 # Parse JSON
@@ -121,7 +122,7 @@ class BibleDownloader:
         try:
             # Get Bible from getBible API
             url = f"https://getbible.net/v2/{translation}/json"
-            response = requests.get(url, timeout=60)
+            response = http_client.get(url, timeout=60, use_cache=True)
             response.raise_for_status()
             
             bible_data = response.json()
@@ -193,7 +194,7 @@ class BibleDownloader:
         
         try:
             url = translation_urls[translation]
-            response = requests.get(url, timeout=120, allow_redirects=True)
+            response = http_client.get(url, timeout=120, allow_redirects=True, use_cache=True)
             response.raise_for_status()
             
             bible_data = response.json()
@@ -0,0 +1,622 @@
+"""
+Compact storage for Bible translation text.
+
+Each translation is kept as a single UTF-8 blob plus offset/length arrays
+indexed by a global verse ordinal derived from bible_structure.json, instead
+of one nested dict per translation. Translations can be backed by a binary
+file that is memory-mapped on first use, so untouched translations cost
+nothing and read-only ones never get copied onto the heap.
+"""
+
+import json
+import logging
+import mmap
+import os
+import struct
+import sys
+import threading
+from array import array
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Tuple
+
+MISSING = -1
+
+# Binary layout: header | int32 offsets[total] | uint32 lengths[total] | extras JSON | UTF-8 blob
+BINARY_MAGIC = b'BCVS'
+BINARY_VERSION = 1
+BINARY_HEADER = struct.Struct('<4sHHIII')  # magic, version, flags, total_verses, verse_count, extras_len
+
+
+class BibleStore:
+    """Ordinal-indexed verse storage shared by all translations."""
+
+    def __init__(self, bible_structure: Dict[str, Dict[str, int]]):
+        self.logger = logging.getLogger(__name__)
+        self.bible_structure = bible_structure or {}
+        self._lock = threading.RLock()
+
+        # book -> {chapter -> (ordinal of verse 1, verse count)}
+        self._chapter_index: Dict[str, Dict[int, Tuple[int, int]]] = {}
+        ordinal = 0
+        for book, chapters in self.bible_structure.items():
+            book_index = {}
+            for chapter_str in sorted(chapters, key=int):
+                verse_count = int(chapters[chapter_str])
+                book_index[int(chapter_str)] = (ordinal, verse_count)
+                ordinal += verse_count
+            self._chapter_index[book] = book_index
+        self.total_verses = ordinal
+
+        self._blobs: Dict[str, object] = {}
+        self._offsets: Dict[str, object] = {}
+        self._lengths: Dict[str, object] = {}
+        self._counts: Dict[str, int] = {}
+        # Verses that fall outside bible_structure (kept so no cached text is lost)
+        self._extras: Dict[str, Dict[Tuple[str, int, int], str]] = {}
+
+        # Lazily opened translations: translation -> (json_path, binary_path)
+        self._pending: Dict[str, Tuple[Path, Optional[Path]]] = {}
+        self._sources: Dict[str, Tuple[Path, Optional[Path]]] = {}
+        # Memory-mapped translations: translation -> (file, mmap, [views])
+        self._maps: Dict[str, tuple] = {}
+
+        # Append-only journal of cached verses not yet compacted into the files
+        self._journal_path: Optional[Path] = None
+        self._journal_file = None
+        self._dirty: set = set()
+
+    def __contains__(self, translation: str) -> bool:
+        return translation in self._offsets or translation in self._pending
+
+    def translations(self) -> list:
+        """List translations held by the store (opened or pending)."""
+        return list(dict.fromkeys(list(self._offsets.keys()) + list(self._pending.keys())))
+
+    def ordinal(self, book: str, chapter: int, verse: int) -> Optional[int]:
+        """Global ordinal for a verse, or None if it is outside the Bible structure."""
+        chapter_entry = self._chapter_index.get(book, {}).get(int(chapter))
+        if not chapter_entry:
+            return None
+        base, verse_count = chapter_entry
+        verse = int(verse)
+        if verse < 1 or verse > verse_count:
+            return None
+        return base + verse - 1
+
+    # === Lazy opening ===
+
+    def register(self, translation: str, json_path: Path, binary_path: Optional[Path] = None):
+        """Register translation files to be opened on first use."""
+        with self._lock:
+            self._release_locked(translation)
+            self._pending[translation] = (Path(json_path), Path(binary_path) if binary_path else None)
+            self._sources[translation] = self._pending[translation]
+
+    def _open_pending(self, translation: str):
+        """Open a registered translation, preferring an up-to-date binary file."""
+        if translation not in self._pending:
+            return
+        with self._lock:
+            paths = self._pending.pop(translation, None)
+            if paths is None:
+                return
+            json_path, binary_path = paths
+            try:
+                if binary_path and self._binary_is_current(json_path, binary_path):
+                    self._map_binary_locked(translation, binary_path)
+                    self.logger.debug(f"Memory-mapped {translation.upper()} from {binary_path.name}")
+                    return
+
+                self._load_json_locked(translation, json_path)
+                if binary_path and json_path.exists():
+                    # Convert once so later opens can map the file instead of parsing JSON
+                    self.write_binary(translation, binary_path)
+                    self._release_locked(translation)
+                    self._map_binary_locked(translation, binary_path)
+                    self.logger.info(f"Converted {translation.upper()} to binary store {binary_path.name}")
+            except Exception as e:
+                self.logger.warning(f"Failed to open {translation} store files: {e}")
+                self._release_locked(translation)
+                try:
+                    self._load_json_locked(translation, json_path)
+                except Exception as json_error:
+                    self.logger.error(f"Failed to load {translation} JSON cache: {json_error}")
+                    self._ensure_locked(translation)
+
+    def _binary_is_current(self, json_path: Path, binary_path: Path) -> bool:
+        """A binary file is usable if it exists and is not older than its JSON source."""
+        if not binary_path.exists():
+            return False
+        if json_path.exists() and json_path.stat().st_mtime > binary_path.stat().st_mtime:
+            return False
+        return True
+
+    def _load_json_locked(self, translation: str, json_path: Path):
+        data = {}
+        if json_path.exists():
+            with open(json_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        self._load_dict_locked(translation, data)
+
+    def _map_binary_locked(self, translation: str, binary_path: Path):
+        """Memory-map a binary translation file without copying it onto the heap."""
+        f = open(binary_path, 'rb')
+        try:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except Exception:
+            f.close()
+            raise
+
+        magic, version, _flags, total, count, extras_len = BINARY_HEADER.unpack_from(mapped, 0)
+        if magic != BINARY_MAGIC or version != BINARY_VERSION or total != self.total_verses:
+            mapped.close()
+            f.close()
+            raise ValueError(f"{binary_path.name} does not match the current Bible structure")
+
+        table_bytes = 4 * total
+        offsets_start = BINARY_HEADER.size
+        lengths_start = offsets_start + table_bytes
+        extras_start = lengths_start + table_bytes
+        blob_start = extras_start + extras_len
+
+        extras = {}
+        if extras_len:
+            for book, chapter, verse, text in json.loads(mapped[extras_start:blob_start].decode('utf-8')):
+                extras[(book, int(chapter), int(verse))] = text
+
+        base = memoryview(mapped)
+        offsets_view = base[offsets_start:lengths_start].cast('i')
+        lengths_view = base[lengths_start:extras_start].cast('I')
+        blob_view = base[blob_start:]
+        views = [offsets_view, lengths_view, blob_view, base]
+
+        self._maps[translation] = (f, mapped, views)
+        self._blobs[translation] = blob_view
+        self._offsets[translation] = offsets_view
+        self._lengths[translation] = lengths_view
+        self._counts[translation] = count
+        self._extras[translation] = extras
+
+        if sys.byteorder != 'little':
+            self._promote_locked(translation)
+
+    def _promote_locked(self, translation: str):
+        """Copy a memory-mapped translation onto the heap so it can be modified."""
+        if translation not in self._maps:
+            return
+        offsets = array('i')
+        offsets.frombytes(self._offsets[translation].tobytes())
+        lengths = array('I')
+        lengths.frombytes(self._lengths[translation].tobytes())
+        if sys.byteorder != 'little':
+            offsets.byteswap()
+            lengths.byteswap()
+        blob = bytearray(self._blobs[translation])
+        count = self._counts[translation]
+        extras = self._extras[translation]
+
+        self._release_locked(translation)
+        self._blobs[translation] = blob
+        self._offsets[translation] = offsets
+        self._lengths[translation] = lengths
+        self._counts[translation] = count
+        self._extras[translation] = extras
+
+    def _release_locked(self, translation: str):
+        """Drop a translation's storage and close any mapping behind it."""
+        for table in (self._blobs, self._offsets, self._lengths, self._counts, self._extras):
+            table.pop(translation, None)
+        mapping = self._maps.pop(translation, None)
+        if mapping:
+            f, mapped, views = mapping
+            for view in views:
+                view.release()
+            mapped.close()
+            f.close()
+
+    def close(self):
+        """Close the journal and all memory-mapped files; mapped translations reopen lazily if used again."""
+        with self._lock:
+            if self._journal_file:
+                self._journal_file.close()
+                self._journal_file = None
+            for translation in list(self._maps.keys()):
+                self._release_locked(translation)
+                if translation in self._sources:
+                    self._pending[translation] = self._sources[translation]
+
+    # === Reading and writing ===
+
+    def ensure(self, translation: str):
+        """Create empty storage for a translation if it does not exist yet."""
+        self._open_pending(translation)
+        with self._lock:
+            self._ensure_locked(translation)
+
+    def _ensure_locked(self, translation: str):
+        if translation not in self._offsets:
+            self._blobs[translation] = bytearray()
+            self._offsets[translation] = array('i', [MISSING]) * self.total_verses
+            self._lengths[translation] = array('I', [0]) * self.total_verses
+            self._counts[translation] = 0
+            self._extras[translation] = {}
+
+    def load_dict(self, translation: str, data: Dict) -> int:
+        """Replace a translation's contents from the nested {book: {chapter: {verse: text}}} format."""
+        with self._lock:
+            self._pending.pop(translation, None)
+            return self._load_dict_locked(translation, data)
+
+    def _load_dict_locked(self, translation: str, data: Dict) -> int:
+        self._release_locked(translation)
+        self._ensure_locked(translation)
+        for book, chapters in (data or {}).items():
+            for chapter_str, verses in chapters.items():
+                for verse_str, text in verses.items():
+                    if not str(chapter_str).isdigit() or not str(verse_str).isdigit():
+                        continue
+                    self._put_locked(translation, book, int(chapter_str), int(verse_str), text, True)
+        return self._counts[translation] + len(self._extras[translation])
+
+    def load_file(self, translation: str, path: Path) -> bool:
+        """Load a translation from a JSON file; missing files leave an empty translation."""
+        path = Path(path)
+        if not path.exists():
+            self.ensure(translation)
+            return False
+        with open(path, 'r', encoding='utf-8') as f:
+            self.load_dict(translation, json.load(f))
+        return True
+
+    def get(self, translation: str, book: str, chapter: int, verse: int) -> Optional[str]:
+        """Get verse text, or None if it is not stored."""
+        self._open_pending(translation)
+        ordinal = self.ordinal(book, chapter, verse)
+        with self._lock:
+            offsets = self._offsets.get(translation)
+            if offsets is None:
+                return None
+            if ordinal is None:
+                return self._extras[translation].get((book, int(chapter), int(verse)))
+            start = offsets[ordinal]
+            if start == MISSING:
+                return None
+            length = self._lengths[translation][ordinal]
+            return str(self._blobs[translation][start:start + length], 'utf-8')
+
+    def has(self, translation: str, book: str, chapter: int, verse: int) -> bool:
+        """Check whether a verse is stored."""
+        self._open_pending(translation)
+        ordinal = self.ordinal(book, chapter, verse)
+        with self._lock:
+            offsets = self._offsets.get(translation)
+            if offsets is None:
+                return False
+            if ordinal is None:
+                return (book, int(chapter), int(verse)) in self._extras[translation]
+            return offsets[ordinal] != MISSING
+
+    def put(self, translation: str, book: str, chapter: int, verse: int, text: str,
+            overwrite: bool = False) -> bool:
+        """Store a verse; returns True if the store changed."""
+        self._open_pending(translation)
+        with self._lock:
+            self._ensure_locked(translation)
+            if translation in self._maps:
+                # Skip the copy-on-write when the verse is already present
+                if not overwrite and self.has(translation, book, chapter, verse):
+                    return False
+                self._promote_locked(translation)
+            changed = self._put_locked(translation, book, int(chapter), int(verse), text, overwrite)
+            if changed:
+                self._dirty.add(translation)
+                self._append_journal_locked(translation, book, int(chapter), int(verse), text)
+            return changed
+
+    def _put_locked(self, translation: str, book: str, chapter: int, verse: int, text: str,
+                    overwrite: bool) -> bool:
+        if not text or not str(text).strip():
+            return False
+        text = str(text).strip()
+
+        ordinal = self.ordinal(book, chapter, verse)
+        if ordinal is None:
+            extras = self._extras[translation]
+            if (book, chapter, verse) in extras and not overwrite:
+                return False
+            extras[(book, chapter, verse)] = text
+            return True
+
+        offsets = self._offsets[translation]
+        is_new = offsets[ordinal] == MISSING
+        if not is_new and not overwrite:
+            return False
+
+        encoded = text.encode('utf-8')
+        blob = self._blobs[translation]
+        offsets[ordinal] = len(blob)
+        self._lengths[translation][ordinal] = len(encoded)
+        blob.extend(encoded)
+        if is_new:
+            self._counts[translation] += 1
+        return True
+
+    def count(self, translation: str) -> int:
+        """Number of stored verses that fall within the Bible structure."""
+        self._open_pending(translation)
+        return self._counts.get(translation, 0)
+
+    def peek_count(self, translation: str) -> Optional[int]:
+        """Stored verse count without opening the translation (read from the binary header), or None if unknown."""
+        with self._lock:
+            if translation in self._offsets:
+                return self._counts.get(translation, 0)
+            paths = self._pending.get(translation)
+        if paths is None:
+            return None
+        json_path, binary_path = paths
+        try:
+            if not binary_path or not self._binary_is_current(json_path, binary_path):
+                return None
+            with open(binary_path, 'rb') as f:
+                header = f.read(BINARY_HEADER.size)
+            magic, version, _flags, total, count, _extras_len = BINARY_HEADER.unpack(header)
+            if magic != BINARY_MAGIC or version != BINARY_VERSION or total != self.total_verses:
+                return None
+            return count
+        except (OSError, struct.error):
+            return None
+
+    def count_book(self, translation: str, book: str) -> int:
+        """Number of stored verses for a single book."""
+        self._open_pending(translation)
+        with self._lock:
+            offsets = self._offsets.get(translation)
+            if offsets is None:
+                return 0
+            return sum(
+                1
+                for base, verse_count in self._chapter_index.get(book, {}).values()
+                for ordinal in range(base, base + verse_count)
+                if offsets[ordinal] != MISSING
+            )
+
+    def chapter_verses(self, translation: str, book: str, chapter: int) -> Dict[int, str]:
+        """All stored verses for a chapter as {verse_number: text}."""
+        self._open_pending(translation)
+        verses = {}
+        chapter_entry = self._chapter_index.get(book, {}).get(int(chapter))
+        with self._lock:
+            offsets = self._offsets.get(translation)
+            if offsets is None:
+                return verses
+            if chapter_entry:
+                base, verse_count = chapter_entry
+                blob = self._blobs[translation]
+                lengths = self._lengths[translation]
+                for verse in range(1, verse_count + 1):
+                    start = offsets[base + verse - 1]
+                    if start != MISSING:
+                        verses[verse] = str(blob[start:start + lengths[base + verse - 1]], 'utf-8')
+            for (extra_book, extra_chapter, extra_verse), text in self._extras[translation].items():
+                if extra_book == book and extra_chapter == int(chapter):
+                    verses[extra_verse] = text
+        return verses
+
+    def has_chapter(self, translation: str, book: str, chapter: int) -> bool:
+        """Check whether any verse of a chapter is stored."""
+        return bool(self.chapter_verses(translation, book, chapter))
+
+    def iter_verses(self, translation: str) -> Iterator[Tuple[str, int, int, str]]:
+        """Iterate stored verses as (book, chapter, verse, text) in canonical order."""
+        for book, chapters in self._chapter_index.items():
+            for chapter in chapters:
+                for verse, text in self.chapter_verses(translation, book, chapter).items():
+                    yield book, chapter, verse, text
+
+    def to_dict(self, translation: str) -> Dict:
+        """Export a translation in the nested JSON file format."""
+        data: Dict[str, Dict[str, Dict[str, str]]] = {}
+        for book, chapter, verse, text in self.iter_verses(translation):
+            data.setdefault(book, {}).setdefault(str(chapter), {})[str(verse)] = text
+        with self._lock:
+            extras = dict(self._extras.get(translation, {}))
+        for (book, chapter, verse), text in extras.items():
+            if chapter not in self._chapter_index.get(book, {}):
+                data.setdefault(book, {}).setdefault(str(chapter), {})[str(verse)] = text
+        return data
+
+    def save_file(self, translation: str, path: Path):
+        """Write a translation back to its JSON file (atomic replace)."""
+        self._write_json(self.to_dict(translation), path)
+
+    @staticmethod
+    def _write_json(data: Dict, path: Path):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = path.with_suffix(path.suffix + '.tmp')
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2)
+        os.replace(temp_path, path)
+
+    def write_binary(self, translation: str, path: Path):
+        """Write a compacted binary snapshot of a translation (atomic replace)."""
+        self._open_pending(translation)
+        with self._lock:
+            snapshot = self._binary_snapshot_locked(translation)
+        self._write_binary_snapshot(snapshot, path)
+
+    def _binary_snapshot_locked(self, translation: str) -> tuple:
+        """Copy a translation into binary file order: (offsets, lengths, blob, count, extras bytes)."""
+        offsets = array('i', [MISSING]) * self.total_verses
+        lengths = array('I', [0]) * self.total_verses
+        blob = bytearray()
+        count = 0
+
+        source_offsets = self._offsets.get(translation)
+        if source_offsets is None:
+            raise KeyError(f"Unknown translation: {translation}")
+        source_lengths = self._lengths[translation]
+        source_blob = self._blobs[translation]
+        # Rewrite in ordinal order, dropping text orphaned by overwrites
+        for ordinal in range(self.total_verses):
+            start = source_offsets[ordinal]
+            if start == MISSING:
+                continue
+            length = source_lengths[ordinal]
+            offsets[ordinal] = len(blob)
+            lengths[ordinal] = length
+            blob.extend(source_blob[start:start + length])
+            count += 1
+        extras = [[book, chapter, verse, text]
+                  for (book, chapter, verse), text in self._extras[translation].items()]
+
+        extras_bytes = json.dumps(extras, ensure_ascii=False).encode('utf-8') if extras else b''
+        if sys.byteorder != 'little':
+            offsets.byteswap()
+            lengths.byteswap()
+        return offsets, lengths, blob, count, extras_bytes
+
+    def _write_binary_snapshot(self, snapshot: tuple, path: Path):
+        offsets, lengths, blob, count, extras_bytes = snapshot
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = path.with_suffix(path.suffix + '.tmp')
+        with open(temp_path, 'wb') as f:
+            f.write(BINARY_HEADER.pack(BINARY_MAGIC, BINARY_VERSION, 0, self.total_verses, count, len(extras_bytes)))
+            f.write(offsets.tobytes())
+            f.write(lengths.tobytes())
+            f.write(extras_bytes)
+            f.write(blob)
+        os.replace(temp_path, path)
+
+    # === Journal and compaction ===
+
+    def open_journal(self, journal_path: Path) -> int:
+        """Replay an existing journal into the store and append new verses to it; returns replayed count."""
+        journal_path = Path(journal_path)
+        replayed = 0
+        with self._lock:
+            if journal_path.exists():
+                with open(journal_path, 'r', encoding='utf-8') as f:
+                    for line in f:
+                        try:
+                            translation, book, chapter, verse, text = json.loads(line)
+                        except (ValueError, TypeError):
+                            # A torn final line from a crash is expected; skip it
+                            continue
+                        self._open_pending(translation)
+                        self._ensure_locked(translation)
+                        if translation in self._maps:
+                            if self.has(translation, book, chapter, verse):
+                                continue
+                            self._promote_locked(translation)
+                        if self._put_locked(translation, book, int(chapter), int(verse), text, False):
+                            self._dirty.add(translation)
+                            replayed += 1
+
+            journal_path.parent.mkdir(parents=True, exist_ok=True)
+            self._journal_path = journal_path
+            self._journal_file = open(journal_path, 'a', encoding='utf-8')
+        return replayed
+
+    def _append_journal_locked(self, translation: str, book: str, chapter: int, verse: int, text: str):
+        if not self._journal_file:
+            return
+        try:
+            self._journal_file.write(json.dumps([translation, book, chapter, verse, str(text).strip()],
+                                                ensure_ascii=False) + '\n')
+            self._journal_file.flush()
+        except Exception as e:
+            self.logger.error(f"Failed to append {translation} verse to journal: {e}")
+
+    def dirty_translations(self) -> list:
+        """Translations with journaled verses not yet compacted into their files."""
+        return sorted(self._dirty)
+
+    def compact(self) -> list:
+        """Fold journaled verses into the JSON/binary files and truncate the compacted part of the journal."""
+        with self._lock:
+            translations = sorted(self._dirty)
+            journal_offset = None
+            if self._journal_file:
+                # Every verse journaled before this point is in memory before any snapshot below
+                self._journal_file.flush()
+                journal_offset = self._journal_path.stat().st_size
+
+        # Snapshot under the lock, write the files outside it so get()/put() are not held up by the disk
+        compacted = []
+        for translation in translations:
+            json_path, binary_path = self._sources.get(translation, (None, None))
+            if json_path is None:
+                continue
+            try:
+                with self._lock:
+                    self._dirty.discard(translation)  # Verses put while writing mark it dirty again
+                    data = self.to_dict(translation)
+                    snapshot = self._binary_snapshot_locked(translation) if binary_path else None
+
+                # JSON first so the binary is never older than its source
+                self._write_json(data, json_path)
+                if snapshot:
+                    self._write_binary_snapshot(snapshot, binary_path)
+
+                with self._lock:
+                    if binary_path and translation not in self._dirty:
+                        # Unchanged since the snapshot: serve it from the new file instead of the heap
+                        self._release_locked(translation)
+                        self._map_binary_locked(translation, binary_path)
+                compacted.append(translation)
+            except Exception as e:
+                self.logger.error(f"Failed to compact {translation} cache: {e}")
+                with self._lock:
+                    self._dirty.add(translation)
+                    if translation not in self._offsets:
+                        # Remapping failed after the files were written; reopen from them on next use
+                        self._pending[translation] = self._sources[translation]
+
+        if journal_offset is not None and len(compacted) == len(translations):
+            with self._lock:
+                self._truncate_journal_locked(journal_offset)
+        return compacted
+
+    def _truncate_journal_locked(self, offset: int):
+        """Drop the first 'offset' bytes of the journal, keeping verses journaled since."""
+        if not self._journal_file:
+            return
+        try:
+            self._journal_file.close()
+            with open(self._journal_path, 'rb') as f:
+                f.seek(offset)
+                tail = f.read()
+            temp_path = self._journal_path.with_suffix(self._journal_path.suffix + '.tmp')
+            with open(temp_path, 'wb') as f:
+                f.write(tail)
+            os.replace(temp_path, self._journal_path)
+        except Exception as e:
+            self.logger.error(f"Failed to truncate translation cache journal: {e}")
+        finally:
+            self._journal_file = open(self._journal_path, 'a', encoding='utf-8')
+
+    def is_mapped(self, translation: str) -> bool:
+        """Check whether a translation is served from a memory-mapped file."""
+        return translation in self._maps
+
+    def memory_usage(self) -> Dict[str, int]:
+        """Approximate heap bytes held per opened translation (mapped files count as 0)."""
+        with self._lock:
+            return {
+                translation: 0 if translation in self._maps else (
+                    len(self._blobs[translation])
+                    + self._offsets[translation].itemsize * len(self._offsets[translation])
+                    + self._lengths[translation].itemsize * len(self._lengths[translation]))
+                for translation in self._offsets
+            }
+
+
+def convert_json_to_binary(json_path: Path, binary_path: Path, bible_structure: Dict) -> int:
+    """Convert a nested JSON translation file to the binary store format; returns verse count."""
+    store = BibleStore(bible_structure)
+    store.load_file('translation', json_path)
+    store.write_binary('translation', binary_path)
+    return store.count('translation')
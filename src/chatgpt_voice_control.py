@@ -310,16 +310,16 @@ class ChatGPTPiperVoiceControl:
                 
             elif 'next verse' in command_text or 'next' in command_text:
                 self.verse_manager.next_verse()
-                current_verse = self.verse_manager.get_current_verse()
+                current_verse = self.verse_manager.peek_verse()
                 response = f"Next verse: {current_verse.get('reference', '')} - {current_verse.get('text', '')}"
                 
             elif 'previous verse' in command_text or 'previous' in command_text:
                 self.verse_manager.previous_verse()
-                current_verse = self.verse_manager.get_current_verse()
+                current_verse = self.verse_manager.peek_verse()
                 response = f"Previous verse: {current_verse.get('reference', '')} - {current_verse.get('text', '')}"
                 
             elif 'current verse' in command_text or 'read verse' in command_text:
-                current_verse = self.verse_manager.get_current_verse()
+                current_verse = self.verse_manager.peek_verse()
                 if current_verse:
                     response = f"{current_verse.get('reference', '')}: {current_verse.get('text', '')}"
                 else:
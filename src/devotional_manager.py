@@ -14,6 +14,11 @@ import calendar
 import re
 from bs4 import BeautifulSoup
 
+try:
+    from http_client import http_client
+except ImportError:
+    from src.http_client import http_client
+
 class DevotionalManager:
     def __init__(self):
         self.logger = logging.getLogger(__name__)
@@ -303,7 +308,7 @@ class DevotionalManager:
             for url in url_patterns:
                 try:
                     self.logger.debug(f"Trying URL: {url}")
-                    response = requests.get(url, headers=headers, timeout=self.timeout)
+                    response = http_client.get(url, headers=headers, timeout=self.timeout, use_cache=True)
                     
                     if response.status_code == 200:
                         devotional = self._parse_devotional_html(response.text, date)
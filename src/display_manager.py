@@ -5,15 +5,37 @@ Manages e-ink display output and simulation.
 import os
 import logging
 import psutil
-from PIL import Image, ImageDraw, ImageFont
+from PIL import Image, ImageDraw
 from typing import Optional
 import time
 import threading
+import numpy as np
 
 try:
     from display_constants import DisplayModes
+    from display_transform import PENDING_INFO_KEY, TARGET_FRAME, TARGET_PANEL, display_transform
+    from font_cache import font_cache
+    from frame_diff import FrameDiffer
+    from frame_pipeline import mark_unquantised, quantize_for_panel
+    from prometheus_metrics import panel_refreshes
+    from tracing import tracer
+    from text_layout import text_layout
 except ImportError:
     from .display_constants import DisplayModes
+    from .display_transform import PENDING_INFO_KEY, TARGET_FRAME, TARGET_PANEL, display_transform
+    from .font_cache import font_cache
+    from .frame_diff import FrameDiffer
+    from .frame_pipeline import mark_unquantised, quantize_for_panel
+    from .prometheus_metrics import panel_refreshes
+    from .tracing import tracer
+    from .text_layout import text_layout
+
+# Transpose the IT8951 AutoDisplay applies to frame_buf for each rotate= value before update()
+_DRIVER_ROTATE_METHODS = {
+    'CW': Image.ROTATE_270,
+    'CCW': Image.ROTATE_90,
+    'flip': Image.ROTATE_180
+}
 
 class DisplayManager:
     def __init__(self):
@@ -58,6 +80,16 @@ class DisplayManager:
         self.max_partial_refreshes = 10  # Force full refresh after N partial refreshes
         self.display_device = None
         
+        # Dirty-region refresh: diff against the last pushed panel frame and refresh only changed areas
+        self.region_refresh_enabled = os.getenv('REGION_REFRESH_ENABLED', 'true').lower() == 'true'
+        self.frame_differ = FrameDiffer(
+            tile_size=int(os.getenv('REGION_REFRESH_TILE', '32')),
+            max_regions=int(os.getenv('REGION_REFRESH_MAX_REGIONS', '8')),
+            max_area_ratio=float(os.getenv('REGION_REFRESH_MAX_AREA', '0.6'))
+        )
+        self._last_pushed_frame = None  # Driver-oriented numpy copy of what the hardware currently shows
+        self.last_refresh_regions = []
+        
         if not self.simulation_mode:
             self._initialize_hardware()
     
@@ -131,6 +163,7 @@ class DisplayManager:
                 rotate=self.rotation,
                 spi_hz=24000000
             )
+            self._trace_device(self.display_device)
             
             self.logger.info(f"E-ink display initialized: {self.width}x{self.height}")
             
@@ -155,11 +188,30 @@ class DisplayManager:
                     self.logger.info("🔧 Attempting display recovery...")
                     from IT8951.display import AutoEPDDisplay
                     self.display_device = AutoEPDDisplay(vcom=-1.5)
+                    self._trace_device(self.display_device)
                     self.logger.info("✅ Display recovery successful!")
                 except Exception as recovery_error:
                     self.logger.error(f"❌ Display recovery failed: {recovery_error}")
                     raise Exception(f"Hardware mode required but display unavailable: {e}")
     
+    def _trace_device(self, device):
+        """Wrap the IT8951 controller calls in tracing spans so SPI transfer and panel refresh show up separately."""
+        epd = getattr(device, 'epd', None)
+        if epd is None:
+            return
+        for method_name, span_name in (('load_img_area', 'display.spi_push'),
+                                       ('display_area', 'display.refresh'),
+                                       ('wait_display_ready', 'display.wait_ready')):
+            method = getattr(epd, method_name, None)
+            if method is None:
+                continue
+            
+            def traced(*args, _method=method, _span_name=span_name, **kwargs):
+                with tracer.span(_span_name):
+                    return _method(*args, **kwargs)
+            
+            setattr(epd, method_name, traced)
+    
     def display_image(self, image: Image.Image, force_refresh: bool = False, preserve_border: bool = False, bypass_lock: bool = False, is_news_mode: bool = False):
         """Display image on e-ink screen or save for simulation."""
         try:
@@ -173,14 +225,14 @@ class DisplayManager:
                 return
             # Resize image to display dimensions
             if image.size != (self.width, self.height):
-                image = image.resize((self.width, self.height), Image.Resampling.LANCZOS)
+                image = mark_unquantised(image.resize((self.width, self.height), Image.Resampling.LANCZOS))
             
-            # Convert to grayscale for e-ink
-            if image.mode != 'L':
-                image = image.convert('L')
+            # Reduce to the panel's 16 grey levels (rendered frames arrive already quantised)
+            image = quantize_for_panel(image)
             
             # Check if image has changed
-            image_hash = hash(image.tobytes())
+            with tracer.span('display.hash'):
+                image_hash = hash((image.tobytes(), image.info.get(PENDING_INFO_KEY)))
             needs_update = (
                 force_refresh or 
                 image_hash != self.last_image_hash or
@@ -192,10 +244,11 @@ class DisplayManager:
                 return
             
             if self.simulation_mode:
-                self._simulate_display(image)
+                self._simulate_display(display_transform.apply(image, TARGET_FRAME))
                 self.logger.info("Display updated (simulation mode)")
             else:
-                self._display_on_hardware(image, force_refresh, preserve_border, is_news_mode)
+                with tracer.span('display.push', force_refresh=force_refresh, news=is_news_mode):
+                    self._display_on_hardware(image, force_refresh, preserve_border, is_news_mode)
                 self.logger.info("Display updated (hardware mode)")
             
             self.last_image_hash = image_hash
@@ -208,6 +261,8 @@ class DisplayManager:
             
         except Exception as e:
             self.logger.error(f"Display update failed: {e}")
+            # The panel may hold a half-written frame, so the next update must not diff against it
+            self._last_pushed_frame = None
             
             # Check for various hardware errors and implement recovery
             error_msg = str(e).lower()
@@ -250,6 +305,7 @@ class DisplayManager:
                     self.logger.warning(f"Error closing display device: {e}")
                 finally:
                     self.display_device = None
+                    self._last_pushed_frame = None
             
             # Step 2: Clean up GPIO state (essential for IT8951 HAT)
             try:
@@ -383,20 +439,14 @@ class DisplayManager:
         if not self.display_device:
             raise RuntimeError("Display device not initialized")
         
-        # Apply mirroring if needed (fixes backwards text)
-        mirror_setting = os.getenv('DISPLAY_MIRROR', 'false').lower()
-        if mirror_setting == 'true':
-            image = image.transpose(Image.FLIP_LEFT_RIGHT)
-        elif mirror_setting == 'vertical':
-            image = image.transpose(Image.FLIP_TOP_BOTTOM)
-        elif mirror_setting == 'both':
-            image = image.transpose(Image.FLIP_LEFT_RIGHT)
-            image = image.transpose(Image.FLIP_TOP_BOTTOM)
-        
-        # Apply software rotation for precise control (since hardware rotation=None)
-        # This ensures proper coordinate handling for our text positioning
-        if os.getenv('DISPLAY_PHYSICAL_ROTATION', '180') == '180':
-            image = image.rotate(180)
+        with tracer.span('display.transform'):
+            # The renderer's pending mirror, DISPLAY_MIRROR (fixes backwards text) and the software
+            # 180 rotation (hardware rotation=None) are applied as one transpose, or skipped
+            image = display_transform.apply(image, TARGET_PANEL)
+            # Region updates bypass the driver's draw_* calls, so diff in the orientation it sends to update()
+            driver_image = self._driver_oriented(image)
+        
+        frame = np.asarray(driver_image)
         
         # Special handling for news mode - aggressive clearing to prevent artifacts
         if is_news_mode and not self.simulation_mode:
@@ -423,12 +473,14 @@ class DisplayManager:
                 
                 # Use partial refresh for faster updates when preserving borders
                 self.display_device.draw_partial(DisplayModes.DU)
+                panel_refreshes.inc(kind='partial', waveform='DU')
                 self.partial_refresh_count += 1
                 self.logger.debug("Border-preserving refresh (content area only)")
             else:
                 # Full refresh for background changes or scheduled refreshes
                 self.display_device.frame_buf.paste(image, (0, 0))
                 self.display_device.draw_full(DisplayModes.GC16)
+                panel_refreshes.inc(kind='full', waveform='GC16')
                 self.last_full_refresh = time.time()
                 self.partial_refresh_count = 0  # Reset counter after full refresh
                 self.logger.debug("Full display refresh (background change or scheduled)")
@@ -438,21 +490,63 @@ class DisplayManager:
             
             # Check if we should use partial or full refresh
             # NEVER use partial refresh for news mode - always full refresh to prevent fading
-            if is_news_mode:
+            if (self.partial_refresh_count < self.max_partial_refreshes and
+                    self._refresh_changed_regions(driver_image, frame)):
+                self.partial_refresh_count += 1
+            elif is_news_mode:
                 self.display_device.draw_full(DisplayModes.GC16)
+                panel_refreshes.inc(kind='full', waveform='GC16')
                 self.last_full_refresh = time.time()
                 self.partial_refresh_count = 0
                 self.logger.debug("News mode - forced full display refresh to prevent fading")
             elif self.partial_refresh_count < self.max_partial_refreshes:
                 self.display_device.draw_partial(DisplayModes.DU)
+                panel_refreshes.inc(kind='partial', waveform='DU')
                 self.partial_refresh_count += 1
                 self.logger.debug(f"Partial display refresh ({self.partial_refresh_count}/{self.max_partial_refreshes})")
             else:
                 # Force full refresh to clear ghosting
                 self.display_device.draw_full(DisplayModes.GC16)
+                panel_refreshes.inc(kind='full', waveform='GC16')
                 self.last_full_refresh = time.time()
                 self.partial_refresh_count = 0
                 self.logger.debug("Full display refresh (ghosting prevention)")
+        
+        self._last_pushed_frame = frame
+    
+    def _driver_oriented(self, image: Image.Image) -> Image.Image:
+        """The frame as the driver hands it to update(), after its DISPLAY_ROTATION transpose."""
+        method = _DRIVER_ROTATE_METHODS.get(self.rotation)
+        return image.transpose(method) if method is not None else image
+    
+    def _refresh_changed_regions(self, image: Image.Image, frame: np.ndarray) -> bool:
+        """Push and refresh only the tiles that changed since the last frame; False to fall back to a whole-frame update.
+
+        image and frame are driver-oriented (see _driver_oriented), so regions are in panel coordinates.
+        """
+        if not self.region_refresh_enabled or not hasattr(self.display_device, 'update'):
+            return False
+        
+        regions = self.frame_differ.diff_regions(self._last_pushed_frame, frame)
+        if regions is None:
+            return False
+        
+        modes = []
+        for left, top, right, bottom in regions:
+            mode = self.frame_differ.choose_mode(frame[top:bottom, left:right])
+            self.display_device.update(image.crop((left, top, right, bottom)).tobytes(),
+                                       (left, top), (right - left, bottom - top), mode)
+            modes.append('GC16' if mode == DisplayModes.GC16 else 'DU')
+            panel_refreshes.inc(kind='region', waveform=modes[-1])
+        
+        # Keep the driver's own partial-update baseline in step with what the panel now shows
+        if hasattr(self.display_device, 'prev_frame'):
+            self.display_device.prev_frame = image.copy()
+        
+        self.last_refresh_regions = [{'box': region, 'mode': mode} for region, mode in zip(regions, modes)]
+        changed = sum((r[2] - r[0]) * (r[3] - r[1]) for r in regions)
+        self.logger.debug(f"Region refresh: {len(regions)} region(s), {changed / frame.size:.1%} of panel ({', '.join(modes)})")
+        return True
     
     def _should_force_refresh(self) -> bool:
         """Check if a full refresh is needed based on time interval or partial refresh count."""
@@ -508,6 +602,7 @@ class DisplayManager:
             
             self.last_full_refresh = time.time()
             self.partial_refresh_count = 0
+            self._last_pushed_frame = None
             self.logger.info("Ghosting removal completed")
             
         except Exception as e:
@@ -597,12 +692,12 @@ class DisplayManager:
                 font_size = 48
                 
             try:
-                font = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", font_size)
+                font = font_cache.get("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", font_size)
             except:
                 try:
-                    font = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", font_size)
+                    font = font_cache.get("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", font_size)
                 except:
-                    font = ImageFont.load_default()
+                    font = font_cache.default()
             
             # Handle text wrapping for AI responses
             if state == "ai_response":
@@ -741,19 +836,19 @@ class DisplayManager:
         # Try to get a good font
         for size in [font_size, 44, 40, 36, 32]:
             try:
-                font = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", size)
+                font = font_cache.get("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", size)
                 font_size = size
                 break
             except:
                 try:
-                    font = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", size)
+                    font = font_cache.get("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", size)
                     font_size = size
                     break
                 except:
                     continue
         
         if not font:
-            font = ImageFont.load_default()
+            font = font_cache.default()
             font_size = 20
         
         # Calculate usable area (accounting for header and margins) - very conservative
@@ -790,28 +885,7 @@ class DisplayManager:
     
     def _wrap_text_for_font(self, text: str, font, max_width: int) -> list:
         """Wrap text to fit within max_width using the given font."""
-        words = text.split()
-        lines = []
-        current_line = []
-        
-        temp_draw = ImageDraw.Draw(Image.new('L', (100, 100), 255))
-        
-        for word in words:
-            test_line = ' '.join(current_line + [word])
-            bbox = temp_draw.textbbox((0, 0), test_line, font=font)
-            line_width = bbox[2] - bbox[0]
-            
-            if line_width <= max_width:
-                current_line.append(word)
-            else:
-                if current_line:
-                    lines.append(' '.join(current_line))
-                current_line = [word]
-        
-        if current_line:
-            lines.append(' '.join(current_line))
-        
-        return lines
+        return text_layout.wrap(text, font, max_width)
     
     def _show_ai_pages_sequence(self, pages: list, page_duration: float):
         """Show AI response pages in sequence with timing."""
@@ -847,26 +921,26 @@ class DisplayManager:
             # Try to get the best available font - start larger
             for size in [font_size, 88, 80, 72, 64, 56, 48]:
                 try:
-                    font = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", size)
+                    font = font_cache.get("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", size)
                     font_size = size
                     break
                 except:
                     try:
-                        font = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", size)
+                        font = font_cache.get("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", size)
                         font_size = size
                         break
                     except:
                         continue
             
             if not font:
-                font = ImageFont.load_default()
+                font = font_cache.default()
                 font_size = 20
             
             # Draw header with larger font
             header_font_size = min(60, font_size)  # Larger header font
             header_font = None
             try:
-                header_font = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", header_font_size)
+                header_font = font_cache.get("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", header_font_size)
             except:
                 header_font = font
             
@@ -934,6 +1008,8 @@ class DisplayManager:
         if not self.display_device:
             raise RuntimeError("Display device not initialized")
         
+        image = quantize_for_panel(image)
+        
         # Clear frame buffer completely
         white_image = Image.new('L', (self.width, self.height), 255)
         for i in range(2):
@@ -944,38 +1020,39 @@ class DisplayManager:
         
         # Use full refresh for clean display
         self.display_device.draw_full(DisplayModes.GC16)
+        panel_refreshes.inc(kind='full', waveform='GC16')
         self.last_full_refresh = time.time()
         self.partial_refresh_count = 0
+        self._last_pushed_frame = np.asarray(image)
         self.logger.debug("AI response displayed with direct hardware method")
     
     
     def _calculate_optimal_font_size(self, text: str, max_width: int, max_height: int) -> int:
         """Calculate optimal font size for text to fit within given dimensions while remaining readable."""
-        # Start with a large font size and reduce until text fits
-        max_font_size = 72  # Large for distance reading
-        min_font_size = 24  # Minimum readable size
+        # Largest size that fits, between large (distance reading) and minimum readable
+        max_font_size = 72
+        min_font_size = 24
         
-        for font_size in range(max_font_size, min_font_size - 1, -4):
+        def load_font(font_size):
             try:
-                # Test with this font size
-                font = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", font_size)
-            except:
-                try:
-                    font = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", font_size)
-                except:
-                    font = ImageFont.load_default()
-                    return 24  # Fallback size
-            
-            # Wrap text and check if it fits
-            wrapped_lines = self._wrap_text_for_display(text, font, max_width)
-            
-            # Check if the wrapped text fits within height
-            line_height = font.getbbox("Ay")[3] - font.getbbox("Ay")[1] + 8  # Add spacing
-            total_height = len(wrapped_lines) * line_height
-            
-            if total_height <= max_height:
-                self.logger.info(f"Optimal font size calculated: {font_size}px for {len(wrapped_lines)} lines")
-                return font_size
+                return font_cache.get("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", font_size)
+            except Exception:
+                return font_cache.get("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", font_size)
+        
+        def fits(font_size):
+            font = load_font(font_size)
+            bbox = font.getbbox("Ay")
+            line_height = bbox[3] - bbox[1] + 8  # Add spacing
+            return text_layout.count_lines(text, font, max_width) * line_height <= max_height
+        
+        try:
+            font_size = text_layout.fit_font_size(range(max_font_size, min_font_size - 1, -4), fits)
+        except Exception:
+            return 24  # Fallback size
+        
+        if font_size is not None:
+            self.logger.info(f"Optimal font size calculated: {font_size}px")
+            return font_size
         
         # If nothing fits, return minimum size
         self.logger.warning(f"Text too long for optimal sizing, using minimum font size: {min_font_size}px")
@@ -983,19 +1060,7 @@ class DisplayManager:
     
     def _wrap_text_for_display(self, text: str, font, max_width: int) -> list:
         """Wrap text to fit within display width."""
-        import textwrap
-        
-        # Calculate average character width
-        sample_text = "W" * 10  # Use wide character for measurement
-        sample_bbox = ImageDraw.Draw(Image.new('L', (100, 100))).textbbox((0, 0), sample_text, font=font)
-        avg_char_width = (sample_bbox[2] - sample_bbox[0]) / len(sample_text)
-        
-        # Calculate approximate characters per line
-        chars_per_line = int(max_width / avg_char_width) - 2  # Add buffer
-        
-        # Wrap text
-        wrapped = textwrap.fill(text, width=max(chars_per_line, 20))  # Minimum 20 chars per line
-        return wrapped.split('\n')
+        return text_layout.wrap(text, font, max_width)
     
     def _draw_multiline_text(self, draw, position: tuple, text: str, font, fill=0):
         """Draw multi-line text on the display."""
@@ -1014,5 +1079,7 @@ class DisplayManager:
             'height': self.height,
             'rotation': self.rotation,
             'simulation_mode': self.simulation_mode,
-            'last_refresh': self.last_full_refresh
+            'last_refresh': self.last_full_refresh,
+            'region_refresh_enabled': self.region_refresh_enabled,
+            'last_refresh_regions': self.last_refresh_regions
         }
\ No newline at end of file
@@ -0,0 +1,119 @@
+"""
+Display orientation planning.
+
+Orientation is configured in several places: the renderer mirrors frames when
+DISPLAY_MIRROR=true, the panel push applies DISPLAY_MIRROR and
+DISPLAY_PHYSICAL_ROTATION, and the web preview applies the physical rotation.
+Every one of these steps is a flip or a 180 rotation, so any chain of them
+collapses to a single flip, a 180 rotation or nothing. The renderer leaves its
+step pending on the frame and each output applies the net transform once.
+"""
+
+import os
+import threading
+from typing import Dict, NamedTuple, Optional, Tuple
+
+from PIL import Image
+
+# Image.info tag holding the renderer's orientation step still to be applied (survives copy/transpose)
+PENDING_INFO_KEY = 'pending_orientation'
+
+# Outputs a frame can be prepared for
+TARGET_FRAME = 'frame'      # The renderer's own output orientation (simulation, saved frames)
+TARGET_PANEL = 'panel'      # What is pushed to the IT8951 frame buffer
+TARGET_PREVIEW = 'preview'  # The web interface preview
+
+
+class Orientation(NamedTuple):
+    """An element of {identity, flip left-right, flip top-bottom, rotate 180}."""
+    flip_lr: bool = False
+    flip_tb: bool = False
+
+    def then(self, other: 'Orientation') -> 'Orientation':
+        # Flips commute and each is its own inverse, so composing is a per-axis XOR
+        return Orientation(self.flip_lr != other.flip_lr, self.flip_tb != other.flip_tb)
+
+    @property
+    def transpose(self) -> Optional[int]:
+        """PIL transpose method for this orientation, or None for the identity."""
+        if self.flip_lr and self.flip_tb:
+            return Image.ROTATE_180
+        if self.flip_lr:
+            return Image.FLIP_LEFT_RIGHT
+        if self.flip_tb:
+            return Image.FLIP_TOP_BOTTOM
+        return None
+
+
+IDENTITY = Orientation()
+ROTATE_180 = Orientation(True, True)
+
+# DISPLAY_MIRROR as applied when pushing to the panel
+_PANEL_MIRROR = {
+    'true': Orientation(True, False),
+    'vertical': Orientation(False, True),
+    'both': ROTATE_180
+}
+
+
+class DisplayTransformPlanner:
+    """Combines the configured orientation steps into one transpose per output, cached per configuration."""
+
+    def __init__(self):
+        self._plans: Dict[Tuple, Optional[int]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _settings() -> Tuple[str, str]:
+        return os.getenv('DISPLAY_MIRROR', 'false').lower(), os.getenv('DISPLAY_PHYSICAL_ROTATION', '180')
+
+    @staticmethod
+    def _output_steps(target: str, mirror: str, rotation: str) -> Orientation:
+        """Orientation an output applies on top of the renderer's own step."""
+        rotate = ROTATE_180 if rotation == '180' else IDENTITY
+        if target == TARGET_PANEL:
+            return _PANEL_MIRROR.get(mirror, IDENTITY).then(rotate)
+        if target == TARGET_PREVIEW:
+            # Hardware mirroring corrects the panel, so the preview shows the unmirrored result
+            return rotate
+        return IDENTITY
+
+    def render_step(self) -> Orientation:
+        """The renderer's step: DISPLAY_MIRROR=true flips frames both ways."""
+        mirror, _ = self._settings()
+        return ROTATE_180 if mirror == 'true' else IDENTITY
+
+    def defer(self, image: Image.Image) -> Image.Image:
+        """Tag a freshly rendered frame with the renderer's step instead of transposing it now."""
+        step = self.render_step()
+        if step == IDENTITY:
+            image.info.pop(PENDING_INFO_KEY, None)
+        else:
+            image.info[PENDING_INFO_KEY] = tuple(step)
+        return image
+
+    def plan(self, target: str, pending: Orientation = IDENTITY) -> Optional[int]:
+        """Single transpose method taking a frame with 'pending' outstanding to the target, or None."""
+        mirror, rotation = self._settings()
+        key = (target, pending, mirror, rotation)
+        with self._lock:
+            if key in self._plans:
+                return self._plans[key]
+        method = pending.then(self._output_steps(target, mirror, rotation)).transpose
+        with self._lock:
+            self._plans[key] = method
+        return method
+
+    def apply(self, image: Image.Image, target: str) -> Image.Image:
+        """Image oriented for the target with at most one transpose; the input is returned when nothing changes."""
+        pending = Orientation(*image.info.get(PENDING_INFO_KEY, (False, False)))
+        method = self.plan(target, pending)
+        if method is None:
+            return image
+        oriented = image.transpose(method)
+        oriented.info.pop(PENDING_INFO_KEY, None)
+        return oriented
+
+
+# Global planner instance
+display_transform = DisplayTransformPlanner()
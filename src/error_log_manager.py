@@ -12,6 +12,8 @@ from typing import Dict, List, Any, Optional
 import threading
 from collections import defaultdict
 
+from event_log import event_log
+
 
 class DailyErrorLogManager:
     """Manages daily error logs with automatic reset and web interface integration."""
@@ -195,6 +197,7 @@ class DailyErrorLogManager:
             # Update error type summary
             error_type = error_info.get('error_type', error_info.get('level', 'Unknown'))
             self.error_logs['error_summary'][error_type] += 1
+            event_log.record_error(service, error_type)
             
             # Keep only last 25 errors to prevent memory buildup
             if len(self.error_logs['errors']) > 25:
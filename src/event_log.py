@@ -0,0 +1,342 @@
+"""
+Append-only columnar event log for usage statistics.
+
+Displayed-verse, mode-change and error events are stored as fixed-width
+16-byte rows in one binary segment file per day (data/events/YYYY-MM-DD.evt).
+Names (modes, translations, books, error types) are mapped to small integer
+ids through a persisted dictionary, so statistics views are plain NumPy scans
+over the segments in a date range and history is bounded by disk, not RAM.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+# One event per row, little-endian so segments are portable between machines
+ROW_DTYPE = np.dtype([
+    ('ts', '<u4'),           # Unix epoch seconds
+    ('kind', 'u1'),          # KIND_* below
+    ('mode', 'u1'),          # Dictionary id of the display mode
+    ('translation', 'u1'),   # Dictionary id of the (primary) translation
+    ('book', 'u1'),          # Book ordinal (1 = Genesis ... 66 = Revelation)
+    ('chapter', '<u2'),
+    ('verse', '<u2'),
+    ('aux', '<u4')           # Secondary translation id (verse) or error id (error)
+])
+
+KIND_VERSE = 1
+KIND_MODE_CHANGE = 2
+KIND_ERROR = 3
+
+SEGMENT_SUFFIX = '.evt'
+
+# Canonical order so book ids are stable ordinals; other names get ids after these
+BOOK_ORDER = (
+    'Genesis', 'Exodus', 'Leviticus', 'Numbers', 'Deuteronomy', 'Joshua', 'Judges', 'Ruth',
+    '1 Samuel', '2 Samuel', '1 Kings', '2 Kings', '1 Chronicles', '2 Chronicles', 'Ezra', 'Nehemiah',
+    'Esther', 'Job', 'Psalms', 'Proverbs', 'Ecclesiastes', 'Song of Solomon', 'Isaiah', 'Jeremiah',
+    'Lamentations', 'Ezekiel', 'Daniel', 'Hosea', 'Joel', 'Amos', 'Obadiah', 'Jonah', 'Micah', 'Nahum',
+    'Habakkuk', 'Zephaniah', 'Haggai', 'Zechariah', 'Malachi', 'Matthew', 'Mark', 'Luke', 'John', 'Acts',
+    'Romans', '1 Corinthians', '2 Corinthians', 'Galatians', 'Ephesians', 'Philippians', 'Colossians',
+    '1 Thessalonians', '2 Thessalonians', '1 Timothy', '2 Timothy', 'Titus', 'Philemon', 'Hebrews',
+    'James', '1 Peter', '2 Peter', '1 John', '2 John', '3 John', 'Jude', 'Revelation'
+)
+
+# Largest id each dictionary can hand out (bounded by its column width)
+_DICTIONARY_LIMITS = {'mode': 255, 'translation': 255, 'book': 255, 'error': 0xFFFFFFFF}
+
+
+class EventLog:
+    """Daily binary segments of fixed-width event rows plus a name/id dictionary."""
+
+    def __init__(self, directory: str = 'data/events', retention_days: int = 1825, max_cached_segments: int = 64):
+        self.logger = logging.getLogger(__name__)
+        self.directory = Path(directory)
+        self.retention_days = retention_days
+        self.max_cached_segments = max_cached_segments
+        self.dictionary_file = self.directory / 'dictionary.json'
+        self._lock = threading.Lock()
+        self._segments: 'OrderedDict[str, Tuple[int, np.ndarray]]' = OrderedDict()  # date -> (size, rows)
+        self._last_prune_date = None
+        self._last_modes: Dict[str, Tuple[int, int]] = {}  # date -> (size, last mode-change id)
+        self._names = {namespace: [] for namespace in _DICTIONARY_LIMITS}
+        self._ids = {namespace: {} for namespace in _DICTIONARY_LIMITS}
+        self._dictionary_dirty = False
+        self._load_dictionary()
+        for book in BOOK_ORDER:
+            self._id_locked('book', book)
+
+    # === Dictionary ===
+
+    def _load_dictionary(self):
+        try:
+            if self.dictionary_file.exists():
+                with open(self.dictionary_file, 'r') as f:
+                    stored = json.load(f)
+                for namespace in self._names:
+                    names = stored.get(namespace, [])
+                    self._names[namespace] = list(names)
+                    self._ids[namespace] = {name: index + 1 for index, name in enumerate(names)}
+        except Exception as e:
+            self.logger.warning(f"Failed to load event dictionary: {e}")
+
+    def _save_dictionary(self):
+        self._dictionary_dirty = False
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            temp_file = self.dictionary_file.with_suffix('.tmp')
+            with open(temp_file, 'w') as f:
+                json.dump(self._names, f, separators=(',', ':'))
+            os.replace(temp_file, self.dictionary_file)
+        except Exception as e:
+            self.logger.warning(f"Failed to save event dictionary: {e}")
+
+    def _id_locked(self, namespace: str, name: Optional[str]) -> int:
+        """Id for a name (0 = unknown), assigning a new id on first use."""
+        if not name:
+            return 0
+        ids = self._ids[namespace]
+        value = ids.get(name)
+        if value is None:
+            if len(self._names[namespace]) >= _DICTIONARY_LIMITS[namespace]:
+                return 0
+            self._names[namespace].append(name)
+            value = ids[name] = len(self._names[namespace])
+            self._dictionary_dirty = True
+        return value
+
+    def name(self, namespace: str, value: int) -> str:
+        names = self._names[namespace]
+        return names[value - 1] if 0 < value <= len(names) else 'unknown'
+
+    # === Writing ===
+
+    def _segment_path(self, day: date) -> Path:
+        return self.directory / f"{day.isoformat()}{SEGMENT_SUFFIX}"
+
+    def _append(self, at: Optional[datetime], kind: int, mode: Optional[str] = None,
+                translation: Optional[str] = None, book: Optional[str] = None,
+                chapter: int = 0, verse: int = 0, aux_namespace: Optional[str] = None,
+                aux_name: Optional[str] = None):
+        at = at or datetime.now()
+        try:
+            with self._lock:
+                row = np.zeros(1, dtype=ROW_DTYPE)
+                row['ts'] = int(time.mktime(at.timetuple()))
+                row['kind'] = kind
+                row['mode'] = self._id_locked('mode', mode)
+                row['translation'] = self._id_locked('translation', translation)
+                row['book'] = self._id_locked('book', book)
+                row['chapter'] = min(int(chapter or 0), 0xFFFF)
+                row['verse'] = min(int(verse or 0), 0xFFFF)
+                if aux_namespace:
+                    row['aux'] = self._id_locked(aux_namespace, aux_name)
+
+                self.directory.mkdir(parents=True, exist_ok=True)
+                if self._dictionary_dirty:
+                    self._save_dictionary()  # Ids must be on disk before rows that use them
+                with open(self._segment_path(at.date()), 'ab') as f:
+                    f.write(row.tobytes())
+
+                if self._last_prune_date != at.date():
+                    self._last_prune_date = at.date()
+                    self._prune_locked(at.date())
+        except Exception as e:
+            self.logger.warning(f"Failed to append event: {e}")
+
+    def record_verse(self, book: Optional[str], chapter: int, verse: int, translation: Optional[str],
+                     mode: Optional[str], secondary_translation: Optional[str] = None,
+                     at: Optional[datetime] = None):
+        """Append a displayed-verse event."""
+        self._append(at, KIND_VERSE, mode=mode, translation=(translation or '').lower(), book=book,
+                     chapter=chapter, verse=verse, aux_namespace='translation' if secondary_translation else None,
+                     aux_name=(secondary_translation or '').lower())
+
+    def record_mode_change(self, mode: str, at: Optional[datetime] = None):
+        """Append a display mode change event."""
+        self._append(at, KIND_MODE_CHANGE, mode=mode)
+
+    def record_error(self, service: str, error_type: str, at: Optional[datetime] = None):
+        """Append an error event."""
+        self._append(at, KIND_ERROR, aux_namespace='error', aux_name=f"{service}/{error_type}")
+
+    def _prune_locked(self, today: date):
+        """Delete segments older than the retention window."""
+        if self.retention_days <= 0:
+            return
+        cutoff = (today - timedelta(days=self.retention_days)).isoformat()
+        for path in self.directory.glob(f"*{SEGMENT_SUFFIX}"):
+            if path.stem < cutoff:
+                try:
+                    path.unlink()
+                    self._segments.pop(path.stem, None)
+                    self._last_modes.pop(path.stem, None)
+                except OSError as e:
+                    self.logger.debug(f"Could not prune event segment {path.name}: {e}")
+
+    # === Reading ===
+
+    def _load_segment(self, day: date) -> np.ndarray:
+        """Rows of one day; finished segments are cached until their file size changes."""
+        key = day.isoformat()
+        path = self._segment_path(day)
+        try:
+            size = path.stat().st_size
+        except OSError:
+            return np.zeros(0, dtype=ROW_DTYPE)
+        size -= size % ROW_DTYPE.itemsize  # Ignore a torn trailing row from a crash mid-append
+
+        with self._lock:
+            cached = self._segments.get(key)
+            if cached and cached[0] == size:
+                self._segments.move_to_end(key)
+                return cached[1]
+
+        rows = np.fromfile(path, dtype=ROW_DTYPE, count=size // ROW_DTYPE.itemsize)
+        with self._lock:
+            self._segments[key] = (size, rows)
+            self._segments.move_to_end(key)
+            while len(self._segments) > self.max_cached_segments:
+                self._segments.popitem(last=False)
+        return rows
+
+    def read(self, start: date, end: date, kind: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray, List[date]]:
+        """Rows between two dates (inclusive) plus each row's day index into the returned day list."""
+        days = [start + timedelta(days=offset) for offset in range(max(0, (end - start).days + 1))]
+        parts = []
+        day_index = []
+        for index, day in enumerate(days):
+            rows = self._load_segment(day)
+            if kind is not None and len(rows):
+                rows = rows[rows['kind'] == kind]
+            if len(rows):
+                parts.append(rows)
+                day_index.append(np.full(len(rows), index, dtype=np.int32))
+        if not parts:
+            return np.zeros(0, dtype=ROW_DTYPE), np.zeros(0, dtype=np.int32), days
+        return np.concatenate(parts), np.concatenate(day_index), days
+
+    def _named_counts(self, namespace: str, column: np.ndarray) -> Dict[str, int]:
+        counts = np.bincount(column.astype(np.int64))
+        return {self.name(namespace, int(value)): int(counts[value]) for value in np.nonzero(counts)[0]}
+
+    def verse_stats(self, start: date, end: date) -> Dict:
+        """Verse counts by book, translation, mode, day and hour for a date range."""
+        rows, day_index, days = self.read(start, end, KIND_VERSE)
+
+        # Hour of day relative to each row's local midnight
+        midnights = np.array([time.mktime(day.timetuple()) for day in days], dtype=np.int64)
+        hours = np.zeros(0, dtype=np.int64)
+        if len(rows):
+            hours = np.clip((rows['ts'].astype(np.int64) - midnights[day_index]) // 3600, 0, 23)
+
+        per_day = np.bincount(day_index, minlength=len(days))
+        per_hour = np.bincount(hours, minlength=24)
+        books = self._named_counts('book', rows['book'][rows['book'] > 0]) if len(rows) else {}
+
+        # Parallel verses count toward both translations
+        translations = np.concatenate([rows['translation'], rows['aux'][rows['aux'] > 0]]) if len(rows) else rows['translation']
+
+        return {
+            'total': int(len(rows)),
+            'by_book': books,
+            'unique_books': len(books),
+            'by_translation': self._named_counts('translation', translations) if len(translations) else {},
+            'by_mode': self._named_counts('mode', rows['mode']) if len(rows) else {},
+            'by_day': {day.isoformat(): int(count) for day, count in zip(days, per_day)},
+            'by_hour': {hour: int(count) for hour, count in enumerate(per_hour) if count}
+        }
+
+    def _last_mode_change(self, day: date) -> int:
+        """Mode id of the last mode change recorded on a day (0 if none), memoised per segment size."""
+        key = day.isoformat()
+        try:
+            size = self._segment_path(day).stat().st_size
+        except OSError:
+            return 0
+        with self._lock:
+            cached = self._last_modes.get(key)
+        if cached and cached[0] == size:
+            return cached[1]
+        rows = self._load_segment(day)
+        modes = rows['mode'][rows['kind'] == KIND_MODE_CHANGE]
+        value = int(modes[-1]) if len(modes) else 0
+        with self._lock:
+            self._last_modes[key] = (size, value)
+        return value
+
+    def mode_at_start(self, day: date) -> int:
+        """Mode id in effect at midnight before a day, from the latest earlier segment with a mode change."""
+        if not self.directory.exists():
+            return 0
+        cutoff = day.isoformat()
+        earlier = sorted((path.stem for path in self.directory.glob(f"*{SEGMENT_SUFFIX}") if path.stem < cutoff),
+                         reverse=True)
+        for stem in earlier:
+            value = self._last_mode_change(datetime.strptime(stem, '%Y-%m-%d').date())
+            if value:
+                return value
+        return 0
+
+    def mode_usage_seconds(self, start: date, end: date, until: Optional[datetime] = None) -> Dict[str, float]:
+        """Seconds spent in each mode, from consecutive mode-change events in the range.
+
+        The range opens in the mode of the last change before it, so a clock that stays in
+        one mode is still counted.
+        """
+        rows, _, _ = self.read(start, end, KIND_MODE_CHANGE)
+        timestamps = rows['ts'].astype(np.int64)
+        modes = rows['mode'].astype(np.int64)
+        initial = self.mode_at_start(start)
+        if initial:
+            timestamps = np.insert(timestamps, 0, int(time.mktime(start.timetuple())))
+            modes = np.insert(modes, 0, initial)
+        if not len(timestamps):
+            return {}
+        stop = time.mktime((until or datetime.now()).timetuple())
+        range_end = time.mktime((end + timedelta(days=1)).timetuple())
+        durations = np.diff(np.append(timestamps, min(stop, range_end)))
+        durations = np.clip(durations, 0, None)
+        totals = np.bincount(modes, weights=durations)
+        return {self.name('mode', int(value)): float(totals[value]) for value in np.nonzero(totals)[0]}
+
+    def error_counts(self, start: date, end: date) -> Dict[str, int]:
+        """Error counts by 'service/error_type' for a date range."""
+        rows, _, _ = self.read(start, end, KIND_ERROR)
+        return self._named_counts('error', rows['aux']) if len(rows) else {}
+
+    def oldest_date(self) -> Optional[date]:
+        """Date of the oldest segment on disk."""
+        segments = sorted(path.stem for path in self.directory.glob(f"*{SEGMENT_SUFFIX}")) if self.directory.exists() else []
+        return datetime.strptime(segments[0], '%Y-%m-%d').date() if segments else None
+
+    def get_stats(self) -> Dict:
+        segments = sorted(self.directory.glob(f"*{SEGMENT_SUFFIX}")) if self.directory.exists() else []
+        total_bytes = sum(path.stat().st_size for path in segments)
+        with self._lock:
+            cached = len(self._segments)
+        return {
+            'directory': str(self.directory),
+            'segments': len(segments),
+            'bytes': total_bytes,
+            'rows': total_bytes // ROW_DTYPE.itemsize,
+            'oldest': segments[0].stem if segments else None,
+            'newest': segments[-1].stem if segments else None,
+            'cached_segments': cached,
+            'retention_days': self.retention_days
+        }
+
+
+# Global event log instance
+event_log = EventLog(
+    directory=os.getenv('EVENT_LOG_DIR', 'data/events'),
+    retention_days=int(os.getenv('EVENT_LOG_RETENTION_DAYS', '1825'))
+)
@@ -0,0 +1,86 @@
+"""
+Process-wide LRU cache of loaded fonts shared by all renderers.
+"""
+
+import logging
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, Tuple
+
+from PIL import ImageFont
+
+
+class FontCache:
+    """Parses each TrueType file once per size and keeps the most recently used fonts."""
+
+    def __init__(self, max_entries: int = 64):
+        self.logger = logging.getLogger(__name__)
+        self.max_entries = max(1, max_entries)
+        self._fonts: "OrderedDict[Tuple[str, int], ImageFont.FreeTypeFont]" = OrderedDict()
+        self._missing = set()  # Paths that failed to load, so fallback chains don't retry them per frame
+        self._default = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, path, size: int) -> ImageFont.FreeTypeFont:
+        """Get the font at path and size, loading it on first use (raises OSError like ImageFont.truetype)."""
+        key = (str(path), int(size))
+        with self._lock:
+            font = self._fonts.get(key)
+            if font is not None:
+                self._fonts.move_to_end(key)
+                self.hits += 1
+                return font
+            if key[0] in self._missing:
+                raise OSError(f"cannot open resource: {key[0]}")
+            self.misses += 1
+
+        # Parse outside the lock; a concurrent duplicate load is harmless
+        try:
+            font = ImageFont.truetype(key[0], key[1])
+        except OSError:
+            if not os.path.exists(key[0]):
+                with self._lock:
+                    self._missing.add(key[0])
+            raise
+
+        with self._lock:
+            self._fonts[key] = font
+            self._fonts.move_to_end(key)
+            while len(self._fonts) > self.max_entries:
+                self._fonts.popitem(last=False)
+                self.evictions += 1
+        return font
+
+    def default(self) -> ImageFont.ImageFont:
+        """Pillow's built-in default font (loaded once)."""
+        with self._lock:
+            if self._default is None:
+                self._default = ImageFont.load_default()
+            return self._default
+
+    def clear(self):
+        """Drop all cached fonts (e.g. after installing new font files)."""
+        with self._lock:
+            self._fonts.clear()
+            self._missing.clear()
+
+    def get_stats(self) -> Dict:
+        """Cache size and hit/miss counters."""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'entries': len(self._fonts),
+                'max_entries': self.max_entries,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_ratio': round(self.hits / total, 3) if total else 0.0
+            }
+
+
+# Global font cache instance
+font_cache = FontCache(max_entries=int(os.getenv('FONT_CACHE_SIZE', '64')))
@@ -0,0 +1,175 @@
+"""
+Cache of finished display frames.
+
+Paginated pages, forced refreshes and recurring time-mode verses produce the
+same frame again and again. Final frames are kept packed in the panel's 4bpp
+format in an LRU bounded by a memory budget, optionally backed by raw packed
+files on disk so frames that recur a day later survive both eviction and
+restarts.
+"""
+
+import hashlib
+import logging
+import os
+import struct
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from PIL import Image
+
+from frame_pipeline import pack_4bpp, packed_size, unpack_4bpp
+
+# Bump when frame drawing changes so stale disk frames are ignored
+FRAME_FORMAT_VERSION = 2
+
+# Disk frame header: width, height, total pages
+_DISK_HEADER = struct.Struct('<HHH')
+
+
+class FrameCache:
+    """LRU of packed 4bpp frames under a byte budget, with an optional disk tier."""
+
+    def __init__(self, max_bytes: int = 24 * 1024 * 1024, disk_dir: Optional[str] = None,
+                 max_disk_bytes: int = 256 * 1024 * 1024, enabled: bool = True):
+        self.logger = logging.getLogger(__name__)
+        self.enabled = enabled
+        self.max_bytes = max_bytes
+        self.disk_dir = Path(disk_dir) if disk_dir else None
+        self.max_disk_bytes = max_disk_bytes
+        self._frames: "OrderedDict[tuple, Tuple[bytes, Tuple[int, int], int]]" = OrderedDict()  # key -> (packed, size, pages)
+        self._bytes = 0
+        self._disk_bytes = None  # Scanned lazily on the first disk write
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def _disk_path(self, key: tuple) -> Optional[Path]:
+        if not self.disk_dir:
+            return None
+        digest = hashlib.sha1(f"{FRAME_FORMAT_VERSION}|{key!r}".encode('utf-8')).hexdigest()[:24]
+        return self.disk_dir / f"frame_{digest}.4bpp"
+
+    def get(self, key: tuple) -> Optional[Tuple[Image.Image, int]]:
+        """(frame, total pages) for key (memory first, then disk), or None."""
+        if not self.enabled:
+            return None
+        with self._lock:
+            entry = self._frames.get(key)
+            if entry is not None:
+                self._frames.move_to_end(key)
+                self.hits += 1
+        if entry is not None:
+            return unpack_4bpp(entry[0], entry[1]), entry[2]
+
+        disk_path = self._disk_path(key)
+        if disk_path and disk_path.exists():
+            try:
+                stored = disk_path.read_bytes()
+                width, height, pages = _DISK_HEADER.unpack_from(stored)
+                packed = stored[_DISK_HEADER.size:]
+                if len(packed) != packed_size((width, height)):
+                    raise ValueError(f"truncated frame ({len(packed)} bytes)")
+                self._remember(key, packed, (width, height), pages)
+                os.utime(disk_path)  # Keep recently used frames when pruning
+                with self._lock:
+                    self.disk_hits += 1
+                return unpack_4bpp(packed, (width, height)), pages
+            except Exception as e:
+                self.logger.debug(f"Failed to read cached frame {disk_path}: {e}")
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, key: tuple, image: Image.Image, pages: int = 1):
+        """Store a finished frame (quantised to the panel's grey levels and packed)."""
+        if not self.enabled:
+            return
+        packed = pack_4bpp(image)
+        self._remember(key, packed, image.size, pages)
+
+        disk_path = self._disk_path(key)
+        if disk_path and not disk_path.exists():
+            try:
+                disk_path.parent.mkdir(parents=True, exist_ok=True)
+                temp_path = disk_path.with_suffix('.tmp')
+                with open(temp_path, 'wb') as f:
+                    f.write(_DISK_HEADER.pack(image.width, image.height, pages))
+                    f.write(packed)
+                os.replace(temp_path, disk_path)
+                self._account_disk(disk_path.stat().st_size)
+            except Exception as e:
+                self.logger.debug(f"Failed to persist frame {disk_path}: {e}")
+
+    def _remember(self, key: tuple, packed: bytes, size: Tuple[int, int], pages: int):
+        with self._lock:
+            previous = self._frames.pop(key, None)
+            if previous is not None:
+                self._bytes -= len(previous[0])
+            if len(packed) > self.max_bytes:
+                return
+            self._frames[key] = (packed, size, pages)
+            self._bytes += len(packed)
+            while self._bytes > self.max_bytes and self._frames:
+                _, (evicted, _, _) = self._frames.popitem(last=False)
+                self._bytes -= len(evicted)
+
+    def _account_disk(self, added: int):
+        """Track disk usage and drop the least recently used frames over the budget."""
+        with self._lock:
+            if self._disk_bytes is None:
+                self._disk_bytes = sum(path.stat().st_size for path in self.disk_dir.glob('frame_*.4bpp'))
+            else:
+                self._disk_bytes += added
+            if self._disk_bytes <= self.max_disk_bytes:
+                return
+            files = sorted(self.disk_dir.glob('frame_*.4bpp'), key=lambda path: path.stat().st_mtime)
+            # Prune down to 90% so the scan does not run on every write
+            for stale in files:
+                if self._disk_bytes <= self.max_disk_bytes * 0.9:
+                    break
+                try:
+                    size = stale.stat().st_size
+                    stale.unlink()
+                    self._disk_bytes -= size
+                except OSError:
+                    pass
+
+    def clear(self, disk: bool = False):
+        """Drop cached frames (and the disk tier if requested)."""
+        with self._lock:
+            self._frames.clear()
+            self._bytes = 0
+            if disk and self.disk_dir and self.disk_dir.exists():
+                for path in self.disk_dir.glob('frame_*.4bpp'):
+                    try:
+                        path.unlink()
+                    except OSError:
+                        pass
+                self._disk_bytes = 0
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            return {
+                'enabled': self.enabled,
+                'frames': len(self._frames),
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'disk_enabled': self.disk_dir is not None,
+                'disk_bytes': self._disk_bytes
+            }
+
+
+# Global frame cache instance (the disk tier is opt-in to spare SD cards)
+frame_cache = FrameCache(
+    max_bytes=int(float(os.getenv('FRAME_CACHE_MAX_MB', '24')) * 1024 * 1024),
+    disk_dir=os.getenv('FRAME_CACHE_DIR', 'data/frame_cache') if os.getenv('FRAME_CACHE_DISK_ENABLED', 'false').lower() == 'true' else None,
+    max_disk_bytes=int(float(os.getenv('FRAME_CACHE_MAX_DISK_MB', '256')) * 1024 * 1024),
+    enabled=os.getenv('FRAME_CACHE_ENABLED', 'true').lower() == 'true'
+)
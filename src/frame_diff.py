@@ -0,0 +1,113 @@
+"""
+Tile-based frame diffing for partial e-ink refreshes.
+
+Compares the new panel frame with the last pushed one in fixed-size tiles,
+groups changed tiles into bounding rectangles and picks a waveform per
+rectangle, so a minute change that only touches the reference line pushes
+and refreshes just that strip instead of the whole panel.
+"""
+
+import logging
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+try:
+    from display_constants import DisplayModes
+except ImportError:
+    from .display_constants import DisplayModes
+
+Region = Tuple[int, int, int, int]  # (left, top, right, bottom), right/bottom exclusive
+
+
+class FrameDiffer:
+    """Finds changed rectangles between two 'L' frames and chooses DU or GC16 for each."""
+
+    def __init__(self, tile_size: int = 32, max_regions: int = 8, max_area_ratio: float = 0.6,
+                 gc16_gray_ratio: float = 0.5):
+        self.logger = logging.getLogger(__name__)
+        # IT8951 4bpp area loads need x and width aligned to 4 pixels; tiles keep every region aligned
+        self.tile_size = max(4, tile_size - tile_size % 4)
+        self.max_regions = max_regions
+        self.max_area_ratio = max_area_ratio
+        self.gc16_gray_ratio = gc16_gray_ratio
+
+    def changed_tiles(self, previous: np.ndarray, current: np.ndarray) -> np.ndarray:
+        """Boolean grid with one cell per tile, True where any pixel differs."""
+        height, width = current.shape
+        tile = self.tile_size
+        rows, cols = -(-height // tile), -(-width // tile)
+        changed = previous != current
+        if rows * tile != height or cols * tile != width:
+            changed = np.pad(changed, ((0, rows * tile - height), (0, cols * tile - width)))
+        return changed.reshape(rows, tile, cols, tile).any(axis=(1, 3))
+
+    def diff_regions(self, previous: Optional[np.ndarray], current: np.ndarray) -> Optional[List[Region]]:
+        """Changed rectangles in pixel coordinates; None when a whole-frame update is the better choice."""
+        if previous is None or previous.shape != current.shape:
+            return None
+        tiles = self.changed_tiles(previous, current)
+        if not tiles.any():
+            return []
+
+        boxes = self._merge_boxes(self._tile_components(tiles))
+        height, width = current.shape
+        tile = self.tile_size
+        regions = [(left * tile, top * tile, min(right * tile, width), min(bottom * tile, height))
+                   for top, left, bottom, right in boxes]
+
+        area = sum((right - left) * (bottom - top) for left, top, right, bottom in regions)
+        if len(regions) > self.max_regions or area > self.max_area_ratio * width * height:
+            return None
+        return regions
+
+    def _tile_components(self, tiles: np.ndarray) -> List[List[int]]:
+        """Bounding boxes [top, left, bottom, right] (in tiles, exclusive) of 8-connected changed tiles."""
+        rows, cols = tiles.shape
+        seen = np.zeros_like(tiles)
+        boxes = []
+        for row, col in zip(*np.nonzero(tiles)):
+            if seen[row, col]:
+                continue
+            seen[row, col] = True
+            stack = [(row, col)]
+            box = [row, col, row + 1, col + 1]
+            while stack:
+                r, c = stack.pop()
+                box[0], box[1] = min(box[0], r), min(box[1], c)
+                box[2], box[3] = max(box[2], r + 1), max(box[3], c + 1)
+                for nr in range(max(r - 1, 0), min(r + 2, rows)):
+                    for nc in range(max(c - 1, 0), min(c + 2, cols)):
+                        if tiles[nr, nc] and not seen[nr, nc]:
+                            seen[nr, nc] = True
+                            stack.append((nr, nc))
+            boxes.append([int(value) for value in box])
+        return boxes
+
+    @staticmethod
+    def _merge_boxes(boxes: List[List[int]]) -> List[List[int]]:
+        """Merge overlapping bounding boxes until none overlap."""
+        merged = True
+        while merged:
+            merged = False
+            result = []
+            for box in boxes:
+                for other in result:
+                    if box[0] < other[2] and other[0] < box[2] and box[1] < other[3] and other[1] < box[3]:
+                        other[0], other[1] = min(other[0], box[0]), min(other[1], box[1])
+                        other[2], other[3] = max(other[2], box[2]), max(other[3], box[3])
+                        merged = True
+                        break
+                else:
+                    result.append(box)
+            boxes = result
+        return boxes
+
+    def choose_mode(self, pixels: np.ndarray) -> int:
+        """DU for black/white content (text on a plain background), GC16 when the region is mostly grayscale."""
+        ink = pixels < 224
+        ink_count = int(np.count_nonzero(ink))
+        if ink_count == 0:
+            return DisplayModes.DU
+        gray_count = int(np.count_nonzero(ink & (pixels > 32)))
+        return DisplayModes.GC16 if gray_count / ink_count > self.gc16_gray_ratio else DisplayModes.DU
@@ -0,0 +1,62 @@
+"""
+Panel-format helpers for finished frames.
+
+The IT8951 panel shows 16 grey levels. Frames are quantised to those levels
+exactly once (rounding to the nearest level, so the driver's own 4bpp packing
+is lossless) and tagged, and frames kept around are stored packed two pixels
+per byte in the panel's native 4bpp layout.
+"""
+
+from typing import Tuple
+
+import numpy as np
+from PIL import Image
+
+PANEL_GREY_LEVELS = 16
+
+# Image.info tag marking a frame that already holds only panel grey levels (survives copy/transpose)
+QUANTISED_INFO_KEY = 'panel_grey_levels'
+
+# Nearest of the 16 levels 0x00, 0x11, ... 0xFF, so the high nibble is the panel level
+_QUANTISE_LUT = [((value + 8) // 17) * 17 for value in range(256)]
+
+
+def is_quantised(image: Image.Image) -> bool:
+    return image.mode == 'L' and image.info.get(QUANTISED_INFO_KEY) == PANEL_GREY_LEVELS
+
+
+def quantize_for_panel(image: Image.Image) -> Image.Image:
+    """Frame reduced to the panel's 16 grey levels; already-quantised frames are returned as-is."""
+    if is_quantised(image):
+        return image
+    if image.mode != 'L':
+        image = image.convert('L')
+    quantised = image.point(_QUANTISE_LUT)
+    quantised.info[QUANTISED_INFO_KEY] = PANEL_GREY_LEVELS
+    return quantised
+
+
+def mark_unquantised(image: Image.Image) -> Image.Image:
+    """Drop the quantised tag after an operation that introduces new grey values (resize, drawing)."""
+    image.info.pop(QUANTISED_INFO_KEY, None)
+    return image
+
+
+def pack_4bpp(image: Image.Image) -> bytes:
+    """Pack an 'L' frame two pixels per byte (left pixel in the high nibble, rows padded to whole bytes)."""
+    pixels = np.asarray(quantize_for_panel(image))
+    if pixels.shape[1] % 2:
+        pixels = np.pad(pixels, ((0, 0), (0, 1)), constant_values=255)
+    return ((pixels[:, 0::2] & 0xF0) | (pixels[:, 1::2] >> 4)).tobytes()
+
+
+def unpack_4bpp(data: bytes, size: Tuple[int, int]) -> Image.Image:
+    """Rebuild a quantised 'L' frame from pack_4bpp output."""
+    image = Image.frombytes('L', size, data, 'raw', 'L;4')
+    image.info[QUANTISED_INFO_KEY] = PANEL_GREY_LEVELS
+    return image
+
+
+def packed_size(size: Tuple[int, int]) -> int:
+    width, height = size
+    return (width + 1) // 2 * height
@@ -0,0 +1,203 @@
+"""
+Shared pooled HTTP client for outbound requests.
+
+One keep-alive session per host with bounded connection pools, automatic
+retries with backoff for idempotent requests, default timeouts and an
+optional ETag/Last-Modified disk cache for conditional GETs.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    from urllib3.util.retry import Retry
+except ImportError:
+    Retry = None
+
+
+class HttpClient:
+    """Per-host pooled sessions with retries and conditional-GET caching."""
+
+    RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+    def __init__(self, pool_maxsize: int = 4, retries: int = 2, backoff_factor: float = 0.5,
+                 default_timeout: float = 10.0, cache_dir: Optional[str] = None,
+                 max_cache_entry_bytes: int = 20 * 1024 * 1024):
+        self.logger = logging.getLogger(__name__)
+        self.pool_maxsize = pool_maxsize
+        self.retries = retries
+        self.backoff_factor = backoff_factor
+        self.default_timeout = default_timeout
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.max_cache_entry_bytes = max_cache_entry_bytes
+        self.user_agent = f"BibleClock/5 python-requests/{requests.__version__}"
+        self._sessions: Dict[Tuple[str, int], requests.Session] = {}  # (host, retries) -> session
+        self._lock = threading.Lock()
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    def _create_session(self, retries: int) -> requests.Session:
+        session = requests.Session()
+        session.headers['User-Agent'] = self.user_agent
+        if Retry is not None and retries > 0:
+            retry = Retry(
+                total=retries,
+                connect=retries,
+                read=retries,
+                status=retries,
+                backoff_factor=self.backoff_factor,
+                status_forcelist=self.RETRY_STATUSES,
+                allowed_methods=frozenset(['GET', 'HEAD', 'OPTIONS']),
+                respect_retry_after_header=True,
+                raise_on_status=False
+            )
+        else:
+            retry = retries
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_maxsize, max_retries=retry)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        return session
+
+    def session_for(self, url: str, retries: Optional[int] = None) -> requests.Session:
+        """Get the keep-alive session for a URL's host and retry count, creating it on first use."""
+        parts = urlsplit(url)
+        key = (f"{parts.scheme}://{parts.netloc}", self.retries if retries is None else retries)
+        with self._lock:
+            session = self._sessions.get(key)
+            if session is None:
+                session = self._create_session(key[1])
+                self._sessions[key] = session
+            return session
+
+    def request(self, method: str, url: str, timeout: Optional[float] = None, retries: Optional[int] = None,
+                **kwargs) -> requests.Response:
+        """Send a request through the host's pooled session; retries=0 fails fast for callers with their own back-off."""
+        return self.session_for(url, retries).request(method, url, timeout=timeout or self.default_timeout, **kwargs)
+
+    def get(self, url: str, params: Optional[Dict] = None, headers: Optional[Dict] = None,
+            timeout: Optional[float] = None, use_cache: bool = False, retries: Optional[int] = None,
+            **kwargs) -> requests.Response:
+        """GET a URL; with use_cache, revalidate against the disk cache using ETag/Last-Modified."""
+        if not use_cache or not self.cache_dir:
+            return self.request('GET', url, timeout=timeout, retries=retries, params=params, headers=headers,
+                                **kwargs)
+
+        cache_key = self._cache_key(url, params)
+        cached = self._load_cache_entry(cache_key)
+        request_headers = dict(headers or {})
+        if cached:
+            if cached.get('etag'):
+                request_headers['If-None-Match'] = cached['etag']
+            if cached.get('last_modified'):
+                request_headers['If-Modified-Since'] = cached['last_modified']
+
+        response = self.request('GET', url, timeout=timeout, retries=retries, params=params,
+                                headers=request_headers, **kwargs)
+
+        if response.status_code == 304 and cached:
+            self.cache_hits += 1
+            return self._build_cached_response(cached, cache_key, response)
+
+        self.cache_misses += 1
+        if response.status_code == 200 and (response.headers.get('ETag') or response.headers.get('Last-Modified')):
+            self._store_cache_entry(cache_key, response)
+        return response
+
+    def post(self, url: str, timeout: Optional[float] = None, **kwargs) -> requests.Response:
+        """POST through the host's pooled session (not retried on status codes)."""
+        return self.request('POST', url, timeout=timeout, **kwargs)
+
+    # === Conditional GET disk cache ===
+
+    def _cache_key(self, url: str, params: Optional[Dict]) -> str:
+        params_part = json.dumps(sorted((params or {}).items()), default=str)
+        return hashlib.sha1(f"{url}|{params_part}".encode('utf-8')).hexdigest()
+
+    def _load_cache_entry(self, cache_key: str) -> Optional[Dict]:
+        meta_path = self.cache_dir / f"{cache_key}.json"
+        body_path = self.cache_dir / f"{cache_key}.body"
+        if not meta_path.exists() or not body_path.exists():
+            return None
+        try:
+            with open(meta_path, 'r') as f:
+                return json.load(f)
+        except Exception as e:
+            self.logger.debug(f"Ignoring unreadable HTTP cache entry {cache_key}: {e}")
+            return None
+
+    def _store_cache_entry(self, cache_key: str, response: requests.Response):
+        try:
+            body = response.content
+            if len(body) > self.max_cache_entry_bytes:
+                return
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            body_path = self.cache_dir / f"{cache_key}.body"
+            meta_path = self.cache_dir / f"{cache_key}.json"
+            temp_body = body_path.with_suffix('.body.tmp')
+            with open(temp_body, 'wb') as f:
+                f.write(body)
+            os.replace(temp_body, body_path)
+            meta = {
+                'url': response.url,
+                'etag': response.headers.get('ETag'),
+                'last_modified': response.headers.get('Last-Modified'),
+                'content_type': response.headers.get('Content-Type'),
+                'encoding': response.encoding
+            }
+            temp_meta = meta_path.with_suffix('.json.tmp')
+            with open(temp_meta, 'w') as f:
+                json.dump(meta, f)
+            os.replace(temp_meta, meta_path)
+        except Exception as e:
+            self.logger.debug(f"Failed to store HTTP cache entry for {response.url}: {e}")
+
+    def _build_cached_response(self, cached: Dict, cache_key: str, not_modified: requests.Response) -> requests.Response:
+        response = requests.Response()
+        with open(self.cache_dir / f"{cache_key}.body", 'rb') as f:
+            response._content = f.read()
+        response.status_code = 200
+        response.url = cached.get('url') or not_modified.url
+        response.headers.update(not_modified.headers)
+        if cached.get('content_type'):
+            response.headers['Content-Type'] = cached['content_type']
+        response.encoding = cached.get('encoding')
+        response.request = not_modified.request
+        response.reason = 'OK (revalidated)'
+        return response
+
+    def get_stats(self) -> Dict:
+        """Session and cache statistics."""
+        with self._lock:
+            hosts = sorted({host for host, _ in self._sessions})
+        return {
+            'hosts': hosts,
+            'cache_enabled': self.cache_dir is not None,
+            'cache_hits': self.cache_hits,
+            'cache_misses': self.cache_misses
+        }
+
+    def close(self):
+        """Close all pooled sessions."""
+        with self._lock:
+            for session in self._sessions.values():
+                session.close()
+            self._sessions.clear()
+
+
+# Global HTTP client instance
+http_client = HttpClient(
+    pool_maxsize=int(os.getenv('HTTP_POOL_MAXSIZE', '4')),
+    retries=int(os.getenv('HTTP_RETRIES', '2')),
+    backoff_factor=float(os.getenv('HTTP_BACKOFF_FACTOR', '0.5')),
+    default_timeout=float(os.getenv('REQUEST_TIMEOUT', '10')),
+    cache_dir=os.getenv('HTTP_CACHE_DIR', 'data/http_cache') if os.getenv('HTTP_CACHE_ENABLED', 'true').lower() == 'true' else None
+)
@@ -5,11 +5,24 @@ Generates images for Bible verses with backgrounds and typography.
 import os
 import random
 import logging
+import threading
+import time
 from PIL import Image, ImageDraw, ImageFont
 from pathlib import Path
 from typing import Dict, Tuple, Optional, List
+import hashlib
+import json
 import textwrap
+from collections import OrderedDict
 from datetime import datetime
+from frame_cache import frame_cache
+from frame_pipeline import quantize_for_panel
+from display_transform import display_transform
+from font_cache import font_cache
+from text_layout import text_layout
+from layer_cache import layer_cache
+from prometheus_metrics import render_seconds
+from tracing import tracer
 
 class ImageGenerator:
     def __init__(self):
@@ -63,6 +76,12 @@ class ImageGenerator:
         self.reference_x_offset = 0  # Custom X offset from calculated position
         self.reference_y_offset = 30  # Push reference down 30 pixels from top (was 20)
         self.reference_margin = 20   # Margin from edges
+        
+        # Render-time override used when pre-rendering the next minute's frame
+        self._render_clock = threading.local()
+        
+        # Page count learned per frame content so paginated frames can be looked up before drawing
+        self._frame_pages: "OrderedDict[str, int]" = OrderedDict()
     
     def _get_font(self, size: int):
         """Get a font at the specified size."""
@@ -70,16 +89,16 @@ class ImageGenerator:
             # Try system DejaVu fonts first
             system_dejavu_path = Path('/usr/share/fonts/truetype/dejavu')
             if system_dejavu_path.exists():
-                return ImageFont.truetype(str(system_dejavu_path / 'DejaVuSans.ttf'), size)
+                return font_cache.get(str(system_dejavu_path / 'DejaVuSans.ttf'), size)
             else:
                 # Fallback to local fonts
                 font_dir = Path('data/fonts')
-                return ImageFont.truetype(str(font_dir / 'DejaVuSans.ttf'), size)
+                return font_cache.get(str(font_dir / 'DejaVuSans.ttf'), size)
         except Exception as e:
             self.logger.warning(f"Failed to load font at size {size}: {e}")
             # Return default font
             try:
-                return ImageFont.load_default()
+                return font_cache.default()
             except:
                 return None
     
@@ -92,15 +111,15 @@ class ImageGenerator:
         try:
             # Try system DejaVu fonts first
             if system_dejavu_path.exists():
-                self.title_font = ImageFont.truetype(str(system_dejavu_path / 'DejaVuSans-Bold.ttf'), self.title_size)
-                self.verse_font = ImageFont.truetype(str(system_dejavu_path / 'DejaVuSans.ttf'), self.verse_size)
-                self.reference_font = ImageFont.truetype(str(system_dejavu_path / 'DejaVuSans-Bold.ttf'), self.reference_size)
+                self.title_font = font_cache.get(str(system_dejavu_path / 'DejaVuSans-Bold.ttf'), self.title_size)
+                self.verse_font = font_cache.get(str(system_dejavu_path / 'DejaVuSans.ttf'), self.verse_size)
+                self.reference_font = font_cache.get(str(system_dejavu_path / 'DejaVuSans-Bold.ttf'), self.reference_size)
                 self.logger.info("System DejaVu fonts loaded successfully")
             else:
                 # Fallback to local fonts
-                self.title_font = ImageFont.truetype(str(font_dir / 'DejaVuSans-Bold.ttf'), self.title_size)
-                self.verse_font = ImageFont.truetype(str(font_dir / 'DejaVuSans.ttf'), self.verse_size)
-                self.reference_font = ImageFont.truetype(str(font_dir / 'DejaVuSans-Bold.ttf'), self.reference_size)
+                self.title_font = font_cache.get(str(font_dir / 'DejaVuSans-Bold.ttf'), self.title_size)
+                self.verse_font = font_cache.get(str(font_dir / 'DejaVuSans.ttf'), self.verse_size)
+                self.reference_font = font_cache.get(str(font_dir / 'DejaVuSans-Bold.ttf'), self.reference_size)
                 self.logger.info("Local fonts loaded successfully")
         except Exception as e:
             self.logger.warning(f"Failed to load DejaVu fonts: {e}")
@@ -108,9 +127,9 @@ class ImageGenerator:
             try:
                 nimbus_path = '/usr/share/fonts/opentype/urw-base35/NimbusSans-Regular.otf'
                 nimbus_bold_path = '/usr/share/fonts/opentype/urw-base35/NimbusSans-Bold.otf'
-                self.title_font = ImageFont.truetype(nimbus_bold_path, self.title_size)
-                self.verse_font = ImageFont.truetype(nimbus_path, self.verse_size)
-                self.reference_font = ImageFont.truetype(nimbus_bold_path, self.reference_size)
+                self.title_font = font_cache.get(nimbus_bold_path, self.title_size)
+                self.verse_font = font_cache.get(nimbus_path, self.verse_size)
+                self.reference_font = font_cache.get(nimbus_bold_path, self.reference_size)
                 self.logger.info("NimbusSans fallback fonts loaded")
             except:
                 self.logger.error("All font loading failed - using minimal fallback")
@@ -128,7 +147,7 @@ class ImageGenerator:
                 font_name = font_file.stem
                 try:
                     # Test loading the font
-                    test_font = ImageFont.truetype(str(font_file), 24)
+                    test_font = font_cache.get(str(font_file), 24)
                     self.available_fonts[font_name] = str(font_file)
                     self.logger.debug(f"Found font: {font_name}")
                 except Exception as e:
@@ -266,18 +285,41 @@ class ImageGenerator:
                     self.logger.warning(f"Failed to load separate border {border_file}: {e}")
     
     def _create_enhanced_layered_background(self) -> Image.Image:
-        """Create a properly layered background + border image."""
+        """Get the layered background + border image (shared from the layer cache; copy before drawing)."""
         if not self.enhanced_layering_enabled:
             return self._get_background(self.current_background_index)
         
+        bg_path = None
+        if self.separate_background_index < len(self.separate_backgrounds):
+            bg_path = self.separate_backgrounds[self.separate_background_index]
+        border_path = None
+        if self.separate_border_index < len(self.separate_borders):
+            border_path = self.separate_borders[self.separate_border_index]
+        
+        key = (self.separate_background_index, self.separate_border_index,
+               self.width, self.height, self.display_scale)
+        sources = (bg_path, border_path)
+        with tracer.span('render.background') as span:
+            image = layer_cache.get(key, sources)
+            span.set(cached=image is not None)
+            if image is not None:
+                return image
+            
+            image, complete = self._compose_layered_background(bg_path, border_path)
+            # Don't cache a layer that lost a part to a load error, so the next frame retries it
+            if complete:
+                layer_cache.put(key, image, sources)
+            return image
+    
+    def _compose_layered_background(self, bg_path: Optional[Path], border_path: Optional[Path]) -> Tuple[Image.Image, bool]:
+        """Composite background and border at the current size; returns (image, all layers applied)."""
+        complete = True
+        
         # Start with pure white base
         image = Image.new('L', (self.width, self.height), 255)
         
         # Layer 1: Background (if not pure white)
-        if (self.separate_background_index < len(self.separate_backgrounds) and 
-            self.separate_backgrounds[self.separate_background_index] is not None):
-            
-            bg_path = self.separate_backgrounds[self.separate_background_index]
+        if bg_path is not None:
             try:
                 bg_img = Image.open(bg_path)
                 bg_img = bg_img.resize((self.width, self.height), Image.Resampling.LANCZOS)
@@ -286,12 +328,10 @@ class ImageGenerator:
                 self.logger.debug(f"Applied background: {bg_path.name}")
             except Exception as e:
                 self.logger.warning(f"Failed to apply background {bg_path}: {e}")
+                complete = False
         
         # Layer 2: Border (if selected)
-        if (self.separate_border_index < len(self.separate_borders) and 
-            self.separate_borders[self.separate_border_index] is not None):
-            
-            border_path = self.separate_borders[self.separate_border_index]
+        if border_path is not None:
             try:
                 border_img = Image.open(border_path)
                 border_img = border_img.resize((self.width, self.height), Image.Resampling.LANCZOS)
@@ -318,8 +358,9 @@ class ImageGenerator:
                 
             except Exception as e:
                 self.logger.warning(f"Failed to apply border {border_path}: {e}")
+                complete = False
         
-        return image
+        return image, complete
     
     def _create_default_background(self) -> Image.Image:
         """Create a simple default background."""
@@ -374,11 +415,109 @@ class ImageGenerator:
         self.background_cache[index] = background
         return background.copy()
     
-    def create_verse_image(self, verse_data: Dict) -> Image.Image:
-        """Create an image for a Bible verse."""
-        # Track background changes for display refresh optimization
+    def create_verse_image(self, verse_data: Dict, at: Optional[datetime] = None) -> Image.Image:
+        """Create an image for a Bible verse; pass 'at' to pre-render a frame for a future time."""
+        # Track background changes for display refresh optimization (pre-rendered frames are marked when shown)
+        if at is None:
+            self.last_background_index = self.current_background_index
+        
+        # Pin the clock for the whole render so the frame and its cache key agree on the time
+        self._render_clock.at = at or datetime.now()
+        start = time.perf_counter()
+        rendered = False
+        try:
+            with tracer.span('render.frame', prerender=at is not None) as span:
+                content = self._get_frame_content_key(verse_data)
+                if content is not None:
+                    pages = self._frame_pages.get(content[0])
+                    cached = frame_cache.get(self._get_frame_cache_key(verse_data, content, pages)) if pages else None
+                    span.set(cached=cached is not None)
+                    if cached is not None:
+                        image, pages = cached
+                        display_transform.defer(image)
+                        if pages > 1:
+                            verse_data['current_page'] = self._get_page_slot(verse_data, pages) + 1
+                            verse_data['total_pages'] = pages
+                        return image
+                
+                rendered = True
+                # The single quantisation to the panel's grey levels; the display and the cache reuse it
+                image = display_transform.defer(quantize_for_panel(self._render_verse_image(verse_data)))
+                
+                if content is not None:
+                    pages = verse_data.get('total_pages', 1)
+                    self._frame_pages[content[0]] = pages
+                    self._frame_pages.move_to_end(content[0])
+                    while len(self._frame_pages) > self.MAX_FRAME_PAGE_ENTRIES:
+                        self._frame_pages.popitem(last=False)
+                    frame_cache.put(self._get_frame_cache_key(verse_data, content, pages), image, pages)
+                return image
+        finally:
+            self._render_clock.at = None
+            if rendered:
+                render_seconds.observe(time.perf_counter() - start, mode=self._get_frame_mode(verse_data))
+    
+    MAX_FRAME_PAGE_ENTRIES = 256
+    # Keys the renderer writes back or that never reach the frame
+    _FRAME_IGNORED_KEYS = frozenset(('current_page', 'total_pages', 'timestamp', 'api_source', 'source_translation'))
+    
+    def _get_frame_content_key(self, verse_data: Dict) -> Optional[tuple]:
+        """(content hash, clock minute) of a cacheable frame, or None for frames drawn from live services."""
+        if not verse_data or any(verse_data.get(flag) for flag in ('is_weather_mode', 'is_news_mode', 'is_ai_response')):
+            return None
+        content = {key: value for key, value in verse_data.items() if key not in self._FRAME_IGNORED_KEYS}
+        digest = hashlib.sha1(json.dumps(content, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+        
+        # These layouts draw the current time/date, so their frames only repeat within the minute
+        draws_clock = (verse_data.get('is_summary') or verse_data.get('is_date_event')
+                       or verse_data.get('is_devotional') or 'devotional_text' in verse_data
+                       or (verse_data.get('display_mode') == 'random' and verse_data.get('current_time')))
+        return digest, self._now().strftime('%Y-%m-%d %H:%M') if draws_clock else None
+    
+    def _get_frame_cache_key(self, verse_data: Dict, content: tuple, pages: int) -> tuple:
+        page = self._get_page_slot(verse_data, pages) if pages > 1 else 0
+        return content + (page,) + self.get_render_signature()
+    
+    def _get_page_slot(self, verse_data: Dict, page_count: int) -> int:
+        """Zero-based page shown at the render time: devotionals and date events turn every 10s, summaries every 15s."""
+        now = self._now()
+        minutes_since_midnight = now.hour * 60 + now.minute
+        if verse_data.get('is_devotional'):
+            # Each devotional starts on page 1 at the beginning of its rotation interval
+            rotation_minutes = verse_data.get('rotation_minutes', 5)
+            minutes_into_rotation = minutes_since_midnight % rotation_minutes
+            return ((minutes_into_rotation * 60 + now.second) // 10) % page_count
+        page_rotation_seconds = 10 if verse_data.get('is_date_event') else 15
+        return ((minutes_since_midnight * 60 + now.second) // page_rotation_seconds) % page_count
+    
+    @staticmethod
+    def _get_frame_mode(verse_data: Dict) -> str:
+        """Short label for the kind of frame verse_data renders as (used for metrics)."""
+        for flag, mode in (('is_ai_response', 'ai'), ('is_weather_mode', 'weather'), ('is_news_mode', 'news'),
+                           ('is_devotional', 'devotional'), ('is_date_event', 'date'), ('is_summary', 'summary'),
+                           ('parallel_mode', 'parallel')):
+            if verse_data.get(flag):
+                return mode
+        return 'verse'
+    
+    def _now(self) -> datetime:
+        """Current time, or the target time while pre-rendering a frame."""
+        return getattr(self._render_clock, 'at', None) or datetime.now()
+    
+    def get_render_signature(self) -> tuple:
+        """Settings that change a rendered frame (used to validate pre-rendered frames)."""
+        return (self.current_background_index, self.enhanced_layering_enabled,
+                self.separate_background_index, self.separate_border_index,
+                self.current_font_name, self.title_size, self.verse_size, self.reference_size,
+                self.reference_position, self.reference_x_offset, self.reference_y_offset, self.reference_margin,
+                self.width, self.height, os.getenv('DISPLAY_MIRROR', 'false').lower())
+    
+    def mark_background_displayed(self):
+        """Record that a pre-rendered frame with the current background has been shown."""
         self.last_background_index = self.current_background_index
-        
+    
+    def _render_verse_image(self, verse_data: Dict) -> Image.Image:
+        """Render the verse frame for the current (or pre-render) time."""
         # Get current background using enhanced layering or legacy system
         try:
             if self.enhanced_layering_enabled:
@@ -389,14 +528,14 @@ class ImageGenerator:
             self.logger.error(f"Error loading background: {e}")
             background = self._create_default_background()
         
-        # Create a completely fresh copy to avoid artifacts from previous renders
-        background = background.copy()
-        
-        # Additional safety: ensure we have a clean canvas by creating a new image
-        # This prevents any potential memory artifacts from lingering
-        clean_background = Image.new('L', (self.width, self.height), 255)
-        clean_background.paste(background, (0, 0))
-        background = clean_background
+        # Draw on a single private working buffer: plain backgrounds already come back as copies,
+        # the shared layered background is copied once, and only mismatched canvases are rebuilt
+        if self.enhanced_layering_enabled:
+            background = background.copy()
+        if background.mode != 'L' or background.size != (self.width, self.height):
+            clean_background = Image.new('L', (self.width, self.height), 255)
+            clean_background.paste(background.convert('L'), (0, 0))
+            background = clean_background
         
         draw = ImageDraw.Draw(background)
         
@@ -418,28 +557,10 @@ class ImageGenerator:
             self._draw_ai_response(draw, verse_data, margin, content_width)
         elif is_weather_mode:
             # Weather mode - generate weather display
-            weather_image = self._draw_weather_display(verse_data)
-            
-            # Apply mirroring transformation (same as other display modes)
-            mirror_setting = os.getenv('DISPLAY_MIRROR', 'false').lower()
-            if mirror_setting == 'true':
-                # Apply both horizontal and vertical flip for this display
-                weather_image = weather_image.transpose(Image.FLIP_LEFT_RIGHT)
-                weather_image = weather_image.transpose(Image.FLIP_TOP_BOTTOM)
-            
-            return weather_image
+            return self._draw_weather_display(verse_data)
         elif is_news_mode:
             # News mode - generate news display
-            news_image = self._draw_news_display(verse_data)
-            
-            # Apply mirroring transformation (same as other display modes)
-            mirror_setting = os.getenv('DISPLAY_MIRROR', 'false').lower()
-            if mirror_setting == 'true':
-                # Apply both horizontal and vertical flip for this display
-                news_image = news_image.transpose(Image.FLIP_LEFT_RIGHT)
-                news_image = news_image.transpose(Image.FLIP_TOP_BOTTOM)
-            
-            return news_image
+            return self._draw_news_display(verse_data)
         elif is_devotional:
             # Devotional mode with rotation info
             self._draw_devotional(draw, verse_data, margin, content_width)
@@ -458,13 +579,7 @@ class ImageGenerator:
             # Regular single verse mode
             self._draw_verse(draw, verse_data, margin, content_width)
         
-        # Apply mirroring directly here if needed
-        mirror_setting = os.getenv('DISPLAY_MIRROR', 'false').lower()
-        if mirror_setting == 'true':
-            # Apply both horizontal and vertical flip for this display
-            background = background.transpose(Image.FLIP_LEFT_RIGHT)
-            background = background.transpose(Image.FLIP_TOP_BOTTOM)
-        
+        # Mirroring (DISPLAY_MIRROR) is left pending on the frame and fused into each output's transform
         return background
     
     def _draw_ai_response(self, draw: ImageDraw.Draw, verse_data: Dict, margin: int, content_width: int):
@@ -492,7 +607,7 @@ class ImageGenerator:
                     test_height = self.height - 100  # 50px margin top/bottom
                     
                     # Wrap text and check if it fits
-                    wrapped_lines = self._wrap_text(response_text, font, test_width)
+                    wrapped_lines = self._wrap_text(response_text, test_width, font)
                     wrapped_text = '\n'.join(wrapped_lines)
                     
                     # Check text dimensions
@@ -514,7 +629,7 @@ class ImageGenerator:
         # Wrap text for the chosen font
         display_margin = 50
         display_width = self.width - (2 * display_margin)
-        wrapped_lines = self._wrap_text(response_text, font, display_width)
+        wrapped_lines = self._wrap_text(response_text, display_width, font)
         display_text = '\n'.join(wrapped_lines)
         
         # Calculate text positioning for center alignment
@@ -609,18 +724,8 @@ class ImageGenerator:
             self._draw_book_summary_single_page(draw, verse_data, margin, content_width)
             return
         
-        # Calculate current page based on time rotation, favoring page 1 start
-        # Use 15-second rotation interval for pages
-        from datetime import datetime
-        now = datetime.now()
-        page_rotation_seconds = 15  # Change page every 15 seconds
-        
-        # Use a more predictable rotation that starts closer to page 1
-        # by using minute-based intervals instead of seconds-since-midnight
-        minutes_since_midnight = now.hour * 60 + now.minute
-        seconds_in_minute = now.second
-        time_slot = (minutes_since_midnight * 60 + seconds_in_minute) // page_rotation_seconds
-        page_slot = time_slot % len(pages)
+        # Calculate current page based on time rotation (15-second pages)
+        page_slot = self._get_page_slot(verse_data, len(pages))
         current_page = page_slot + 1  # Pages are 1-indexed
         
         # Update verse_data with page information
@@ -658,8 +763,7 @@ class ImageGenerator:
             header_y = base_margin + self.reference_y_offset
             
             # Get the current time for left side
-            from datetime import datetime
-            now = datetime.now()
+            now = self._now()
             current_time = self._format_time_with_preference(now, verse_data.get('time_format', '12'))
             
             # Use larger fonts for better visibility in book summary
@@ -774,8 +878,8 @@ class ImageGenerator:
         line_height = test_font.size + 25 if test_font else 30  # Match book summary line spacing
         max_lines_per_page = max(3, available_height // line_height)  # Minimum 3 lines per page
         
-        # Wrap text and split into pages
-        wrapped_lines = self._wrap_text(text, content_width, test_font)
+        # Wrap text and split into pages (cached word widths)
+        wrapped_lines = text_layout.wrap(text, test_font, content_width)
         
         # If text fits on one page, return single page
         if len(wrapped_lines) <= max_lines_per_page:
@@ -811,8 +915,7 @@ class ImageGenerator:
             header_y = base_margin + self.reference_y_offset
             
             # Get the current time for left side
-            from datetime import datetime
-            now = datetime.now()
+            now = self._now()
             current_time = self._format_time_with_preference(now, verse_data.get('time_format', '12'))
             
             # Use larger fonts for better visibility in book summary
@@ -906,52 +1009,33 @@ class ImageGenerator:
                 draw.text((line_x, y_position), line, fill=0, font=page_font)
                 y_position += page_font.size + 25  # Match book summary line spacing
     
+    def _get_fit_font_path(self) -> str:
+        """Font file used when fitting verse text to the display."""
+        system_dejavu_path = Path('/usr/share/fonts/truetype/dejavu')
+        if system_dejavu_path.exists():
+            return str(system_dejavu_path / 'DejaVuSans.ttf')
+        if self.current_font_name != 'default' and self.available_fonts.get(self.current_font_name):
+            return self.available_fonts[self.current_font_name]
+        return str(Path('data/fonts/DejaVuSans.ttf'))
+    
     def _get_optimal_font_size(self, text: str, content_width: int, margin: int) -> ImageFont.ImageFont:
         """Get optimal font size that fits the text within the display bounds."""
         max_font_size = self.verse_size
         min_font_size = 24
         available_height = self.height - (2 * margin) - 120  # Reserve space for bottom-right reference
+        font_path = self._get_fit_font_path()
         
-        # Start with desired size and scale down if needed
-        for font_size in range(max_font_size, min_font_size - 1, -2):
-            try:
-                # Use system DejaVu fonts
-                system_dejavu_path = Path('/usr/share/fonts/truetype/dejavu')
-                if system_dejavu_path.exists():
-                    test_font = ImageFont.truetype(str(system_dejavu_path / 'DejaVuSans.ttf'), font_size)
-                elif self.current_font_name != 'default' and self.available_fonts[self.current_font_name]:
-                    test_font = ImageFont.truetype(self.available_fonts[self.current_font_name], font_size)
-                else:
-                    test_font = ImageFont.truetype(str(Path('data/fonts/DejaVuSans.ttf')), font_size)
-                
-                # Test if text fits
-                wrapped_text = self._wrap_text(text, content_width, test_font)
-                total_height = len(wrapped_text) * (font_size + 20)
-                
-                if total_height <= available_height:
-                    return test_font
-                    
-            except Exception:
-                # Fallback to default font
-                try:
-                    test_font = ImageFont.load_default()
-                    wrapped_text = self._wrap_text(text, content_width, test_font)
-                    return test_font
-                except:
-                    continue
+        def fits(font_size):
+            test_font = font_cache.get(font_path, font_size)
+            return text_layout.count_lines(text, test_font, content_width) * (font_size + 20) <= available_height
         
-        # If all else fails, use minimum size
+        # Binary-search the largest size that fits; if none does, use the minimum size
         try:
-            # Use system DejaVu fonts for fallback
-            system_dejavu_path = Path('/usr/share/fonts/truetype/dejavu')
-            if system_dejavu_path.exists():
-                return ImageFont.truetype(str(system_dejavu_path / 'DejaVuSans.ttf'), min_font_size)
-            elif self.current_font_name != 'default' and self.available_fonts[self.current_font_name]:
-                return ImageFont.truetype(self.available_fonts[self.current_font_name], min_font_size)
-            else:
-                return ImageFont.truetype(str(Path('data/fonts/DejaVuSans.ttf')), min_font_size)
-        except:
-            return ImageFont.load_default()
+            font_size = text_layout.fit_font_size(range(max_font_size, min_font_size - 1, -2), fits)
+            return font_cache.get(font_path, font_size or min_font_size)
+        except Exception as e:
+            self.logger.warning(f"Font fitting failed, using default font: {e}")
+            return font_cache.default()
 
     def _get_optimal_font_size_parallel(self, primary_text: str, secondary_text: str, column_width: int, margin: int) -> ImageFont.ImageFont:
         """Get optimal font size for parallel translations."""
@@ -964,76 +1048,26 @@ class ImageGenerator:
         label_height = 40   # Estimate for translation label height
         spacing_margin = 100  # Extra margin for proper spacing
         available_height = self.height - (2 * margin) - ref_height - label_height - spacing_margin
+        font_path = self._get_fit_font_path()
         
-        # Test both texts and find size that fits both comfortably
-        for font_size in range(max_font_size, min_font_size - 1, -2):
-            try:
-                # Use system DejaVu fonts
-                system_dejavu_path = Path('/usr/share/fonts/truetype/dejavu')
-                if system_dejavu_path.exists():
-                    test_font = ImageFont.truetype(str(system_dejavu_path / 'DejaVuSans.ttf'), font_size)
-                elif self.current_font_name != 'default' and self.available_fonts[self.current_font_name]:
-                    test_font = ImageFont.truetype(self.available_fonts[self.current_font_name], font_size)
-                else:
-                    test_font = ImageFont.truetype(str(Path('data/fonts/DejaVuSans.ttf')), font_size)
-                
-                # Test both texts with more conservative line spacing
-                wrapped_primary = self._wrap_text(primary_text, column_width, test_font)
-                wrapped_secondary = self._wrap_text(secondary_text, column_width, test_font)
-                
-                max_lines = max(len(wrapped_primary), len(wrapped_secondary))
-                total_height = max_lines * (font_size + 18)  # Slightly more line spacing for parallel mode
-                
-                # Be more conservative - only use this size if it fits comfortably
-                if total_height <= available_height * 0.9:  # Use only 90% of available space for safety
-                    return test_font
-                    
-            except Exception:
-                continue
+        def fits(font_size):
+            test_font = font_cache.get(font_path, font_size)
+            max_lines = max(text_layout.count_lines(primary_text, test_font, column_width),
+                            text_layout.count_lines(secondary_text, test_font, column_width))
+            # Slightly more line spacing for parallel mode; only use 90% of available space for safety
+            return max_lines * (font_size + 18) <= available_height * 0.9
         
-        # Fallback
+        # Both texts must fit at the same size
         try:
-            # Use system DejaVu fonts for fallback
-            system_dejavu_path = Path('/usr/share/fonts/truetype/dejavu')
-            if system_dejavu_path.exists():
-                return ImageFont.truetype(str(system_dejavu_path / 'DejaVuSans.ttf'), min_font_size)
-            elif self.current_font_name != 'default' and self.available_fonts[self.current_font_name]:
-                return ImageFont.truetype(self.available_fonts[self.current_font_name], min_font_size)
-            else:
-                return ImageFont.truetype(str(Path('data/fonts/DejaVuSans.ttf')), min_font_size)
-        except:
-            return ImageFont.load_default()
+            font_size = text_layout.fit_font_size(range(max_font_size, min_font_size - 1, -2), fits)
+            return font_cache.get(font_path, font_size or min_font_size)
+        except Exception as e:
+            self.logger.warning(f"Parallel font fitting failed, using default font: {e}")
+            return font_cache.default()
 
     def _wrap_text(self, text: str, max_width: int, font: Optional[ImageFont.ImageFont]) -> list:
-        """Wrap text to fit within specified width."""
-        if not font:
-            # Simple character-based wrapping if no font available
-            chars_per_line = max_width // 10  # Rough estimate
-            return textwrap.wrap(text, width=chars_per_line)
-        
-        words = text.split()
-        lines = []
-        current_line = []
-        
-        for word in words:
-            test_line = ' '.join(current_line + [word])
-            bbox = font.getbbox(test_line)
-            line_width = bbox[2] - bbox[0]
-            
-            if line_width <= max_width:
-                current_line.append(word)
-            else:
-                if current_line:
-                    lines.append(' '.join(current_line))
-                    current_line = [word]
-                else:
-                    # Word is too long, break it
-                    lines.append(word)
-        
-        if current_line:
-            lines.append(' '.join(current_line))
-        
-        return lines
+        """Wrap text to fit within specified width (shared cached layout)."""
+        return text_layout.wrap(text, font, max_width)
     
     def _add_decorative_elements(self, draw: ImageDraw.Draw, y_position: int):
         """Add decorative elements to the image."""
@@ -1118,9 +1152,9 @@ class ImageGenerator:
         try:
             if self.current_font_name != 'default' and self.current_font_name in self.available_fonts and self.available_fonts[self.current_font_name]:
                 font_path = self.available_fonts[self.current_font_name]
-                self.title_font = ImageFont.truetype(font_path, self.title_size)
-                self.verse_font = ImageFont.truetype(font_path, self.verse_size)
-                self.reference_font = ImageFont.truetype(font_path, self.reference_size)
+                self.title_font = font_cache.get(font_path, self.title_size)
+                self.verse_font = font_cache.get(font_path, self.verse_size)
+                self.reference_font = font_cache.get(font_path, self.reference_size)
                 self.logger.info(f"Loaded font: {self.current_font_name}")
             else:
                 # Use default font loading
@@ -1352,7 +1386,10 @@ class ImageGenerator:
                     'current': name == self.current_font_name
                 }
                 for name, path in self.available_fonts.items()
-            ]
+            ],
+            'font_cache': font_cache.get_stats(),
+            'layer_cache': layer_cache.get_stats(),
+            'frame_cache': frame_cache.get_stats()
         }
     
     def _draw_date_event(self, draw: ImageDraw.Draw, verse_data: Dict, margin: int, content_width: int):
@@ -1369,17 +1406,8 @@ class ImageGenerator:
             self._draw_date_event_single_page(draw, verse_data, margin, content_width)
             return
         
-        # Multiple pages - use pagination with 10-second cycling, favoring page 1 start
-        from datetime import datetime
-        now = datetime.now()
-        page_rotation_seconds = 10  # Same as devotional mode
-        
-        # Use a more predictable rotation that starts closer to page 1
-        # by using minute-based intervals instead of seconds-since-midnight
-        minutes_since_midnight = now.hour * 60 + now.minute
-        seconds_in_minute = now.second
-        time_slot = (minutes_since_midnight * 60 + seconds_in_minute) // page_rotation_seconds
-        page_slot = time_slot % len(pages)
+        # Multiple pages - use pagination with 10-second cycling
+        page_slot = self._get_page_slot(verse_data, len(pages))
         current_page = page_slot + 1
         
         # Update verse_data with page information
@@ -1405,25 +1433,9 @@ class ImageGenerator:
             self._draw_devotional_single_page(draw, verse_data, margin, content_width)
             return
         
-        # Calculate current page based on coordinated timing with devotional rotation
-        from datetime import datetime
-        
-        now = datetime.now()
-        page_rotation_seconds = 10  # Change page every 10 seconds
-        
-        # Get devotional rotation info to coordinate page timing
-        rotation_minutes = verse_data.get('rotation_minutes', 5)  # Default 5 minutes if not provided
-        rotation_slot = verse_data.get('rotation_slot', 0)  # Current devotional rotation slot
-        
-        # Calculate time within the current devotional rotation interval
-        minutes_since_midnight = now.hour * 60 + now.minute
-        current_rotation_start = (minutes_since_midnight // rotation_minutes) * rotation_minutes
-        minutes_into_rotation = minutes_since_midnight - current_rotation_start
-        seconds_into_rotation = (minutes_into_rotation * 60) + now.second
-        
         # Calculate page based on time within the current rotation interval
         # This ensures each new devotional starts on page 1
-        page_slot = (seconds_into_rotation // page_rotation_seconds) % len(pages)
+        page_slot = self._get_page_slot(verse_data, len(pages))
         current_page = page_slot + 1  # Pages are 1-indexed
         
         # Update verse_data with page information
@@ -1457,8 +1469,7 @@ class ImageGenerator:
         reference_bottom = ref_y + ref_height + min_gap
         
         # Draw current time instead of devotional title for devotional mode
-        from datetime import datetime
-        now = datetime.now()
+        now = self._now()
         current_time = self._format_time_with_preference(now, verse_data.get('time_format', '12'))
         current_date = now.strftime('%A, %B %d, %Y')
         time_display = f"{current_time} - {current_date}"
@@ -1532,8 +1543,8 @@ class ImageGenerator:
         line_height = test_font.size + 20 if test_font else 30
         max_lines_per_page = max(3, available_height // line_height)  # Minimum 3 lines per page
         
-        # Wrap text and split into pages
-        wrapped_lines = self._wrap_text(text, content_width, test_font)
+        # Wrap text and split into pages (cached word widths)
+        wrapped_lines = text_layout.wrap(text, test_font, content_width)
         
         # If text fits on one page, return single page
         if len(wrapped_lines) <= max_lines_per_page:
@@ -1557,8 +1568,7 @@ class ImageGenerator:
         
         # Date match type with specific historical context
         match_type = verse_data.get('date_match', 'exact')
-        from datetime import datetime
-        now = datetime.now()
+        now = self._now()
         
         # Calculate specific years based on biblical timeframes
         event_name = verse_data.get('event_name', '')
@@ -1693,8 +1703,7 @@ class ImageGenerator:
         
         # Draw date match type with specific historical context
         match_type = verse_data.get('date_match', 'exact')
-        from datetime import datetime
-        now = datetime.now()
+        now = self._now()
         
         # Calculate specific years based on biblical timeframes
         # Most biblical events range from ~4000 BC (Creation) to ~95 AD (Revelation)
@@ -1791,8 +1800,7 @@ class ImageGenerator:
             total_height += (event_bbox[3] - event_bbox[1]) + 20  # actual text height + spacing
         
         # Historical context height - measure actual text
-        from datetime import datetime
-        now = datetime.now()
+        now = self._now()
         event_name_lower = event_name.lower()
         
         # Calculate years using same logic as main method
@@ -1922,8 +1930,7 @@ class ImageGenerator:
         reference_bottom = ref_y + ref_height + min_gap
         
         # Draw current time instead of devotional title for devotional mode
-        from datetime import datetime
-        now = datetime.now()
+        now = self._now()
         current_time = self._format_time_with_preference(now, verse_data.get('time_format', '12'))
         current_date = now.strftime('%A, %B %d, %Y')
         time_display = f"{current_time} - {current_date}"
@@ -2096,9 +2103,9 @@ class ImageGenerator:
         try:
             system_dejavu_path = Path('/usr/share/fonts/truetype/dejavu')
             if system_dejavu_path.exists():
-                label_font = ImageFont.truetype(str(system_dejavu_path / 'DejaVuSans.ttf'), label_font_size)
+                label_font = font_cache.get(str(system_dejavu_path / 'DejaVuSans.ttf'), label_font_size)
             else:
-                label_font = ImageFont.truetype(str(Path('data/fonts/DejaVuSans.ttf')), label_font_size)
+                label_font = font_cache.get(str(Path('data/fonts/DejaVuSans.ttf')), label_font_size)
         except:
             label_font = optimal_font  # Fallback to verse font
         
@@ -2149,13 +2156,13 @@ class ImageGenerator:
         # Check if this is devotional mode
         if verse_data.get('is_devotional') or 'devotional_text' in verse_data:
             # For devotional mode, always use current time to ensure minute-by-minute updates
-            now = datetime.now()
+            now = self._now()
             current_time = self._format_time_with_preference(now, verse_data.get('time_format', '12'))
             current_date = now.strftime('%A, %B %d, %Y')  # Always use current date
             display_text = f"{current_time} - {current_date}"
         elif verse_data.get('is_date_event'):
             # Show both time and date for date-based mode
-            now = datetime.now()
+            now = self._now()
             current_time = verse_data.get('current_time', self._format_time_with_preference(now, verse_data.get('time_format', '12')))
             current_date = now.strftime('%B %d, %Y')
             display_text = f"{current_time} - {current_date}"
@@ -2164,7 +2171,7 @@ class ImageGenerator:
             if verse_data.get('display_mode') == 'random' and verse_data.get('current_time'):
                 # For random mode, show both current time and verse reference
                 verse_ref = verse_data.get('reference', 'Unknown')
-                current_time = self._format_time_with_preference(datetime.now(), verse_data.get('time_format', '12'))
+                current_time = self._format_time_with_preference(self._now(), verse_data.get('time_format', '12'))
                 display_text = f"{current_time} - {verse_ref}"
             else:
                 # For time mode, show verse reference only (which IS the time in Bible Clock concept)
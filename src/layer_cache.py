@@ -0,0 +1,160 @@
+"""
+Cache of composited background/border layers.
+
+Finished 'L' layers are kept in an LRU bounded by a memory budget and also
+written to disk as raw pixel files, so a restart skips the PNG decode,
+LANCZOS resize and border composite.
+"""
+
+import hashlib
+import logging
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional, Sequence
+
+from PIL import Image
+
+# Bump when the compositing recipe changes so stale disk layers are ignored
+LAYER_FORMAT_VERSION = 1
+
+
+class LayerCache:
+    """LRU of composited 'L' layers under a byte budget, backed by a raw-pixel disk tier."""
+
+    def __init__(self, max_bytes: int = 32 * 1024 * 1024, disk_dir: Optional[str] = None, max_disk_files: int = 64):
+        self.logger = logging.getLogger(__name__)
+        self.max_bytes = max_bytes
+        self.disk_dir = Path(disk_dir) if disk_dir else None
+        self.max_disk_files = max_disk_files
+        self._layers: "OrderedDict[tuple, Image.Image]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _image_bytes(image: Image.Image) -> int:
+        return image.width * image.height * len(image.getbands())
+
+    def _disk_path(self, key: tuple, sources: Sequence[Optional[Path]]) -> Optional[Path]:
+        """Disk file name for a layer; includes source mtimes so edited images invalidate it."""
+        if not self.disk_dir:
+            return None
+        parts = [str(LAYER_FORMAT_VERSION), repr(key)]
+        for source in sources:
+            if source is None:
+                parts.append('none')
+                continue
+            try:
+                stat = os.stat(source)
+                parts.append(f"{source}:{stat.st_mtime_ns}:{stat.st_size}")
+            except OSError:
+                parts.append(f"{source}:missing")
+        digest = hashlib.sha1('|'.join(parts).encode('utf-8')).hexdigest()[:20]
+        width, height = key[2], key[3]
+        return self.disk_dir / f"layer_{width}x{height}_{digest}.gray"
+
+    def get(self, key: tuple, sources: Sequence[Optional[Path]] = ()) -> Optional[Image.Image]:
+        """Cached layer for key (memory first, then disk), or None."""
+        with self._lock:
+            image = self._layers.get(key)
+            if image is not None:
+                self._layers.move_to_end(key)
+                self.hits += 1
+                return image
+
+        disk_path = self._disk_path(key, sources)
+        if disk_path and disk_path.exists():
+            try:
+                width, height = key[2], key[3]
+                with open(disk_path, 'rb') as f:
+                    data = f.read()
+                if len(data) == width * height:
+                    image = Image.frombytes('L', (width, height), data)
+                    self._remember(key, image)
+                    with self._lock:
+                        self.disk_hits += 1
+                    return image
+                self.logger.debug(f"Ignoring truncated layer file {disk_path.name}")
+            except Exception as e:
+                self.logger.debug(f"Failed to read cached layer {disk_path}: {e}")
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, key: tuple, image: Image.Image, sources: Sequence[Optional[Path]] = ()):
+        """Store a finished layer in memory and on disk."""
+        if image.mode != 'L':
+            image = image.convert('L')
+        self._remember(key, image)
+
+        disk_path = self._disk_path(key, sources)
+        if disk_path:
+            try:
+                disk_path.parent.mkdir(parents=True, exist_ok=True)
+                temp_path = disk_path.with_suffix('.tmp')
+                with open(temp_path, 'wb') as f:
+                    f.write(image.tobytes())
+                os.replace(temp_path, disk_path)
+                self._prune_disk()
+            except Exception as e:
+                self.logger.debug(f"Failed to persist layer {disk_path}: {e}")
+
+    def _remember(self, key: tuple, image: Image.Image):
+        size = self._image_bytes(image)
+        with self._lock:
+            previous = self._layers.pop(key, None)
+            if previous is not None:
+                self._bytes -= self._image_bytes(previous)
+            if size > self.max_bytes:
+                return  # Larger than the whole budget: serve from disk only
+            self._layers[key] = image
+            self._bytes += size
+            while self._bytes > self.max_bytes and self._layers:
+                _, evicted = self._layers.popitem(last=False)
+                self._bytes -= self._image_bytes(evicted)
+
+    def _prune_disk(self):
+        """Keep only the most recently written layer files."""
+        files = sorted(self.disk_dir.glob('layer_*.gray'), key=lambda path: path.stat().st_mtime, reverse=True)
+        for stale in files[self.max_disk_files:]:
+            try:
+                stale.unlink()
+            except OSError:
+                pass
+
+    def clear(self, disk: bool = False):
+        """Drop cached layers (and the disk tier if requested)."""
+        with self._lock:
+            self._layers.clear()
+            self._bytes = 0
+        if disk and self.disk_dir and self.disk_dir.exists():
+            for path in self.disk_dir.glob('layer_*.gray'):
+                try:
+                    path.unlink()
+                except OSError:
+                    pass
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            return {
+                'layers': len(self._layers),
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'disk_enabled': self.disk_dir is not None
+            }
+
+
+# Global layer cache instance
+layer_cache = LayerCache(
+    max_bytes=int(float(os.getenv('LAYER_CACHE_MAX_MB', '32')) * 1024 * 1024),
+    disk_dir=os.getenv('LAYER_CACHE_DIR', 'data/layer_cache') if os.getenv('LAYER_CACHE_DISK_ENABLED', 'true').lower() == 'true' else None,
+    max_disk_files=int(os.getenv('LAYER_CACHE_MAX_FILES', '64'))
+)
@@ -4,7 +4,7 @@ Features modern typography, visual hierarchy, and e-ink optimized design.
 """
 
 import logging
-from PIL import Image, ImageDraw, ImageFont, ImageFilter
+from PIL import Image, ImageDraw, ImageFilter
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple
 import os
@@ -15,6 +15,7 @@ except ImportError:
     # Fallback for older Python versions
     ZoneInfo = None
 from weather_service import weather_service
+from font_cache import font_cache
 
 
 class ModernWeatherDisplay:
@@ -140,19 +141,19 @@ class ModernWeatherDisplay:
                 self.fonts = {}
                 for name, size in self.font_sizes.items():
                     try:
-                        self.fonts[name] = ImageFont.truetype(base_font_path, size)
+                        self.fonts[name] = font_cache.get(base_font_path, size)
                     except Exception:
-                        self.fonts[name] = ImageFont.load_default()
+                        self.fonts[name] = font_cache.default()
                 
                 self.logger.info(f"Modern fonts loaded: {base_font_path}")
             else:
                 # Fallback to default fonts
-                self.fonts = {name: ImageFont.load_default() for name in self.font_sizes.keys()}
+                self.fonts = {name: font_cache.default() for name in self.font_sizes.keys()}
                 self.logger.warning("Using default fonts - text may not render optimally")
                 
         except Exception as e:
             self.logger.error(f"Font loading error: {e}")
-            self.fonts = {name: ImageFont.load_default() for name in self.font_sizes.keys()}
+            self.fonts = {name: font_cache.default() for name in self.font_sizes.keys()}
     
     def generate_modern_weather_display(self) -> Optional[Image.Image]:
         """Generate a modern, card-based weather display."""
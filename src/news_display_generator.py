@@ -4,11 +4,12 @@ Shows cycling Israel news with professional layout and large readable fonts.
 """
 
 from PIL import Image, ImageDraw, ImageFont
-import textwrap
 import logging
 from typing import Dict, Optional
 from datetime import datetime
 from news_service import news_service
+from font_cache import font_cache
+from text_layout import text_layout
 
 
 class NewsDisplayGenerator:
@@ -58,16 +59,16 @@ class NewsDisplayGenerator:
         try:
             # Use the regular DejaVu Sans font for better e-ink rendering
             # Bold fonts can appear fuzzy on e-ink displays
-            return ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", size)
+            return font_cache.get("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", size)
         except:
             try:
                 # Try system font alternatives
-                return ImageFont.truetype("/usr/share/fonts/truetype/liberation/LiberationSans-Regular.ttf", size)
+                return font_cache.get("/usr/share/fonts/truetype/liberation/LiberationSans-Regular.ttf", size)
             except:
                 try:
-                    return ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", size)
+                    return font_cache.get("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", size)
                 except:
-                    return ImageFont.load_default()
+                    return font_cache.default()
     
     def generate_news_display(self) -> Image.Image:
         """Generate the main news display with memory management."""
@@ -319,15 +320,8 @@ class NewsDisplayGenerator:
         color = self.colors['black']
         line_spacing = 25
         
-        # Use the same optimized character width calculation as body text
-        sample_text = "The quick brown fox jumps over lazy dogs with 1234567890"
-        test_bbox = draw.textbbox((0, 0), sample_text, font=font)
-        char_width = (test_bbox[2] - test_bbox[0]) / len(sample_text)
-        chars_per_line = int(width / char_width * 0.96)  # 96% - aggressive fitting
-        
-        # Use optimized text wrapping for maximum words per line
-        wrapped_lines = textwrap.wrap(title, width=chars_per_line, break_long_words=False, 
-                                     break_on_hyphens=False, expand_tabs=False)
+        # Wrap on measured word widths, same as body text
+        wrapped_lines = text_layout.wrap(title, font, width)
         
         current_y = y
         for line in wrapped_lines:
@@ -347,20 +341,12 @@ class NewsDisplayGenerator:
     
     def _draw_wrapped_text(self, draw: ImageDraw.Draw, text: str, x: int, y: int, width: int,
                           font: ImageFont.FreeTypeFont, color: int, line_spacing: int = 10) -> int:
-        """Draw text with word wrapping and better character estimation for sharp rendering."""
+        """Draw centered text with word wrapping using the shared text layout."""
         if not text.strip():
             return y
         
-        # Optimized character width calculation to fit maximum words per line
-        # Use a more representative sample for accurate width calculation
-        sample_text = "The quick brown fox jumps over lazy dogs with 1234567890"
-        test_bbox = draw.textbbox((0, 0), sample_text, font=font)
-        char_width = (test_bbox[2] - test_bbox[0]) / len(sample_text)
-        chars_per_line = int(width / char_width * 0.96)  # 96% - more aggressive to fit more words
-        
-        # Use optimized text wrapping to maximize words per line
-        wrapped_lines = textwrap.wrap(text, width=chars_per_line, break_long_words=False, 
-                                     break_on_hyphens=False, expand_tabs=False)
+        # Wrap on measured word widths to fit the maximum words per line
+        wrapped_lines = text_layout.wrap(text, font, width)
         
         current_y = y
         for line in wrapped_lines:
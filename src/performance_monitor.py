@@ -10,6 +10,7 @@ from datetime import datetime, timedelta
 from typing import Dict, List, Any
 from collections import deque
 import gc
+from tracing import tracer
 
 class PerformanceMonitor:
     """Monitor system performance and optimize resource usage."""
@@ -25,6 +26,7 @@ class PerformanceMonitor:
         
         # Timing metrics
         self.operation_times = {}
+        self.tracer = tracer  # Nested spans recorded by the render/display hot paths
         self.monitoring = False
         self.monitor_thread = None
     
@@ -106,6 +108,19 @@ class PerformanceMonitor:
         """Context manager for timing operations."""
         return OperationTimer(self, operation_name)
     
+    def get_traces(self, limit: int = 500, name: str = None) -> Dict[str, Any]:
+        """Recent tracing spans and per-span latency histograms."""
+        return {
+            'timestamp': datetime.now().isoformat(),
+            'tracer': self.tracer.get_stats(),
+            'histograms': self.tracer.get_histograms(),
+            'spans': self.tracer.get_spans(limit=limit, name=name)
+        }
+    
+    def export_chrome_trace(self) -> Dict[str, Any]:
+        """Buffered spans in Chrome trace-event format."""
+        return self.tracer.export_chrome_trace()
+    
     def record_operation_time(self, operation_name: str, duration: float):
         """Record operation timing."""
         if operation_name not in self.operation_times:
@@ -165,12 +180,18 @@ class OperationTimer:
         self.monitor = monitor
         self.operation_name = operation_name
         self.start_time = None
+        self.span = None
     
     def __enter__(self):
+        # Timed operations are also root spans, so hot-path spans nest under them
+        self.span = self.monitor.tracer.span(self.operation_name)
+        self.span.__enter__()
         self.start_time = time.time()
         return self
     
     def __exit__(self, exc_type, exc_val, exc_tb):
         if self.start_time:
             duration = time.time() - self.start_time
-            self.monitor.record_operation_time(self.operation_name, duration)
\ No newline at end of file
+            self.monitor.record_operation_time(self.operation_name, duration)
+        if self.span:
+            self.span.__exit__(exc_type, exc_val, exc_tb)
\ No newline at end of file
@@ -388,7 +388,7 @@ class PorcupineVoiceControl:
                 self.verse_manager.previous_verse()
                 response = "Showing previous verse."
             elif 'speak verse' in command_text or 'read verse' in command_text:
-                current_verse = self.verse_manager.get_current_verse()
+                current_verse = self.verse_manager.peek_verse()
                 if current_verse:
                     response = f"{current_verse.get('reference', '')}: {current_verse.get('text', '')}"
                 else:
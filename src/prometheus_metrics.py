@@ -0,0 +1,270 @@
+"""
+In-process Prometheus-style metrics for the /metrics endpoint.
+
+Counters, gauges and histograms are plain in-memory structures updated on the
+hot paths, so a scrape only formats what is already there (no psutil calls,
+no file scans).
+"""
+
+import gc
+import os
+import threading
+import time
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(f'{extra[0]}="{extra[1]}"')
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _format_value(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    type_name = ''
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 callback: Optional[Callable[[], Iterable[Tuple[Dict[str, str], float]]]] = None):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.callback = callback  # Read values at scrape time instead of storing them
+        self._values: Dict[tuple, object] = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> tuple:
+        return tuple(str(labels.get(name, '')) for name in self.labelnames)
+
+    def header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type_name}"]
+
+    def _items(self) -> List[tuple]:
+        if self.callback:
+            try:
+                return [(self._key(labels), value) for labels, value in self.callback()]
+            except Exception:
+                return []
+        with self._lock:
+            return list(self._values.items())
+
+    def render(self) -> List[str]:
+        return self.header() + [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+                                for key, value in self._items()]
+
+
+class Counter(_Metric):
+    """Monotonically increasing count per label set."""
+
+    type_name = 'counter'
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0)
+
+
+class Gauge(_Metric):
+    """Current value per label set."""
+
+    type_name = 'gauge'
+
+    def set(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+
+class Histogram(_Metric):
+    """Cumulative-bucket histogram per label set."""
+
+    type_name = 'histogram'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            entry[0][index] += 1
+            entry[1] += value
+            entry[2] += 1
+
+    def _snapshot(self) -> List[tuple]:
+        with self._lock:
+            return [(key, list(entry[0]), entry[1], entry[2]) for key, entry in self._values.items()]
+
+    def render(self) -> List[str]:
+        items = self._snapshot()
+        lines = self.header()
+        for key, counts, total, count in items:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += bucket_count
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, ('le', _format_value(bound)))} {cumulative}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+
+class GCPauseHistogram(Histogram):
+    """Histogram written only from gc.callbacks, without a lock.
+
+    A collection can start while any thread holds a metric lock (render() allocates under it), so a
+    callback that waited on that lock would deadlock. Collections never overlap and run with the GIL
+    held, so the callback can update the preallocated entries in place; a scrape may read a sample
+    whose bucket is counted but whose sum is not yet, which is harmless.
+    """
+
+    def __init__(self, name: str, documentation: str, buckets: Sequence[float] = DEFAULT_BUCKETS,
+                 generations: Sequence[int] = (0, 1, 2)):
+        super().__init__(name, documentation, ['generation'], buckets)
+        # Entries exist up front so the callback never resizes the dict while a scrape iterates it
+        for generation in generations:
+            self._values[(str(generation),)] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+
+    def observe(self, value: float, **labels):
+        entry = self._values.get(self._key(labels))
+        if entry is None:
+            return
+        entry[0][bisect_left(self.buckets, value)] += 1
+        entry[1] += value
+        entry[2] += 1
+
+    def _snapshot(self) -> List[tuple]:
+        return [(key, list(entry[0]), entry[1], entry[2]) for key, entry in list(self._values.items())]
+
+
+class MetricsRegistry:
+    """Holds all metrics and renders them in the Prometheus text exposition format."""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            return self._metrics.setdefault(metric.name, metric)
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = (), callback=None) -> Counter:
+        return self._register(Counter(name, documentation, labelnames, callback))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = (), callback=None) -> Gauge:
+        return self._register(Gauge(name, documentation, labelnames, callback))
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def gc_pause_histogram(self, name: str, documentation: str,
+                           buckets: Sequence[float] = DEFAULT_BUCKETS) -> GCPauseHistogram:
+        return self._register(GCPauseHistogram(name, documentation, buckets))
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+
+# === Process metrics read at scrape time ===
+
+_PAGE_SIZE = os.sysconf('SC_PAGE_SIZE') if hasattr(os, 'sysconf') else 4096
+_START_TIME = time.time()
+
+
+def _rss_bytes():
+    """Resident set size from /proc (no psutil), falling back to the peak from getrusage."""
+    try:
+        with open('/proc/self/statm', 'rb') as f:
+            yield {}, int(f.read().split()[1]) * _PAGE_SIZE
+    except (OSError, IndexError, ValueError):
+        import resource
+        yield {}, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def _cache_counters():
+    """Hit/miss counters of the shared render caches."""
+    from font_cache import font_cache
+    from frame_cache import frame_cache
+    from layer_cache import layer_cache
+    from text_layout import text_layout
+    font_stats = font_cache.get_stats()
+    layer_stats = layer_cache.get_stats()
+    layout_stats = text_layout.get_stats()
+    frame_stats = frame_cache.get_stats()
+    yield {'cache': 'font', 'result': 'hit'}, font_stats['hits']
+    yield {'cache': 'font', 'result': 'miss'}, font_stats['misses']
+    yield {'cache': 'layer', 'result': 'hit'}, layer_stats['hits'] + layer_stats['disk_hits']
+    yield {'cache': 'layer', 'result': 'miss'}, layer_stats['misses']
+    yield {'cache': 'wrap', 'result': 'hit'}, layout_stats['wrap_hits']
+    yield {'cache': 'wrap', 'result': 'miss'}, layout_stats['wrap_misses']
+    yield {'cache': 'frame', 'result': 'hit'}, frame_stats['hits'] + frame_stats['disk_hits']
+    yield {'cache': 'frame', 'result': 'miss'}, frame_stats['misses']
+
+
+class _GCPauseRecorder:
+    """gc.callbacks hook timing each collection into a histogram."""
+
+    def __init__(self, histogram: GCPauseHistogram):
+        self.histogram = histogram
+        self._start = 0.0
+
+    def __call__(self, phase: str, info: Dict):
+        # Collections run with the GIL held, so start/stop always pair up
+        if phase == 'start':
+            self._start = time.perf_counter()
+        elif phase == 'stop' and self._start:
+            self.histogram.observe(time.perf_counter() - self._start, generation=info.get('generation', ''))
+            self._start = 0.0
+
+
+# Global metrics registry and the metrics recorded by the app
+metrics = MetricsRegistry()
+
+render_seconds = metrics.histogram(
+    'bibleclock_render_seconds', 'Time to render a frame', ['mode'],
+    buckets=(0.05, 0.1, 0.25, 0.5, 1.0, 2.0, 4.0, 8.0, 15.0))
+fetch_seconds = metrics.histogram(
+    'bibleclock_source_fetch_seconds', 'Verse provider fetch latency', ['source', 'result'],
+    buckets=(0.05, 0.1, 0.25, 0.5, 1.0, 2.0, 5.0, 10.0, 20.0))
+translation_cache_lookups = metrics.counter(
+    'bibleclock_translation_cache_lookups_total', 'Local translation cache lookups', ['translation', 'result'])
+panel_refreshes = metrics.counter(
+    'bibleclock_panel_refreshes_total', 'E-ink panel refreshes', ['kind', 'waveform'])
+gc_pause_seconds = metrics.gc_pause_histogram(
+    'bibleclock_gc_pause_seconds', 'Garbage collection pause time',
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5))
+metrics.gauge('bibleclock_process_resident_memory_bytes', 'Resident set size', callback=_rss_bytes)
+metrics.gauge('bibleclock_process_start_time_seconds', 'Process start time since the epoch',
+              callback=lambda: [({}, _START_TIME)])
+metrics.counter('bibleclock_render_cache_lookups_total', 'Shared render cache lookups', ['cache', 'result'],
+                callback=_cache_counters)
+
+if os.getenv('METRICS_GC_PAUSES', 'true').lower() == 'true':
+    gc.callbacks.append(_GCPauseRecorder(gc_pause_seconds))
@@ -42,6 +42,13 @@ class ServiceManager:
         self.memory_threshold = int(os.getenv('MEMORY_THRESHOLD', '80'))
         self.gc_interval = int(os.getenv('GC_INTERVAL', '300'))
         
+        # Next-minute prefetch: resolve and render the upcoming frame ahead of the minute boundary
+        self.prefetch_enabled = os.getenv('VERSE_PREFETCH_ENABLED', 'true').lower() == 'true'
+        self.prefetch_second = int(os.getenv('VERSE_PREFETCH_SECOND', '40'))
+        self._prefetched_frame = None
+        self._prefetch_thread = None
+        self._prefetch_lock = threading.Lock()
+        
         # Initialize new components
         self.config_validator = ConfigValidator()
         # DISABLED: self.scheduler = AdvancedScheduler()  # Causes display conflicts
@@ -84,6 +91,10 @@ class ServiceManager:
         # Start performance monitoring
         self.performance_monitor.start_monitoring()
         
+        # Bulk-fill translation caches in the background (only the running clock does this)
+        if hasattr(self.verse_manager, 'start_translation_prefetcher'):
+            self.verse_manager.start_translation_prefetcher()
+        
         # DISABLED: Start advanced scheduler (causes display conflicts)
         # self.scheduler.start()
         
@@ -152,8 +163,16 @@ class ServiceManager:
         if self.web_interface:
             self._stop_web_interface()
         
-        # Track system shutdown
+        if hasattr(self.verse_manager, 'stop_translation_prefetcher'):
+            self.verse_manager.stop_translation_prefetcher()
+        
+        # Flush journaled translation cache entries
+        if hasattr(self.verse_manager, 'shutdown'):
+            self.verse_manager.shutdown()
+        
+        # Track system shutdown and write out pending metrics
         self.bible_metrics.track_hardware_event('system_stop')
+        self.bible_metrics.shutdown()
         
         self.logger.info("Bible Clock service stopped")
     
@@ -201,17 +220,27 @@ class ServiceManager:
             elif summary_pagination_update:
                 self.logger.info(f"Book summary pagination - triggering 15-second update (last update: {time_since_last_update:.1f}s ago)")
             with self.performance_monitor.time_operation('verse_update'):
-                # Get current verse
-                verse_data = self.verse_manager.get_current_verse()
+                # Use the frame pre-rendered before the minute boundary if it is still valid
+                prefetched = self._take_prefetched_frame(now)
+                
+                # Get current verse (statistics are recorded once the frame is pushed)
+                prepared = prefetched['prepared'] if prefetched else self.verse_manager.prepare_verse(now)
+                verse_data = prepared['verse_data']
                 
                 # Store verse data for next iteration's summary mode check
                 self._last_verse_data = verse_data
                 
                 # Generate image
-                image = self.image_generator.create_verse_image(verse_data)
+                if prefetched:
+                    image = prefetched['image']
+                    self.logger.debug(f"Using prefetched frame for {prefetched['target'].strftime('%H:%M')}")
+                else:
+                    image = self.image_generator.create_verse_image(verse_data)
                 
                 # Check if background changed and force refresh only for background changes
                 background_changed = self.image_generator.background_changed_since_last_render()
+                if prefetched:
+                    self.image_generator.mark_background_displayed()
                 if background_changed:
                     self.logger.info("Background changed - forcing full refresh")
                 
@@ -280,6 +309,7 @@ class ServiceManager:
                 # Use border-preserving refresh for date mode to reduce visual jarring
                 preserve_border = is_date_mode and force_refresh
                 self.display_manager.display_image(image, force_refresh=force_refresh, preserve_border=preserve_border, is_news_mode=is_news_mode)
+                self.verse_manager.commit_verse(prepared)
                 
                 # Update tracking
                 self.last_update = datetime.now()
@@ -297,6 +327,72 @@ class ServiceManager:
         else:
             self.logger.debug(f"Skipping verse update at {now.strftime('%H:%M:%S')} - not at minute boundary")
     
+    def _get_prefetch_key(self, target: datetime) -> tuple:
+        """Key identifying a prefetched frame: target minute plus the settings it was built with."""
+        return (target, self.verse_manager.get_settings_signature(), self.image_generator.get_render_signature())
+    
+    def _should_prefetch(self) -> bool:
+        """Check whether the current mode can be resolved and rendered ahead of time."""
+        if not self.prefetch_enabled:
+            return False
+        if hasattr(self.display_manager, 'is_display_locked') and self.display_manager.is_display_locked():
+            return False
+        # Weather/news refresh on their own 30s cadence; devotional rotation follows the wall clock
+        return getattr(self.verse_manager, 'display_mode', 'time') not in ('weather', 'news', 'devotional')
+    
+    def _schedule_prefetch(self, now: datetime):
+        """Start a background prefetch of the next minute's frame if one isn't already ready or running."""
+        if not self._should_prefetch():
+            return
+        target = now.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        with self._prefetch_lock:
+            if self._prefetch_thread and self._prefetch_thread.is_alive():
+                return
+            if self._prefetched_frame and self._prefetched_frame['target'] == target:
+                return
+            self._prefetch_thread = threading.Thread(target=self._prefetch_next_minute, args=(target,),
+                                                     name='verse-prefetch', daemon=True)
+            self._prefetch_thread.start()
+    
+    def _prefetch_next_minute(self, target: datetime):
+        """Resolve the verse (fetching missing translations) and render the frame for the target minute."""
+        try:
+            key = self._get_prefetch_key(target)
+            start = time.time()
+            with self.performance_monitor.time_operation('verse_prefetch'):
+                prepared = self.verse_manager.prepare_verse(target)
+                if not prepared.get('verse_data'):
+                    return
+                image = self.image_generator.create_verse_image(prepared['verse_data'], at=target)
+            
+            # Settings changed while we were working: the frame would be stale
+            if self._get_prefetch_key(target) != key:
+                self.logger.debug("Discarding prefetched frame - settings changed during prefetch")
+                return
+            
+            with self._prefetch_lock:
+                self._prefetched_frame = {'target': target, 'key': key, 'prepared': prepared, 'image': image}
+            self.logger.debug(f"Prefetched frame for {target.strftime('%H:%M')} in {time.time() - start:.2f}s: "
+                              f"{prepared['verse_data'].get('reference')}")
+        except Exception as e:
+            self.logger.warning(f"Next-minute prefetch failed (will render synchronously): {e}")
+    
+    def _take_prefetched_frame(self, now: datetime) -> Optional[dict]:
+        """Pop the prefetched frame if it was built for this minute with the current settings."""
+        with self._prefetch_lock:
+            frame = self._prefetched_frame
+            if not frame:
+                return None
+            target = now.replace(second=0, microsecond=0)
+            if frame['target'] > target:
+                return None  # Still waiting for its minute
+            self._prefetched_frame = None
+        
+        if frame['target'] != target or frame['key'] != self._get_prefetch_key(target):
+            self.logger.debug("Prefetched frame is stale - rendering synchronously")
+            return None
+        return frame
+    
     def _health_check(self):
         """Perform system health checks."""
         try:
@@ -374,13 +470,15 @@ class ServiceManager:
                 self.logger.info(f"Pagination update triggered - {time_since_last_update:.1f}s since last update")
                 
                 # Force a display update for pagination
-                verse_data = self.verse_manager.get_current_verse()
+                prepared = self.verse_manager.prepare_verse(datetime.now())
+                verse_data = prepared['verse_data']
                 self._last_verse_data = verse_data
                 
                 image = self.image_generator.create_verse_image(verse_data)
                 # Check if this is news mode to ensure proper clearing
                 is_news_mode = verse_data and verse_data.get('is_news_mode', False) if verse_data else False
                 self.display_manager.display_image(image, force_refresh=False, is_news_mode=is_news_mode)
+                self.verse_manager.commit_verse(prepared)
                 
                 # Update timing
                 self._last_update_time = time.time()
@@ -411,13 +509,15 @@ class ServiceManager:
                 self.logger.info(f"Weather page rotation check - updating display")
                 
                 # Force a display update for page rotation
-                verse_data = self.verse_manager.get_current_verse()
+                prepared = self.verse_manager.prepare_verse(datetime.now())
+                verse_data = prepared['verse_data']
                 self._last_verse_data = verse_data
                 
                 image = self.image_generator.create_verse_image(verse_data)
                 # Check if this is news mode to ensure proper clearing
                 is_news_mode = verse_data and verse_data.get('is_news_mode', False) if verse_data else False
                 self.display_manager.display_image(image, force_refresh=False, is_news_mode=is_news_mode)
+                self.verse_manager.commit_verse(prepared)
                 
                 # Update timing
                 self._last_update_time = time.time()
@@ -433,7 +533,7 @@ class ServiceManager:
             self.logger.info("Performing scheduled full refresh")
             
             # Check if current display is weather mode and if data needs refresh
-            verse_data = self.verse_manager.get_current_verse()
+            verse_data = self.verse_manager.peek_verse()
             needs_weather_refresh = False
             
             if verse_data and verse_data.get('is_weather_mode'):
@@ -463,7 +563,7 @@ class ServiceManager:
         """Restore normal Bible verse display (called by display manager cleanup)."""
         try:
             self.logger.info("Restoring normal display after transient message")
-            verse_data = self.verse_manager.get_current_verse()
+            verse_data = self.verse_manager.peek_verse()
             image = self.image_generator.create_verse_image(verse_data)
             # Check if this is news mode for proper clearing
             is_news_mode = verse_data and verse_data.get('is_news_mode', False) if verse_data else False
@@ -596,6 +696,10 @@ class ServiceManager:
             # Save back to file
             with open(metrics_file, 'w') as f:
                 json.dump(all_data, f, indent=2)
+            
+            # Fold only this day into its week/month/year/all-time rollups
+            from time_aggregator import time_aggregator
+            time_aggregator.apply_day(date_str, all_data[date_str])
                 
         except Exception as e:
             self.logger.debug(f"Failed to save daily metrics: {e}")
@@ -604,10 +708,9 @@ class ServiceManager:
         """Refresh metrics aggregation data from daily conversation logs."""
         try:
             # Import time aggregator here to avoid circular imports
-            from time_aggregator import TimeAggregator
+            from time_aggregator import time_aggregator
             
-            # Create time aggregator instance and refresh data
-            time_aggregator = TimeAggregator()
+            # Apply changed recent days to the shared rollups and save them
             time_aggregator.refresh_aggregations()
             
             self.logger.debug("Metrics aggregation refreshed successfully")
@@ -726,6 +829,10 @@ class ServiceManager:
                         self._update_verse()
                         last_update_minute = current_minute
                     
+                    # Prepare the next minute's frame so the boundary only has to push it
+                    if current_minute == last_update_minute and now.second >= self.prefetch_second:
+                        self._schedule_prefetch(now)
+                    
                     # Periodic health check every 5 minutes
                     if current_time - last_health_check > 300:  # 5 minutes
                         if hasattr(self.display_manager, 'perform_health_check'):
@@ -0,0 +1,313 @@
+"""
+Hedged, concurrent fetching across an ordered chain of verse sources.
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Callable, Dict, List, Optional, Tuple
+
+from prometheus_metrics import fetch_seconds
+from tracing import tracer
+
+
+class SourceStats:
+    """Rolling latency and success tracking for a single source."""
+
+    def __init__(self, window: int = 100):
+        self.attempts = 0
+        self.successes = 0
+        self.failures = 0
+        self.latencies = deque(maxlen=window)  # Seconds, successful attempts only
+        self.outcomes = deque(maxlen=window)   # True/False per attempt
+        self.last_error = None
+        self.last_attempt_time = None
+
+    def record(self, success: bool, latency: float, error: Optional[str] = None):
+        """Record the outcome of one attempt."""
+        self.attempts += 1
+        self.last_attempt_time = time.time()
+        self.outcomes.append(success)
+        if success:
+            self.successes += 1
+            self.latencies.append(latency)
+        else:
+            self.failures += 1
+            self.last_error = error
+
+    @property
+    def success_rate(self) -> float:
+        """Success rate over the recent window (optimistic 1.0 when untried)."""
+        if not self.outcomes:
+            return 1.0
+        return sum(1 for outcome in self.outcomes if outcome) / len(self.outcomes)
+
+    def percentile(self, pct: float) -> Optional[float]:
+        """Latency percentile in seconds over the recent window."""
+        if not self.latencies:
+            return None
+        ordered = sorted(self.latencies)
+        index = min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))
+        return ordered[index]
+
+    def to_dict(self) -> Dict:
+        p50 = self.percentile(50)
+        p95 = self.percentile(95)
+        return {
+            'attempts': self.attempts,
+            'successes': self.successes,
+            'failures': self.failures,
+            'success_rate': round(self.success_rate, 3),
+            'p50_ms': round(p50 * 1000, 1) if p50 is not None else None,
+            'p95_ms': round(p95 * 1000, 1) if p95 is not None else None,
+            'last_error': self.last_error,
+            'last_attempt_time': self.last_attempt_time
+        }
+
+
+class CircuitBreaker:
+    """Per-source circuit breaker: closed -> open after repeated failures -> half-open probe."""
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, failure_threshold: int = 3, base_cooldown: float = 30.0, max_cooldown: float = 1800.0):
+        self.failure_threshold = failure_threshold
+        self.base_cooldown = base_cooldown
+        self.max_cooldown = max_cooldown
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.cooldown = base_cooldown
+        self.opened_at = None
+        self.probe_in_flight = False
+
+    def allow_request(self) -> bool:
+        """Check whether a request may be sent; an expired open breaker lets one probe through."""
+        if self.state == self.CLOSED:
+            return True
+        if self.state == self.OPEN:
+            if time.monotonic() - self.opened_at >= self.cooldown:
+                self.state = self.HALF_OPEN
+                self.probe_in_flight = True
+                return True
+            return False
+        # Half-open: only the single probe request is allowed
+        if not self.probe_in_flight:
+            self.probe_in_flight = True
+            return True
+        return False
+
+    def record_success(self):
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.cooldown = self.base_cooldown
+        self.probe_in_flight = False
+
+    def record_failure(self):
+        self.consecutive_failures += 1
+        if self.state == self.HALF_OPEN:
+            # Probe failed: reopen with exponentially longer cool-down
+            self.cooldown = min(self.cooldown * 2, self.max_cooldown)
+            self._open()
+        elif self.state == self.CLOSED and self.consecutive_failures >= self.failure_threshold:
+            self.cooldown = self.base_cooldown
+            self._open()
+
+    def _open(self):
+        self.state = self.OPEN
+        self.opened_at = time.monotonic()
+        self.probe_in_flight = False
+
+    def retry_in(self) -> Optional[float]:
+        """Seconds until an open breaker lets a probe through (None unless open)."""
+        if self.state != self.OPEN:
+            return None
+        return max(0.0, self.cooldown - (time.monotonic() - self.opened_at))
+
+    def to_dict(self) -> Dict:
+        retry_in = self.retry_in()
+        return {
+            'state': self.state,
+            'consecutive_failures': self.consecutive_failures,
+            'cooldown_seconds': self.cooldown,
+            'retry_in_seconds': round(retry_in, 1) if retry_in is not None else None
+        }
+
+
+class HedgedFetcher:
+    """Runs a priority-ordered source chain, starting the next source whenever the leaders are slow or fail."""
+
+    # Minimum attempts before a source's history is trusted for reordering
+    MIN_SAMPLES_FOR_ORDERING = 5
+
+    def __init__(self, max_workers: int = 4, hedge_delay: float = 2.0, timeout: float = 15.0,
+                 failure_threshold: int = 3, base_cooldown: float = 30.0, max_cooldown: float = 1800.0):
+        self.logger = logging.getLogger(__name__)
+        self.hedge_delay = hedge_delay
+        self.timeout = timeout
+        self.failure_threshold = failure_threshold
+        self.base_cooldown = base_cooldown
+        self.max_cooldown = max_cooldown
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='verse-fetch')
+        self.stats: Dict[str, SourceStats] = {}
+        self.breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def _get_stats(self, name: str) -> SourceStats:
+        with self._lock:
+            if name not in self.stats:
+                self.stats[name] = SourceStats()
+            return self.stats[name]
+
+    def _get_breaker_locked(self, name: str) -> CircuitBreaker:
+        if name not in self.breakers:
+            self.breakers[name] = CircuitBreaker(self.failure_threshold, self.base_cooldown, self.max_cooldown)
+        return self.breakers[name]
+
+    def record(self, name: str, success: bool, latency: float, error: Optional[str] = None):
+        """Record an attempt for a source (also used for sources run outside the pool)."""
+        stats = self._get_stats(name)
+        fetch_seconds.observe(latency, source=name, result='success' if success else 'failure')
+        with self._lock:
+            stats.record(success, latency, error)
+            breaker = self._get_breaker_locked(name)
+            previous_state = breaker.state
+            if success:
+                breaker.record_success()
+            else:
+                breaker.record_failure()
+            if breaker.state != previous_state:
+                self.logger.info(f"Circuit breaker for {name}: {previous_state} -> {breaker.state}"
+                                 + (f" (cool-down {breaker.cooldown:.0f}s)" if breaker.state == CircuitBreaker.OPEN else ""))
+
+    def order_sources(self, sources: List[Tuple[str, Callable]]) -> List[Tuple[str, Callable]]:
+        """Drop sources whose breaker is open and order the rest by recent success rate, then p50 latency."""
+        allowed = []
+        with self._lock:
+            for index, (name, func) in enumerate(sources):
+                if not self._get_breaker_locked(name).allow_request():
+                    self.logger.debug(f"Skipping {name}: circuit open")
+                    continue
+                stats = self.stats.get(name)
+                if stats and stats.attempts >= self.MIN_SAMPLES_FOR_ORDERING:
+                    p50 = stats.percentile(50)
+                    # Bucket so small differences keep the configured priority order
+                    rate_bucket = round(stats.success_rate, 1)
+                    latency_bucket = round((p50 if p50 is not None else self.hedge_delay) / 0.25)
+                else:
+                    rate_bucket = 1.0
+                    latency_bucket = round(self.hedge_delay / 0.25)
+                allowed.append(((-rate_bucket, latency_bucket, index), (name, func)))
+        allowed.sort(key=lambda item: item[0])
+        return [source for _, source in allowed]
+
+    def _run_source(self, name: str, func: Callable[[], Optional[Dict]], parent=None) -> Optional[Dict]:
+        with tracer.span('verse.fetch', parent=parent, source=name) as span:
+            start = time.monotonic()
+            try:
+                result = func()
+            except Exception as e:
+                self.record(name, False, time.monotonic() - start, str(e))
+                raise
+            success = bool(result and result.get('text'))
+            self.record(name, success, time.monotonic() - start, None if success else 'empty result')
+            span.set(success=success)
+            return result
+
+    def fetch(self, sources: List[Tuple[str, Callable[[], Optional[Dict]]]]) -> Tuple[Optional[str], Optional[Dict]]:
+        """Return (source name, result) from the first source to succeed, or (None, None)."""
+        sources = self.order_sources(sources)
+        if not sources:
+            return None, None
+
+        launched = set()
+        try:
+            return self._fetch_ordered(sources, launched)
+        finally:
+            self.release_unlaunched(sources, launched)
+
+    def release_unlaunched(self, sources: List[Tuple[str, Callable]], launched: set):
+        """Hand back the half-open probe slots order_sources() claimed for sources that were never started."""
+        with self._lock:
+            for name, _ in sources:
+                breaker = self.breakers.get(name)
+                if name not in launched and breaker and breaker.state == CircuitBreaker.HALF_OPEN:
+                    breaker.probe_in_flight = False
+
+    def next_retry_in(self, names: List[str]) -> float:
+        """Seconds until one of the named sources may be tried again (0 if one is available now)."""
+        with self._lock:
+            waits = []
+            for name in names:
+                breaker = self.breakers.get(name)
+                if breaker is None or breaker.state == CircuitBreaker.CLOSED:
+                    return 0.0
+                retry_in = breaker.retry_in()
+                # A half-open breaker is waiting on someone else's probe; check back shortly
+                waits.append(retry_in if retry_in is not None else self.hedge_delay)
+            return min(waits) if waits else 0.0
+
+    def _fetch_ordered(self, sources: List[Tuple[str, Callable]], launched: set) -> Tuple[Optional[str], Optional[Dict]]:
+        deadline = time.monotonic() + self.timeout
+        pending = {}
+        next_index = 0
+        parent_span = tracer.current()  # Provider spans run on pool threads but belong to the caller's trace
+
+        def launch_next():
+            nonlocal next_index
+            name, func = sources[next_index]
+            pending[self.executor.submit(self._run_source, name, func, parent_span)] = name
+            launched.add(name)
+            next_index += 1
+
+        while True:
+            if not pending:
+                if next_index >= len(sources):
+                    return None, None
+                launch_next()
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                self.logger.warning(f"Source chain timed out waiting on: {', '.join(pending.values())}")
+                return None, None
+
+            has_more = next_index < len(sources)
+            done, _ = wait(list(pending), timeout=min(self.hedge_delay, remaining) if has_more else remaining,
+                           return_when=FIRST_COMPLETED)
+
+            if not done:
+                # Leaders are slow: hedge by starting the next source alongside them
+                if has_more:
+                    self.logger.debug(f"Hedging after {self.hedge_delay}s: starting {sources[next_index][0]}")
+                    launch_next()
+                continue
+
+            for future in done:
+                name = pending.pop(future)
+                try:
+                    result = future.result()
+                except Exception as e:
+                    self.logger.debug(f"Source {name} failed: {e}")
+                    result = None
+                if result and result.get('text'):
+                    return name, result
+
+            # A source failed: move on to the next one without waiting for the hedge delay
+            if next_index < len(sources):
+                launch_next()
+
+    def get_stats(self) -> Dict[str, Dict]:
+        """Per-source latency, success and circuit breaker state."""
+        with self._lock:
+            result = {}
+            for name, stats in self.stats.items():
+                result[name] = stats.to_dict()
+                result[name]['circuit'] = self._get_breaker_locked(name).to_dict()
+            return result
+
+    def shutdown(self):
+        """Stop accepting work; in-flight requests finish on their own timeouts."""
+        self.executor.shutdown(wait=False)
@@ -0,0 +1,219 @@
+"""
+Shared text measurement and font fitting for the renderers.
+
+Word widths are measured once per (font, size) and kept in a table, so
+wrapping a paragraph only sums cached widths instead of re-measuring every
+growing line prefix. Over-long words are broken with a hyphen, wrapped
+layouts are cached by (text hash, font, width), and font fitting
+binary-searches the size range.
+"""
+
+import logging
+import textwrap
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, List, Optional
+
+from tracing import tracer
+
+
+class TextLayout:
+    """Per-(font, size) word-width tables, greedy wrapping and binary-search font fitting."""
+
+    def __init__(self, max_fonts: int = 32, max_words_per_font: int = 20000, max_wrap_entries: int = 512):
+        self.logger = logging.getLogger(__name__)
+        self.max_fonts = max_fonts
+        self.max_words_per_font = max_words_per_font
+        self.max_wrap_entries = max_wrap_entries
+        self._tables: "OrderedDict[tuple, Dict[str, float]]" = OrderedDict()
+        self._wrap_cache: "OrderedDict[tuple, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.wrap_hits = 0
+        self.wrap_misses = 0
+
+    # === Word-width tables ===
+
+    def _font_key(self, font) -> tuple:
+        path = getattr(font, 'path', None)
+        size = getattr(font, 'size', None)
+        if path is not None and size is not None:
+            return (str(path), size)
+        return ('id', id(font))
+
+    def _table(self, font) -> Dict[str, float]:
+        key = self._font_key(font)
+        with self._lock:
+            table = self._tables.get(key)
+            if table is None:
+                table = {}
+                self._tables[key] = table
+                while len(self._tables) > self.max_fonts:
+                    self._tables.popitem(last=False)
+            else:
+                self._tables.move_to_end(key)
+            if len(table) > self.max_words_per_font:
+                table.clear()
+            return table
+
+    @staticmethod
+    def _measure(font, text: str) -> float:
+        if hasattr(font, 'getlength'):
+            return font.getlength(text)
+        bbox = font.getbbox(text)
+        return bbox[2] - bbox[0]
+
+    def text_width(self, font, text: str) -> float:
+        """Width of a word (or any string) in the font, measured once and cached."""
+        table = self._table(font)
+        width = table.get(text)
+        if width is None:
+            width = self._measure(font, text)
+            table[text] = width
+        return width
+
+    def space_width(self, font) -> float:
+        return self.text_width(font, ' ')
+
+    # === Wrapping ===
+
+    def wrap(self, text: str, font, max_width: int) -> List[str]:
+        """Wrap text to max_width; results are cached by (text hash, font, width)."""
+        if not font:
+            # Simple character-based wrapping if no font available
+            return textwrap.wrap(text, width=max(1, max_width // 10))
+
+        cache_key = (hash(text), len(text), self._font_key(font), int(max_width))
+        with self._lock:
+            cached = self._wrap_cache.get(cache_key)
+            if cached is not None:
+                self._wrap_cache.move_to_end(cache_key)
+                self.wrap_hits += 1
+                return list(cached)
+            self.wrap_misses += 1
+
+        with tracer.span('render.wrap', chars=len(text)):
+            lines = self._wrap_uncached(text, font, max_width)
+
+        with self._lock:
+            self._wrap_cache[cache_key] = tuple(lines)
+            while len(self._wrap_cache) > self.max_wrap_entries:
+                self._wrap_cache.popitem(last=False)
+        return lines
+
+    def _wrap_uncached(self, text: str, font, max_width: int) -> List[str]:
+        """Greedy wrap in one pass over the words using cached word widths."""
+        table = self._table(font)
+        space = self.space_width(font)
+        lines = []
+        current_line = []
+        current_width = 0.0
+
+        def word_width(word):
+            width = table.get(word)
+            if width is None:
+                width = self._measure(font, word)
+                table[word] = width
+            return width
+
+        for word in text.split():
+            width = word_width(word)
+            available = max_width - (current_width + space if current_line else 0)
+
+            if width <= available:
+                current_line.append(word)
+                current_width = max_width - available + width
+                continue
+
+            # Hyphenated compounds can split after a hyphen to fill the current line
+            if current_line and '-' in word.strip('-'):
+                head, tail = self._split_at_hyphen(word, available, word_width)
+                if head:
+                    current_line.append(head)
+                    word, width = tail, word_width(tail)
+
+            if current_line:
+                lines.append(' '.join(current_line))
+                current_line, current_width = [], 0.0
+
+            # Words wider than a whole line are broken with a hyphen
+            while width > max_width and len(word) > 1:
+                head, word = self._break_long_word(word, font, max_width, word_width)
+                lines.append(head)
+                width = word_width(word)
+
+            current_line = [word]
+            current_width = width
+
+        if current_line:
+            lines.append(' '.join(current_line))
+        return lines
+
+    def _split_at_hyphen(self, word: str, available: float, word_width) -> tuple:
+        """Longest prefix ending at one of the word's hyphens that fits in the available width."""
+        best = None
+        for index, char in enumerate(word[:-1]):
+            if char == '-' and index > 0 and word_width(word[:index + 1]) <= available:
+                best = index + 1
+        if best is None:
+            return None, word
+        return word[:best], word[best:]
+
+    def _break_long_word(self, word: str, font, max_width: int, word_width) -> tuple:
+        """Split an over-long word into a hyphenated head that fits the line and the remaining tail."""
+        head, tail = self._split_at_hyphen(word, max_width, word_width)
+        if head:
+            return head, tail
+
+        # Binary-search the longest prefix that fits with a trailing hyphen (at least one character)
+        low, high = 1, len(word) - 1
+        best = 1
+        while low <= high:
+            middle = (low + high) // 2
+            if self._measure(font, word[:middle] + '-') <= max_width:
+                best = middle
+                low = middle + 1
+            else:
+                high = middle - 1
+        return word[:best] + '-', word[best:]
+
+    def count_lines(self, text: str, font, max_width: int) -> int:
+        """Number of lines the text wraps to."""
+        return len(self.wrap(text, font, max_width))
+
+    # === Font fitting ===
+
+    def fit_font_size(self, sizes: Iterable[int], fits: Callable[[int], bool]) -> Optional[int]:
+        """Largest size for which fits(size) is true, by binary search (assumes smaller sizes fit more)."""
+        ordered = sorted(set(sizes), reverse=True)
+        best = None
+        low, high = 0, len(ordered) - 1
+        with tracer.span('render.font_fit') as span:
+            while low <= high:
+                middle = (low + high) // 2
+                if fits(ordered[middle]):
+                    best = ordered[middle]
+                    high = middle - 1
+                else:
+                    low = middle + 1
+            span.set(size=best)
+        return best
+
+    def clear(self):
+        """Drop all cached width tables and wrapped layouts."""
+        with self._lock:
+            self._tables.clear()
+            self._wrap_cache.clear()
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            return {
+                'fonts': len(self._tables),
+                'words': sum(len(table) for table in self._tables.values()),
+                'wrap_entries': len(self._wrap_cache),
+                'wrap_hits': self.wrap_hits,
+                'wrap_misses': self.wrap_misses
+            }
+
+
+# Global text layout instance
+text_layout = TextLayout()
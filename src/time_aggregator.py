@@ -6,10 +6,12 @@ Aggregates daily metrics into weekly, monthly, yearly, and all-time summaries.
 
 import json
 import logging
+import os
+import threading
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Dict, List, Any, Optional
-from collections import defaultdict, Counter
+from collections import Counter
 from dataclasses import dataclass, asdict
 import calendar
 
@@ -32,118 +34,111 @@ class TimeAggregatedMetrics:
     translation_usage: Dict[str, int] = None  # New: track translation usage
     bible_books_accessed: Dict[str, int] = None  # New: track Bible book access
     
+# Days at or after the watermark may still be rewritten, so their applied record is kept
+OPEN_DAYS = 2
+ROLLUP_VERSION = 1
+PERIOD_TYPES = ('weekly', 'monthly', 'yearly', 'all_time')
+
+
+def _add_counts(target: Dict[str, Any], counts: Optional[Dict], sign: int):
+    """Add (sign=1) or remove (sign=-1) a day's counts from stored sums, dropping zeroed keys."""
+    for key, count in (counts or {}).items():
+        key = str(key)
+        value = target.get(key, 0) + sign * count
+        if value:
+            target[key] = value
+        else:
+            target.pop(key, None)
+
+
 class TimeAggregator:
-    """Handles aggregation of daily metrics into different time periods."""
+    """Maintains weekly, monthly, yearly and all-time rollups of daily metrics incrementally."""
     
     def __init__(self, data_dir: str = "data"):
         self.data_dir = Path(data_dir)
         self.data_dir.mkdir(exist_ok=True)
         
-        # File paths for different aggregation levels
+        # Daily records (written by the service manager) and the rollup state built from them
         self.daily_file = self.data_dir / "aggregated_metrics.json"
-        self.weekly_file = self.data_dir / "weekly_metrics.json"
-        self.monthly_file = self.data_dir / "monthly_metrics.json"
-        self.yearly_file = self.data_dir / "yearly_metrics.json"
-        self.all_time_file = self.data_dir / "all_time_metrics.json"
+        self.rollup_file = self.data_dir / "time_rollups.json"
         
-        # Load existing data
         self.daily_data = {}
         self.weekly_data = {}
         self.monthly_data = {}
         self.yearly_data = {}
         self.all_time_data = {}
         
+        # Stored sums and weights per bucket: period type -> key -> sums
+        self._rollups = {period_type: {} for period_type in PERIOD_TYPES}
+        self.watermark = None  # Days before this date are sealed into the rollups
+        self._open_days = {}   # date -> record as applied, for days >= watermark
+        self._daily_mtime = None
+        self._dirty = False
+        self._lock = threading.RLock()
+        
         self.load_all_data()
     
-    def load_all_data(self):
-        """Load all existing aggregated data."""
+    def _period_data(self, period_type: str) -> Dict[str, TimeAggregatedMetrics]:
+        return {'weekly': self.weekly_data, 'monthly': self.monthly_data,
+                'yearly': self.yearly_data, 'all_time': self.all_time_data}[period_type]
+    
+    def _load_daily_data(self) -> bool:
+        """Reload the daily records if the file changed since the last load."""
         try:
-            # Load daily data (existing format)
-            if self.daily_file.exists():
-                with open(self.daily_file, 'r') as f:
-                    self.daily_data = json.load(f)
-            
-            # Load weekly data
-            if self.weekly_file.exists():
-                with open(self.weekly_file, 'r') as f:
-                    weekly_raw = json.load(f)
-                    self.weekly_data = {
-                        key: TimeAggregatedMetrics(**data)
-                        for key, data in weekly_raw.items()
-                    }
-            
-            # Load monthly data
-            if self.monthly_file.exists():
-                with open(self.monthly_file, 'r') as f:
-                    monthly_raw = json.load(f)
-                    self.monthly_data = {
-                        key: TimeAggregatedMetrics(**data)
-                        for key, data in monthly_raw.items()
-                    }
-            
-            # Load yearly data
-            if self.yearly_file.exists():
-                with open(self.yearly_file, 'r') as f:
-                    yearly_raw = json.load(f)
-                    self.yearly_data = {
-                        key: TimeAggregatedMetrics(**data)
-                        for key, data in yearly_raw.items()
-                    }
-            
-            # Load all-time data
-            if self.all_time_file.exists():
-                with open(self.all_time_file, 'r') as f:
-                    all_time_raw = json.load(f)
-                    if all_time_raw:
-                        self.all_time_data = {
-                            'all_time': TimeAggregatedMetrics(**all_time_raw['all_time'])
-                        }
-            
-            logger.info(f"Loaded aggregated data: {len(self.daily_data)} daily, {len(self.weekly_data)} weekly, {len(self.monthly_data)} monthly, {len(self.yearly_data)} yearly")
-            
-        except Exception as e:
-            logger.error(f"Error loading aggregated data: {e}")
+            mtime = self.daily_file.stat().st_mtime_ns
+        except OSError:
+            return False
+        if mtime == self._daily_mtime:
+            return False
+        with open(self.daily_file, 'r') as f:
+            self.daily_data = json.load(f)
+        self._daily_mtime = mtime
+        return True
+    
+    def load_all_data(self):
+        """Load daily records and the saved rollups (rebuilding them if missing or outdated)."""
+        with self._lock:
+            try:
+                self._load_daily_data()
+                
+                state = None
+                if self.rollup_file.exists():
+                    with open(self.rollup_file, 'r') as f:
+                        state = json.load(f)
+                
+                if state and state.get('version') == ROLLUP_VERSION:
+                    self.watermark = state.get('watermark')
+                    self._open_days = state.get('open_days', {})
+                    for period_type in PERIOD_TYPES:
+                        self._rollups[period_type] = state.get(period_type, {})
+                        for key in self._rollups[period_type]:
+                            self._materialize(period_type, key)
+                    # Pick up days written while nothing was applying them
+                    self._apply_open_days()
+                else:
+                    self.update_all_aggregations()
+                
+                logger.info(f"Loaded aggregated data: {len(self.daily_data)} daily, {len(self.weekly_data)} weekly, {len(self.monthly_data)} monthly, {len(self.yearly_data)} yearly")
+                
+            except Exception as e:
+                logger.error(f"Error loading aggregated data: {e}")
     
     def save_all_data(self):
-        """Save all aggregated data to files."""
-        try:
-            # Save daily data (keep existing format)
-            with open(self.daily_file, 'w') as f:
-                json.dump(self.daily_data, f, indent=2)
-            
-            # Save weekly data
-            weekly_serializable = {
-                key: asdict(metrics) for key, metrics in self.weekly_data.items()
-            }
-            with open(self.weekly_file, 'w') as f:
-                json.dump(weekly_serializable, f, indent=2)
-            
-            # Save monthly data
-            monthly_serializable = {
-                key: asdict(metrics) for key, metrics in self.monthly_data.items()
-            }
-            with open(self.monthly_file, 'w') as f:
-                json.dump(monthly_serializable, f, indent=2)
-            
-            # Save yearly data
-            yearly_serializable = {
-                key: asdict(metrics) for key, metrics in self.yearly_data.items()
-            }
-            with open(self.yearly_file, 'w') as f:
-                json.dump(yearly_serializable, f, indent=2)
-            
-            # Save all-time data
-            if self.all_time_data:
-                all_time_serializable = {
-                    key: asdict(metrics) for key, metrics in self.all_time_data.items()
-                }
-                with open(self.all_time_file, 'w') as f:
-                    json.dump(all_time_serializable, f, indent=2)
-            
-            logger.info("All aggregated data saved successfully")
-            
-        except Exception as e:
-            logger.error(f"Error saving aggregated data: {e}")
+        """Save the rollups together with the watermark."""
+        with self._lock:
+            try:
+                state = {'version': ROLLUP_VERSION, 'watermark': self.watermark, 'open_days': self._open_days}
+                state.update(self._rollups)
+                temp_file = self.rollup_file.with_suffix('.tmp')
+                with open(temp_file, 'w') as f:
+                    json.dump(state, f, separators=(',', ':'))
+                os.replace(temp_file, self.rollup_file)
+                self._dirty = False
+                
+                logger.info("All aggregated data saved successfully")
+                
+            except Exception as e:
+                logger.error(f"Error saving aggregated data: {e}")
     
     def get_week_key(self, date_str: str) -> str:
         """Get ISO week key (e.g., '2025-W35') from date string."""
@@ -192,130 +187,128 @@ class TimeAggregator:
         end_date = datetime(year, 12, 31).date()
         return start_date.isoformat(), end_date.isoformat()
     
-    def aggregate_period_data(self, daily_data_subset: Dict[str, Any], 
-                            period_type: str, period_key: str,
-                            start_date: str, end_date: str) -> TimeAggregatedMetrics:
-        """Aggregate daily data into a time period."""
-        if not daily_data_subset:
-            return TimeAggregatedMetrics(
-                period_type=period_type,
-                period_key=period_key,
-                start_date=start_date,
-                end_date=end_date,
-                total_conversations=0,
-                categories={},
-                keywords={},
-                avg_response_time=0.0,
-                success_rate=100.0,
-                hourly_distribution={},
-                daily_breakdown={}
-            )
-        
-        # Aggregate all metrics
-        total_conversations = 0
-        combined_categories = defaultdict(int)
-        combined_keywords = defaultdict(int)
-        combined_hourly = defaultdict(int)
-        total_weighted_response_time = 0
-        total_weighted_success = 0
-        daily_breakdown = {}
-        
-        for date_str, day_data in daily_data_subset.items():
-            conversations = day_data.get('total_conversations', 0)
-            total_conversations += conversations
-            daily_breakdown[date_str] = conversations
+    def _bucket_keys(self, date_str: str) -> List[tuple]:
+        return [('weekly', self.get_week_key(date_str)), ('monthly', self.get_month_key(date_str)),
+                ('yearly', self.get_year_key(date_str)), ('all_time', 'all_time')]
+    
+    def _get_bucket(self, period_type: str, key: str, date_str: str) -> Dict[str, Any]:
+        bucket = self._rollups[period_type].get(key)
+        if bucket is None:
+            if period_type == 'weekly':
+                start_date, end_date = self.get_week_dates(key)
+            elif period_type == 'monthly':
+                start_date, end_date = self.get_month_dates(key)
+            elif period_type == 'yearly':
+                start_date, end_date = self.get_year_dates(key)
+            else:
+                start_date = end_date = date_str
+            bucket = self._rollups[period_type][key] = {
+                'start_date': start_date, 'end_date': end_date, 'total': 0,
+                'categories': {}, 'keywords': {}, 'hourly': {}, 'daily': {},
+                'translation_usage': {}, 'bible_books_accessed': {},
+                'response_time_sum': 0.0, 'success_sum': 0.0
+            }
+        return bucket
+    
+    def _apply_to_bucket(self, bucket: Dict[str, Any], date_str: str, record: Dict[str, Any], sign: int):
+        """Add or remove one day's contribution to a bucket's stored sums and weights."""
+        conversations = record.get('total_conversations', 0)
+        bucket['total'] += sign * conversations
+        _add_counts(bucket['categories'], record.get('categories'), sign)
+        _add_counts(bucket['keywords'], record.get('keywords'), sign)
+        _add_counts(bucket['hourly'], record.get('hourly_distribution'), sign)
+        _add_counts(bucket['translation_usage'], record.get('translation_usage'), sign)
+        _add_counts(bucket['bible_books_accessed'], record.get('bible_books_accessed'), sign)
+        
+        # Averages are kept as conversation-weighted sums
+        if conversations > 0:
+            bucket['response_time_sum'] += sign * record.get('avg_response_time', 0) * conversations
+            bucket['success_sum'] += sign * (record.get('success_rate', 100) / 100) * conversations
+        
+        if sign > 0:
+            bucket['daily'][date_str] = conversations
+            bucket['start_date'] = min(bucket['start_date'], date_str)
+            bucket['end_date'] = max(bucket['end_date'], date_str)
+        else:
+            bucket['daily'].pop(date_str, None)
+    
+    def _materialize(self, period_type: str, key: str):
+        """Rebuild the public metrics for one bucket from its stored sums."""
+        bucket = self._rollups[period_type][key]
+        total = bucket['total']
+        self._period_data(period_type)[key] = TimeAggregatedMetrics(
+            period_type=period_type,
+            period_key=key,
+            start_date=bucket['start_date'],
+            end_date=bucket['end_date'],
+            total_conversations=total,
+            categories=dict(bucket['categories']),
+            keywords=dict(Counter(bucket['keywords']).most_common(20)),
+            avg_response_time=round(bucket['response_time_sum'] / total, 2) if total > 0 else 0.0,
+            success_rate=round(bucket['success_sum'] / total * 100, 1) if total > 0 else 100.0,
+            hourly_distribution=dict(bucket['hourly']),
+            daily_breakdown=dict(bucket['daily']),
+            translation_usage=dict(bucket['translation_usage']),
+            bible_books_accessed=dict(bucket['bible_books_accessed'])
+        )
+    
+    def apply_day(self, date_str: str, record: Dict[str, Any]) -> bool:
+        """Fold a new or changed daily record into its week, month, year and all-time rollups."""
+        with self._lock:
+            previous = self._open_days.get(date_str)
+            if previous is None and self.watermark and date_str < self.watermark:
+                logger.debug(f"Skipping sealed day {date_str} (rebuild to include changes)")
+                return False
+            if previous == record:
+                return False
             
-            # Categories
-            for category, count in day_data.get('categories', {}).items():
-                combined_categories[category] += count
+            for period_type, key in self._bucket_keys(date_str):
+                bucket = self._get_bucket(period_type, key, date_str)
+                if previous is not None:
+                    self._apply_to_bucket(bucket, date_str, previous, -1)
+                self._apply_to_bucket(bucket, date_str, record, 1)
+                self._materialize(period_type, key)
             
-            # Keywords
-            for keyword, count in day_data.get('keywords', {}).items():
-                combined_keywords[keyword] += count
+            self.daily_data[date_str] = record
+            self._open_days[date_str] = json.loads(json.dumps(record))  # Detached copy to subtract later
             
-            # Hourly distribution
-            for hour, count in day_data.get('hourly_distribution', {}).items():
-                combined_hourly[int(hour)] += count
+            # Seal days that can no longer change
+            newest = datetime.fromisoformat(max(self._open_days)).date()
+            watermark = (newest - timedelta(days=OPEN_DAYS - 1)).isoformat()
+            if self.watermark is None or watermark > self.watermark:
+                self.watermark = watermark
+                self._open_days = {day: data for day, data in self._open_days.items() if day >= watermark}
             
-            # Weighted averages
-            if conversations > 0:
-                total_weighted_response_time += day_data.get('avg_response_time', 0) * conversations
-                total_weighted_success += (day_data.get('success_rate', 100) / 100) * conversations
-        
-        # Calculate final metrics
-        avg_response_time = (total_weighted_response_time / total_conversations 
-                           if total_conversations > 0 else 0.0)
-        success_rate = (total_weighted_success / total_conversations * 100 
-                       if total_conversations > 0 else 100.0)
-        
-        return TimeAggregatedMetrics(
-            period_type=period_type,
-            period_key=period_key,
-            start_date=start_date,
-            end_date=end_date,
-            total_conversations=total_conversations,
-            categories=dict(combined_categories),
-            keywords=dict(Counter(combined_keywords).most_common(20)),
-            avg_response_time=round(avg_response_time, 2),
-            success_rate=round(success_rate, 1),
-            hourly_distribution=dict(combined_hourly),
-            daily_breakdown=daily_breakdown
-        )
+            self._dirty = True
+            return True
+    
+    def _apply_open_days(self) -> int:
+        """Apply daily records at or after the watermark that differ from what was applied."""
+        changed = 0
+        for date_str in sorted(self.daily_data):
+            if self.watermark and date_str < self.watermark:
+                continue
+            if self.apply_day(date_str, self.daily_data[date_str]):
+                changed += 1
+        return changed
     
     def update_all_aggregations(self):
-        """Update all time-based aggregations from daily data."""
-        if not self.daily_data:
-            logger.warning("No daily data found for aggregation")
-            return
-        
-        # Get all dates to process
-        all_dates = sorted(self.daily_data.keys())
-        
-        # Update weekly aggregations
-        weekly_groups = defaultdict(dict)
-        for date_str in all_dates:
-            week_key = self.get_week_key(date_str)
-            weekly_groups[week_key][date_str] = self.daily_data[date_str]
-        
-        for week_key, week_data in weekly_groups.items():
-            start_date, end_date = self.get_week_dates(week_key)
-            self.weekly_data[week_key] = self.aggregate_period_data(
-                week_data, 'weekly', week_key, start_date, end_date
-            )
-        
-        # Update monthly aggregations
-        monthly_groups = defaultdict(dict)
-        for date_str in all_dates:
-            month_key = self.get_month_key(date_str)
-            monthly_groups[month_key][date_str] = self.daily_data[date_str]
-        
-        for month_key, month_data in monthly_groups.items():
-            start_date, end_date = self.get_month_dates(month_key)
-            self.monthly_data[month_key] = self.aggregate_period_data(
-                month_data, 'monthly', month_key, start_date, end_date
-            )
-        
-        # Update yearly aggregations
-        yearly_groups = defaultdict(dict)
-        for date_str in all_dates:
-            year_key = self.get_year_key(date_str)
-            yearly_groups[year_key][date_str] = self.daily_data[date_str]
-        
-        for year_key, year_data in yearly_groups.items():
-            start_date, end_date = self.get_year_dates(year_key)
-            self.yearly_data[year_key] = self.aggregate_period_data(
-                year_data, 'yearly', year_key, start_date, end_date
-            )
-        
-        # Update all-time aggregation
-        if all_dates:
-            start_date = min(all_dates)
-            end_date = max(all_dates)
-            self.all_time_data['all_time'] = self.aggregate_period_data(
-                self.daily_data, 'all_time', 'all_time', start_date, end_date
-            )
-        
-        logger.info(f"Updated aggregations: {len(self.weekly_data)} weeks, {len(self.monthly_data)} months, {len(self.yearly_data)} years")
+        """Rebuild all time-based aggregations from scratch out of the daily data."""
+        with self._lock:
+            self._rollups = {period_type: {} for period_type in PERIOD_TYPES}
+            for period_type in PERIOD_TYPES:
+                self._period_data(period_type).clear()
+            self.watermark = None
+            self._open_days = {}
+            
+            if not self.daily_data:
+                logger.warning("No daily data found for aggregation")
+                return
+            
+            for date_str in sorted(self.daily_data):
+                self.apply_day(date_str, self.daily_data[date_str])
+            
+            logger.info(f"Updated aggregations: {len(self.weekly_data)} weeks, {len(self.monthly_data)} months, {len(self.yearly_data)} years")
     
     def get_filtered_data(self, time_filter: str, date_reference: str = None) -> Dict[str, Any]:
         """Get aggregated data for a specific time filter."""
@@ -324,36 +317,38 @@ class TimeAggregator:
         
         reference_date = datetime.fromisoformat(date_reference).date()
         
-        if time_filter == 'today':
-            date_key = reference_date.isoformat()
-            return self.daily_data.get(date_key, {})
-        
-        elif time_filter == 'weekly':
-            week_key = self.get_week_key(reference_date.isoformat())
-            if week_key in self.weekly_data:
-                return asdict(self.weekly_data[week_key])
-            return {}
-        
-        elif time_filter == 'monthly':
-            month_key = self.get_month_key(reference_date.isoformat())
-            if month_key in self.monthly_data:
-                return asdict(self.monthly_data[month_key])
-            return {}
-        
-        elif time_filter == 'yearly':
-            year_key = self.get_year_key(reference_date.isoformat())
-            if year_key in self.yearly_data:
-                return asdict(self.yearly_data[year_key])
-            return {}
-        
-        elif time_filter == 'all_time':
-            if 'all_time' in self.all_time_data:
-                return asdict(self.all_time_data['all_time'])
-            return {}
-        
-        else:
-            logger.warning(f"Unknown time filter: {time_filter}")
-            return {}
+        # apply_day mutates the buckets on the service thread; asdict() copies them under the lock
+        with self._lock:
+            if time_filter == 'today':
+                date_key = reference_date.isoformat()
+                return dict(self.daily_data.get(date_key, {}))
+        
+            elif time_filter == 'weekly':
+                week_key = self.get_week_key(reference_date.isoformat())
+                if week_key in self.weekly_data:
+                    return asdict(self.weekly_data[week_key])
+                return {}
+        
+            elif time_filter == 'monthly':
+                month_key = self.get_month_key(reference_date.isoformat())
+                if month_key in self.monthly_data:
+                    return asdict(self.monthly_data[month_key])
+                return {}
+        
+            elif time_filter == 'yearly':
+                year_key = self.get_year_key(reference_date.isoformat())
+                if year_key in self.yearly_data:
+                    return asdict(self.yearly_data[year_key])
+                return {}
+        
+            elif time_filter == 'all_time':
+                if 'all_time' in self.all_time_data:
+                    return asdict(self.all_time_data['all_time'])
+                return {}
+        
+            else:
+                logger.warning(f"Unknown time filter: {time_filter}")
+                return {}
     
     def get_chart_data(self, time_filter: str, chart_type: str, 
                       date_reference: str = None) -> Dict[str, Any]:
@@ -402,7 +397,18 @@ class TimeAggregator:
             return {'labels': [], 'data': []}
     
     def refresh_aggregations(self):
-        """Refresh all aggregations from daily data and save."""
-        self.update_all_aggregations()
-        self.save_all_data()
-        logger.info("All aggregations refreshed and saved")
\ No newline at end of file
+        """Apply any new or changed recent daily records and save the rollups if they changed."""
+        with self._lock:
+            try:
+                if self._load_daily_data():
+                    changed = self._apply_open_days()
+                    logger.debug(f"Applied {changed} changed day(s) to rollups")
+            except Exception as e:
+                logger.error(f"Error reading daily metrics: {e}")
+            if self._dirty:
+                self.save_all_data()
+        logger.info("All aggregations refreshed and saved")
+
+
+# Global time aggregator instance
+time_aggregator = TimeAggregator()
@@ -0,0 +1,221 @@
+"""
+Lightweight nested tracing spans for the render and display hot paths.
+
+Spans nest per thread, finished spans are kept in a ring buffer and folded
+into per-name latency histograms, and the buffer can be exported as Chrome
+trace-event JSON (chrome://tracing or Perfetto) to see where each minute's
+update time goes.
+"""
+
+import itertools
+import os
+import threading
+import time
+from bisect import bisect_left
+from collections import deque
+from typing import Dict, List, Optional
+
+# Histogram bucket upper bounds in milliseconds (last bucket is everything above)
+HISTOGRAM_BOUNDS_MS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+class SpanHistogram:
+    """Fixed-bucket latency histogram for one span name."""
+
+    def __init__(self):
+        self.buckets = [0] * (len(HISTOGRAM_BOUNDS_MS) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def add(self, duration_ms: float):
+        self.buckets[bisect_left(HISTOGRAM_BOUNDS_MS, duration_ms)] += 1
+        self.count += 1
+        self.total_ms += duration_ms
+        self.max_ms = max(self.max_ms, duration_ms)
+
+    def quantile(self, fraction: float) -> Optional[float]:
+        """Upper bound of the bucket holding the given quantile."""
+        if not self.count:
+            return None
+        target = fraction * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self.buckets):
+            seen += bucket_count
+            if seen >= target:
+                return HISTOGRAM_BOUNDS_MS[index] if index < len(HISTOGRAM_BOUNDS_MS) else self.max_ms
+        return self.max_ms
+
+    def to_dict(self) -> Dict:
+        return {
+            'count': self.count,
+            'avg_ms': round(self.total_ms / self.count, 3) if self.count else None,
+            'max_ms': round(self.max_ms, 3),
+            'p50_ms': self.quantile(0.5),
+            'p95_ms': self.quantile(0.95),
+            'buckets': {('le_' + str(bound)): count for bound, count in zip(HISTOGRAM_BOUNDS_MS, self.buckets)},
+            'overflow': self.buckets[-1]
+        }
+
+
+class Span:
+    """One timed operation; use as a context manager via Tracer.span()."""
+
+    __slots__ = ('tracer', 'name', 'attrs', 'span_id', 'parent_id', 'trace_id', 'start', 'depth')
+
+    def __init__(self, tracer: 'Tracer', name: str, attrs: Dict, parent: Optional['Span']):
+        self.tracer = tracer
+        self.name = name
+        self.attrs = attrs
+        self.span_id = next(tracer._ids)
+        self.parent_id = parent.span_id if parent else None
+        self.trace_id = parent.trace_id if parent else self.span_id
+        self.depth = parent.depth + 1 if parent else 0
+        self.start = 0.0
+
+    def set(self, **attrs):
+        """Attach attributes discovered while the span is running (e.g. cache hit)."""
+        self.attrs.update(attrs)
+
+    def __enter__(self):
+        self.tracer._stack().append(self)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        end = time.perf_counter()
+        stack = self.tracer._stack()
+        if stack and stack[-1] is self:
+            stack.pop()
+        if exc_type is not None:
+            self.attrs['error'] = exc_type.__name__
+        self.tracer._finish(self, end)
+        return False
+
+
+class _NoopSpan:
+    """Stand-in returned while tracing is disabled."""
+
+    def set(self, **attrs):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        return False
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+class Tracer:
+    """Collects nested spans into a ring buffer and per-name histograms."""
+
+    def __init__(self, buffer_size: int = 4000, enabled: bool = True):
+        self.enabled = enabled
+        self._spans = deque(maxlen=buffer_size)
+        self._histograms: Dict[str, SpanHistogram] = {}
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._epoch = time.perf_counter()
+        self._epoch_wall = time.time()
+
+    def _stack(self) -> List[Span]:
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def current(self) -> Optional[Span]:
+        """Innermost open span on this thread (pass as parent= to continue a trace on another thread)."""
+        stack = self._stack()
+        return stack[-1] if stack else None
+
+    def span(self, name: str, parent: Optional[Span] = None, **attrs):
+        """Context manager timing a named span nested under the current (or given) parent."""
+        if not self.enabled:
+            return _NOOP_SPAN
+        return Span(self, name, attrs, parent if parent is not None else self.current())
+
+    def _finish(self, span: Span, end: float):
+        duration_ms = (end - span.start) * 1000.0
+        thread = threading.current_thread()
+        record = {
+            'name': span.name,
+            'span_id': span.span_id,
+            'parent_id': span.parent_id,
+            'trace_id': span.trace_id,
+            'depth': span.depth,
+            'start_ms': round((span.start - self._epoch) * 1000.0, 3),
+            'duration_ms': round(duration_ms, 3),
+            'thread': thread.name,
+            'thread_id': thread.ident,
+            'attrs': span.attrs
+        }
+        with self._lock:
+            self._spans.append(record)
+            histogram = self._histograms.get(span.name)
+            if histogram is None:
+                histogram = self._histograms[span.name] = SpanHistogram()
+            histogram.add(duration_ms)
+
+    def get_spans(self, limit: int = 500, name: Optional[str] = None, trace_id: Optional[int] = None) -> List[Dict]:
+        """Most recent finished spans, oldest first."""
+        with self._lock:
+            spans = list(self._spans)
+        if name:
+            spans = [span for span in spans if span['name'] == name]
+        if trace_id is not None:
+            spans = [span for span in spans if span['trace_id'] == trace_id]
+        return spans[-limit:] if limit else spans
+
+    def get_histograms(self) -> Dict[str, Dict]:
+        with self._lock:
+            return {name: histogram.to_dict() for name, histogram in sorted(self._histograms.items())}
+
+    def export_chrome_trace(self) -> Dict:
+        """Buffered spans as Chrome trace-event JSON (complete 'X' events, one track per thread)."""
+        with self._lock:
+            spans = list(self._spans)
+        pid = os.getpid()
+        events = []
+        threads = {}
+        for span in spans:
+            threads.setdefault(span['thread_id'], span['thread'])
+            events.append({
+                'name': span['name'],
+                'cat': span['name'].split('.')[0],
+                'ph': 'X',
+                'ts': round(span['start_ms'] * 1000.0, 1),
+                'dur': round(span['duration_ms'] * 1000.0, 1),
+                'pid': pid,
+                'tid': span['thread_id'],
+                'args': dict(span['attrs'], span_id=span['span_id'], parent_id=span['parent_id'])
+            })
+        for thread_id, thread_name in threads.items():
+            events.append({'name': 'thread_name', 'ph': 'M', 'pid': pid, 'tid': thread_id,
+                           'args': {'name': thread_name}})
+        return {
+            'traceEvents': events,
+            'displayTimeUnit': 'ms',
+            'otherData': {'epoch_unix': self._epoch_wall, 'spans': len(spans)}
+        }
+
+    def clear(self):
+        with self._lock:
+            self._spans.clear()
+            self._histograms.clear()
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            return {'enabled': self.enabled, 'buffered_spans': len(self._spans),
+                    'buffer_size': self._spans.maxlen, 'span_names': len(self._histograms)}
+
+
+# Global tracer instance
+tracer = Tracer(
+    buffer_size=int(os.getenv('TRACE_BUFFER_SIZE', '4000')),
+    enabled=os.getenv('TRACING_ENABLED', 'true').lower() == 'true'
+)
@@ -0,0 +1,299 @@
+"""
+Background bulk prefetcher that fills the local translation caches.
+
+Walks the Bible structure in a planned order (verses reachable by time mode
+first), fetches missing verses from each translation's own providers with a
+bounded worker pool and per-host rate limits, and checkpoints its position so
+a restart resumes where it left off.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+# Time mode shows chapter = hour (1-24) and verse = minute (1-49)
+TIME_MODE_MAX_CHAPTER = 24
+TIME_MODE_MAX_VERSE = 49
+
+
+class HostRateLimiter:
+    """Spaces requests to each host at least min_interval seconds apart."""
+
+    def __init__(self, min_interval: float = 2.0, overrides: Optional[Dict[str, float]] = None):
+        self.min_interval = min_interval
+        self.overrides = overrides or {}
+        self._next_slot: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, host: str, stop_event: threading.Event) -> bool:
+        """Wait for the host's next request slot; returns False if stopped while waiting."""
+        interval = self.overrides.get(host, self.min_interval)
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + interval
+        delay = slot - time.monotonic()
+        if delay > 0:
+            return not stop_event.wait(delay)
+        return not stop_event.is_set()
+
+
+class TranslationPrefetcher:
+    """Fills translation caches in the background, time-mode verses first."""
+
+    def __init__(self, verse_manager, translations: List[str], max_workers: int = 2,
+                 host_interval: float = 2.0, checkpoint_path: str = 'data/translations/prefetch_checkpoint.json',
+                 checkpoint_every: int = 50, start_delay: float = 60.0):
+        self.logger = logging.getLogger(__name__)
+        self.verse_manager = verse_manager
+        self.translations = translations
+        self.max_workers = max(1, max_workers)
+        self.rate_limiter = HostRateLimiter(host_interval)
+        self.checkpoint_path = Path(checkpoint_path)
+        self.checkpoint_every = max(1, checkpoint_every)
+        self.start_delay = start_delay
+
+        self.plan = self._build_plan(verse_manager.bible_structure)
+        self.phases = [('time_mode', 0, self.time_mode_count), ('remaining', self.time_mode_count, len(self.plan))]
+
+        self.progress = self._load_checkpoint()
+        self.state = 'idle'
+        self.current = None
+        self.started_at = None
+        self.fetched_this_run = 0
+
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def _build_plan(self, bible_structure: Dict[str, Dict[str, int]]) -> List[Tuple[str, int, int]]:
+        """All verses, time-mode reachable (chapter 1-24, verse 1-49) first in clock order, then canonical order."""
+        time_mode = []
+        remaining = []
+        for book, chapters in bible_structure.items():
+            for chapter_str, verse_count in chapters.items():
+                chapter = int(chapter_str)
+                for verse in range(1, int(verse_count) + 1):
+                    if chapter <= TIME_MODE_MAX_CHAPTER and verse <= TIME_MODE_MAX_VERSE:
+                        time_mode.append((book, chapter, verse))
+                    else:
+                        remaining.append((book, chapter, verse))
+        # Clock order so every HH:MM slot gains coverage before any slot gets a second book
+        book_order = {book: index for index, book in enumerate(bible_structure)}
+        time_mode.sort(key=lambda item: (item[1], item[2], book_order[item[0]]))
+        self.time_mode_count = len(time_mode)
+        return time_mode + remaining
+
+    # === Checkpoints ===
+
+    def _load_checkpoint(self) -> Dict[str, Dict]:
+        progress = {}
+        try:
+            if self.checkpoint_path.exists():
+                with open(self.checkpoint_path, 'r') as f:
+                    progress = json.load(f).get('translations', {})
+        except Exception as e:
+            self.logger.warning(f"Ignoring unreadable prefetch checkpoint {self.checkpoint_path}: {e}")
+            progress = {}
+
+        for translation in self.translations:
+            entry = progress.setdefault(translation, {})
+            entry.setdefault('position', 0)
+            entry.setdefault('fetched', 0)
+            entry.setdefault('failed', 0)
+            entry.setdefault('completed_at', None)
+            # A finished pass with failures is retried from the start (cached verses are skipped cheaply)
+            if entry['completed_at'] and entry['failed']:
+                entry.update({'position': 0, 'failed': 0, 'completed_at': None})
+        return progress
+
+    def _save_checkpoint(self):
+        try:
+            with self._lock:
+                data = {'updated': datetime.now().isoformat(), 'translations': self.progress}
+                self.checkpoint_path.parent.mkdir(parents=True, exist_ok=True)
+                temp_path = self.checkpoint_path.with_suffix('.tmp')
+                with open(temp_path, 'w') as f:
+                    json.dump(data, f, indent=2)
+            os.replace(temp_path, self.checkpoint_path)
+        except Exception as e:
+            self.logger.warning(f"Failed to save prefetch checkpoint: {e}")
+
+    # === Lifecycle ===
+
+    def start(self):
+        """Start the prefetch thread (no-op if it is already running)."""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True, name='translation-prefetch')
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        """Stop after in-flight verses finish and write a checkpoint."""
+        self._stop.set()
+        if self._thread and self._thread.is_alive():
+            self._thread.join(timeout)
+
+    def is_running(self) -> bool:
+        return bool(self._thread and self._thread.is_alive())
+
+    def _run(self):
+        if self._stop.wait(self.start_delay):
+            return
+        self.state = 'running'
+        self.started_at = time.time()
+        self.logger.info(f"Translation prefetch started for {', '.join(t.upper() for t in self.translations)}")
+        try:
+            with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='prefetch-worker') as executor:
+                for phase_name, phase_start, phase_end in self.phases:
+                    for translation in self.translations:
+                        if self._stop.is_set():
+                            break
+                        entry = self.progress[translation]
+                        if entry['completed_at']:
+                            continue
+                        self._run_phase(executor, translation, phase_name, phase_start, phase_end)
+                        if phase_end == len(self.plan) and not self._stop.is_set():
+                            entry['completed_at'] = datetime.now().isoformat()
+                            self.logger.info(f"Translation prefetch finished {translation.upper()}: "
+                                             f"{entry['fetched']} fetched, {entry['failed']} failed")
+            self.state = 'stopped' if self._stop.is_set() else 'completed'
+        except Exception as e:
+            self.state = 'error'
+            self.logger.error(f"Translation prefetch failed: {e}")
+        finally:
+            self.current = None
+            self._save_checkpoint()
+
+    def _run_phase(self, executor: ThreadPoolExecutor, translation: str, phase_name: str,
+                   phase_start: int, phase_end: int):
+        """Fetch a translation's missing verses for one phase, resuming from the checkpoint."""
+        entry = self.progress[translation]
+        position = max(entry['position'], phase_start)
+        if position >= phase_end:
+            return
+
+        store = self.verse_manager.bible_store
+        in_flight = threading.BoundedSemaphore(self.max_workers * 2)
+        done = {}  # plan index -> attempted, used to advance the contiguous checkpoint position
+        since_checkpoint = 0
+        with self._lock:
+            entry['position'] = position
+
+        def on_done(future, index):
+            # Interrupted fetches (None) stay un-done so a restart retries them
+            if not future.cancelled() and future.exception() is None and future.result() is not None:
+                with self._lock:
+                    done[index] = True
+            in_flight.release()
+
+        def advance() -> int:
+            advanced = 0
+            with self._lock:
+                while entry['position'] < phase_end and done.pop(entry['position'], False):
+                    entry['position'] += 1
+                    advanced += 1
+            return advanced
+
+        for index in range(position, phase_end):
+            if self._stop.is_set():
+                break
+            book, chapter, verse = self.plan[index]
+            self.current = {'translation': translation, 'phase': phase_name, 'reference': f"{book} {chapter}:{verse}"}
+            if store.has(translation, book, chapter, verse):
+                with self._lock:
+                    done[index] = True
+            else:
+                in_flight.acquire()
+                future = executor.submit(self._fetch_verse, translation, book, chapter, verse)
+                future.add_done_callback(lambda future, index=index: on_done(future, index))
+
+            # Advance the checkpoint over the contiguous run of finished verses
+            since_checkpoint += advance()
+            if since_checkpoint >= self.checkpoint_every:
+                since_checkpoint = 0
+                self._save_checkpoint()
+
+        # Wait for this phase's in-flight verses before moving on
+        for _ in range(self.max_workers * 2):
+            in_flight.acquire()
+        for _ in range(self.max_workers * 2):
+            in_flight.release()
+        advance()
+        self._save_checkpoint()
+
+    def _fetch_verse(self, translation: str, book: str, chapter: int, verse: int) -> Optional[bool]:
+        """Try the translation's own sources in order and cache the text; None if interrupted by stop()."""
+        vm = self.verse_manager
+        candidates = vm.get_cache_fill_sources(book, chapter, verse, translation)
+        sources = vm.source_fetcher.order_sources(candidates)
+        while candidates and not sources:
+            # Every source's breaker is open: pause until the earliest cool-down ends instead of failing the verse
+            retry_in = vm.source_fetcher.next_retry_in([name for name, _ in candidates])
+            if self._stop.wait(max(retry_in, 0.5)):
+                return None
+            sources = vm.source_fetcher.order_sources(candidates)
+
+        launched = set()
+        try:
+            for api_source, fetch_func in sources:
+                if not self.rate_limiter.acquire(vm.get_source_host(api_source), self._stop):
+                    return None
+                launched.add(api_source)
+                start = time.monotonic()
+                try:
+                    result = fetch_func()
+                except Exception as e:
+                    vm.source_fetcher.record(api_source, False, time.monotonic() - start, str(e))
+                    continue
+                text = result.get('text') if result else None
+                vm.source_fetcher.record(api_source, bool(text), time.monotonic() - start, None if text else 'empty result')
+                if text:
+                    # Most fetchers cache on success; make sure the verse lands in the store either way
+                    if not vm.bible_store.has(translation, book, chapter, verse):
+                        vm._cache_translation_verse(book, chapter, verse, text, translation)
+                    with self._lock:
+                        self.progress[translation]['fetched'] += 1
+                        self.fetched_this_run += 1
+                    return True
+        finally:
+            # The breakers are shared with the display path; don't leave probe slots claimed by skipped sources
+            vm.source_fetcher.release_unlaunched(sources, launched)
+
+        with self._lock:
+            self.progress[translation]['failed'] += 1
+        self.logger.debug(f"Prefetch found no source for {translation.upper()} {book} {chapter}:{verse}")
+        return False
+
+    def get_progress(self) -> Dict:
+        """Prefetch state and per-translation progress through the plan."""
+        elapsed = time.time() - self.started_at if self.started_at else 0
+        with self._lock:
+            translations = {}
+            for translation in self.translations:
+                entry = self.progress[translation]
+                translations[translation] = {
+                    'position': entry['position'],
+                    'planned': len(self.plan),
+                    'plan_percentage': round(entry['position'] / len(self.plan) * 100.0, 1) if self.plan else 0.0,
+                    'time_mode_done': entry['position'] >= self.time_mode_count,
+                    'fetched': entry['fetched'],
+                    'failed': entry['failed'],
+                    'completed_at': entry['completed_at']
+                }
+            return {
+                'state': self.state,
+                'running': self.is_running(),
+                'current': self.current,
+                'time_mode_verses': self.time_mode_count,
+                'fetched_this_run': self.fetched_this_run,
+                'verses_per_minute': round(self.fetched_this_run / elapsed * 60.0, 1) if elapsed > 0 else 0.0,
+                'translations': translations
+            }
@@ -9,9 +9,19 @@ import logging
 from datetime import datetime, time, date, timedelta
 from pathlib import Path
 from typing import Dict, List, Optional
+from urllib.parse import urlsplit
 import os
 import calendar
+import threading
+from concurrent.futures import Future
 from error_log_manager import error_log_manager
+from event_log import event_log
+from bible_store import BibleStore
+from source_fetcher import HedgedFetcher
+from translation_prefetcher import TranslationPrefetcher
+from http_client import http_client
+from prometheus_metrics import translation_cache_lookups
+from tracing import tracer
 
 class VerseManager:
     def __init__(self):
@@ -37,6 +47,19 @@ class VerseManager:
         self.biblegateway_username = os.getenv('BIBLEGATEWAY_USERNAME', '')  # Bible Gateway username
         self.biblegateway_password = os.getenv('BIBLEGATEWAY_PASSWORD', '')  # Bible Gateway password
         self.biblegateway_token = None  # Will be obtained dynamically
+        # Base URLs are overridable so the fallback chain can be pointed at a local stub server
+        self.biblegateway_url = os.getenv('BIBLEGATEWAY_URL', 'https://www.biblegateway.com')
+        self.wldeh_api_url = os.getenv('WLDEH_API_URL', 'https://cdn.jsdelivr.net/gh/wldeh/bible-api')
+        
+        # Hedged concurrent fetcher for the translation fallback chains
+        self.source_fetcher = HedgedFetcher(
+            max_workers=int(os.getenv('FETCH_MAX_WORKERS', '4')),
+            hedge_delay=float(os.getenv('FETCH_HEDGE_DELAY', '2.0')),
+            timeout=float(os.getenv('FETCH_CHAIN_TIMEOUT', str(self.timeout + 5))),
+            failure_threshold=int(os.getenv('FETCH_BREAKER_THRESHOLD', '3')),
+            base_cooldown=float(os.getenv('FETCH_BREAKER_COOLDOWN', '30')),
+            max_cooldown=float(os.getenv('FETCH_BREAKER_MAX_COOLDOWN', '1800'))
+        )
         self.supported_translations = {
             # Primary translation - bible-api.com (free, no API key needed)
             'kjv': {'api': 'bible-api', 'code': 'kjv'},
@@ -81,6 +104,17 @@ class VerseManager:
         # Book summary pagination tracking
         self.current_book_summary = None  # Store current book summary for pagination
         self.book_summary_minute = None  # Track which minute the book summary started
+        self.book_summary_slots = {}  # 'YYYY-mm-dd HH:MM' -> summary, so a prefetched minute keeps its summary
+        
+        # Verse resolution can run ahead of time for the next minute (prefetch) on another thread
+        self._clock = threading.local()
+        self._resolve_lock = threading.RLock()  # Serialises resolution (it swaps translation settings)
+        self._slots_lock = threading.Lock()  # Guards the memo only, so lookups never wait on a fetch
+        self._verse_slots = {}  # (mode, slot, translations, time format) -> resolved verse, oldest first
+        self._slot_futures = {}  # Slot key -> Future of the resolution in flight for it
+        self._slots_generation = 0  # Bumped on invalidation so in-flight results for old settings are dropped
+        self.MAX_VERSE_SLOTS = 4  # Current and prefetched slots plus a little slack
+        self.NEWS_SLOT_SECONDS = 30  # News cycles articles within a minute
         
         self.statistics = {
             'verses_displayed': 0,
@@ -88,7 +122,7 @@ class VerseManager:
             'books_accessed': set(),
             'translation_usage': {},
             'translation_failures': {},  # Track failed translation attempts
-            'mode_usage': {'time': 0, 'date': 0, 'random': 0, 'devotional': 0, 'news': 0, 'parallel': 0},
+            'mode_usage': {'time': 0, 'date': 0, 'random': 0, 'devotional': 0, 'weather': 0, 'news': 0, 'parallel': 0},
             'daily_activity': {},  # Date -> count mapping for rotation
             # Enhanced statistics for detailed tracking
             'detailed_verse_history': [],  # List of {date, book, chapter, verse, translation, mode}
@@ -105,20 +139,30 @@ class VerseManager:
         # Load local data
         self._load_fallback_verses()
         self._load_book_summaries()
-        self._load_kjv_bible()
-        self._load_amp_bible()
+        self._load_bible_structure()
         self._load_all_translation_caches()
         self._load_biblical_calendar()
-        self._load_bible_structure()
         
         # All available Bible books (must be populated before completion calculation)
         self.available_books = []
         self._populate_available_books()
         
+        # Precomputed time-mode lookup (chapter:verse -> candidate books)
+        self._build_time_verse_table()
+        
         # Verse caching system for building complete translations
         self.translation_cache_enabled = True
-        self.translation_completion = self._calculate_all_translation_completion()
+        self.total_bible_verses = self._get_total_bible_verses()
+        # Counts come from the binary headers; translations without one are counted when first asked for
+        self._translation_completion = self._calculate_all_translation_completion()
         self.logger.info(f"Translation cache completion: {self._format_completion_summary()}")
+        
+        # New cache entries go to a journal; compact it into the translation files periodically
+        self.cache_compact_interval = int(os.getenv('TRANSLATION_CACHE_COMPACT_INTERVAL', '900'))
+        self._start_cache_compactor()
+        
+        # Background bulk-fill of the translation caches; started by the long-running service, not here
+        self.translation_prefetcher = None
     
     def _load_fallback_verses(self):
         """Load fallback verses from JSON file."""
@@ -142,61 +186,34 @@ class VerseManager:
             self.logger.error(f"Failed to load book summaries: {e}")
             self.book_summaries = {}
     
-    def _load_kjv_bible(self):
-        """Load complete KJV Bible for offline use."""
-        try:
-            kjv_path = Path('data/translations/bible_kjv.json')
-            with open(kjv_path, 'r') as f:
-                self.kjv_bible = json.load(f)
-            self.logger.info("Loaded complete KJV Bible")
-        except Exception as e:
-            self.logger.error(f"Failed to load KJV Bible: {e}")
-            self.kjv_bible = {}
-    
-    def _load_amp_bible(self):
-        """Load complete AMP Bible for offline use."""
-        try:
-            amp_path = Path('data/translations/bible_amp.json')
-            with open(amp_path, 'r') as f:
-                self.amp_bible = json.load(f)
-            self.logger.info("Loaded complete AMP Bible")
-        except Exception as e:
-            self.logger.warning(f"AMP Bible not found: {e}. Will use API or fallback methods.")
-            self.amp_bible = {}
+    def _get_translation_cache_path(self, translation: str) -> Path:
+        """Get the JSON file path for a cached translation."""
+        # Handle special case for NASB which uses nasb1995 file
+        file_name = 'nasb1995' if translation == 'nasb' else translation
+        return Path(f'data/translations/bible_{file_name}.json')
     
     def _load_all_translation_caches(self):
-        """Load all cached translation files."""
+        """Register all cached translation files (including KJV and AMP) with the Bible store."""
+        self.bible_store = BibleStore(self.bible_structure)
+        
         try:
-            # Initialize translation caches dictionary
-            self.translation_caches = {}
-            
             # List of supported translations that can be cached
             cacheable_translations = ['kjv', 'esv', 'amp', 'nlt', 'msg', 'nasb']
             
             for translation in cacheable_translations:
-                # Handle special case for NASB which uses nasb1995 file
-                file_name = translation
-                if translation == 'nasb':
-                    file_name = 'nasb1995'
-                
-                cache_path = Path(f'data/translations/bible_{file_name}.json')
-                try:
-                    if cache_path.exists():
-                        with open(cache_path, 'r') as f:
-                            self.translation_caches[translation] = json.load(f)
-                        self.logger.debug(f"Loaded {translation.upper()} translation cache from {file_name}")
-                    else:
-                        self.translation_caches[translation] = {}
-                        self.logger.debug(f"Initialized empty cache for {translation.upper()}")
-                except Exception as e:
-                    self.logger.warning(f"Failed to load {translation} cache: {e}")
-                    self.translation_caches[translation] = {}
-            
-            self.logger.info(f"Loaded translation caches for {len(self.translation_caches)} translations")
+                # Opened on first use: memory-mapped from .bin, or parsed from JSON and converted
+                cache_path = self._get_translation_cache_path(translation)
+                self.bible_store.register(translation, cache_path, cache_path.with_suffix('.bin'))
+            
+            self.logger.info(f"Registered translation caches for {len(self.bible_store.translations())} translations")
+            
+            # Replay verses cached since the last compaction
+            replayed = self.bible_store.open_journal(Path('data/translations/translation_cache.journal'))
+            if replayed:
+                self.logger.info(f"Replayed {replayed} journaled verses into translation caches")
             
         except Exception as e:
             self.logger.error(f"Failed to initialize translation caches: {e}")
-            self.translation_caches = {}
     
     def _load_biblical_calendar(self):
         """Load biblical events calendar."""
@@ -265,18 +282,10 @@ class VerseManager:
         books_with_chapter = []
         
         for book in self.available_books:
-            if self.kjv_bible and book in self.kjv_bible:
-                # Check local KJV data first
-                book_data = self.kjv_bible[book]
-                if str(chapter_num) in book_data:
-                    books_with_chapter.append(book)
-                # If not in local data, use estimates (local data is incomplete)
-                elif self._book_likely_has_chapter(book, chapter_num):
-                    books_with_chapter.append(book)
-            else:
-                # For books not in local data, make educated guesses
-                if self._book_likely_has_chapter(book, chapter_num):
-                    books_with_chapter.append(book)
+            # Check local KJV data first, then use estimates (local data is incomplete)
+            if (self.bible_store.has_chapter('kjv', book, chapter_num) or
+                    self._book_likely_has_chapter(book, chapter_num)):
+                books_with_chapter.append(book)
         
         return books_with_chapter
     
@@ -336,18 +345,66 @@ class VerseManager:
                     return book_data[str(chapter)]
         
         # Fallback: check local KJV data if available
-        if self.kjv_bible and book in self.kjv_bible:
-            chapter_data = self.kjv_bible[book].get(str(chapter), {})
-            if chapter_data:
-                available_verses = [int(v) for v in chapter_data.keys() if v.isdigit()]
-                if available_verses:
-                    return max(available_verses)
+        chapter_data = self.bible_store.chapter_verses('kjv', book, chapter)
+        if chapter_data:
+            return max(chapter_data)
         
         # No data found for this book/chapter
         return None
     
+    def _build_time_verse_table(self):
+        """Precompute candidate books for every chapter:verse reachable in time mode."""
+        self.book_order = {book: index for index, book in enumerate(self.available_books)}
+        self.books_by_chapter = {}
+        self.time_verse_table = {}
+        
+        try:
+            # Chapters 1-24 cover both 12h and 24h formats; minutes 1-49 map to verses
+            for chapter in range(1, 25):
+                self.books_by_chapter[chapter] = [
+                    book for book in self.available_books if self._book_has_chapter(book, chapter)
+                ]
+                for verse in range(1, 50):
+                    self.time_verse_table[(chapter, verse)] = self._scan_books_with_valid_verse(chapter, verse)
+            
+            self.logger.info(f"Built time verse table: {len(self.time_verse_table)} chapter:verse slots")
+        except Exception as e:
+            self.logger.error(f"Failed to build time verse table: {e}")
+            self.books_by_chapter = {}
+            self.time_verse_table = {}
+    
+    def _get_time_chapter(self, hour_24: int, time_format: str = None) -> int:
+        """Map an hour to a chapter number for the given time format."""
+        time_format = time_format or self.time_format
+        if time_format == '12':
+            # 00:XX (12:XX AM) and 12:XX (12:XX PM) = Chapter 12, 13:XX = Chapter 1, etc.
+            if hour_24 == 0:
+                return 12
+            return hour_24 if hour_24 <= 12 else hour_24 - 12
+        # 24-hour format: 00:XX = Chapter 24, 01:XX = Chapter 1, etc.
+        return hour_24 if hour_24 > 0 else 24
+    
+    def _select_time_verse_candidate(self, chapter: int, verse: int, now: datetime) -> Optional[Dict]:
+        """Pick the candidate book for a chapter:verse using time + day-of-year rotation."""
+        candidates = self._get_all_books_with_valid_verse(chapter, verse)
+        if not candidates:
+            return None
+        
+        # Candidates are sorted with exact matches first; prefer those when present
+        exact_count = sum(1 for candidate in candidates if candidate['exact_match'])
+        pool = candidates[:exact_count] if exact_count else candidates
+        day_offset = now.timetuple().tm_yday  # Day of year (1-365/366)
+        return pool[(now.hour + now.minute + day_offset) % len(pool)]
+    
     def _get_all_books_with_valid_verse(self, chapter: int, verse: int) -> List[Dict]:
         """Get all books that have a valid verse for the given chapter:verse, with actual verse numbers."""
+        cached = getattr(self, 'time_verse_table', {}).get((chapter, verse))
+        if cached is not None:
+            return cached
+        return self._scan_books_with_valid_verse(chapter, verse)
+    
+    def _scan_books_with_valid_verse(self, chapter: int, verse: int) -> List[Dict]:
+        """Scan all books for a valid chapter:verse (used to build the time verse table)."""
         candidate_books = []
         
         # Check all 66 Bible books systematically
@@ -366,7 +423,8 @@ class VerseManager:
                 })
         
         # Sort to prioritize exact matches, then by book order
-        candidate_books.sort(key=lambda x: (not x['exact_match'], self.available_books.index(x['book'])))
+        book_order = getattr(self, 'book_order', None) or {book: i for i, book in enumerate(self.available_books)}
+        candidate_books.sort(key=lambda x: (not x['exact_match'], book_order[x['book']]))
         
         return candidate_books
     
@@ -406,23 +464,109 @@ class VerseManager:
         ]
     
     def get_current_verse(self) -> Dict:
-        """Get verse based on current display mode."""
-        # Check if we need to reset daily counter
-        now = datetime.now()
-        if now.date() > self.daily_reset_time.date():
-            self.statistics['verses_today'] = 0
-            self.daily_reset_time = now.replace(hour=0, minute=0, second=0, microsecond=0)
-        
-        self.statistics['verses_displayed'] += 1
-        self.statistics['verses_today'] += 1
-        
-        # Track daily activity with rotation
-        today_str = now.strftime('%Y-%m-%d')
-        self.statistics['daily_activity'][today_str] = self.statistics['daily_activity'].get(today_str, 0) + 1
-        
-        # Rotate old daily activity data to prevent unbounded growth
-        self._rotate_daily_activity()
-        
+        """Resolve the verse for now and record it as displayed (prefer prepare_verse + commit_verse)."""
+        return self.commit_verse(self.prepare_verse(datetime.now()))
+    
+    def peek_verse(self, at: Optional[datetime] = None) -> Dict:
+        """Verse for the display slot at the given time without side effects (memoised per slot)."""
+        return self.prepare_verse(at or datetime.now())['verse_data']
+    
+    def prepare_verse(self, at: datetime) -> Dict:
+        """Resolve the verse for a (possibly future) time without recording statistics (memoised per slot)."""
+        owner = False
+        with self._slots_lock:
+            key, expires = self._get_slot_key(at)
+            entry = self._verse_slots.get(key)
+            if entry is None:
+                # One resolution per slot; concurrent callers for the same slot wait on its future
+                future = self._slot_futures.get(key)
+                if future is None:
+                    future = self._slot_futures[key] = Future()
+                    generation = self._slots_generation
+                    owner = True
+        
+        if entry is None and not owner:
+            entry = future.result()
+        elif entry is None:
+            try:
+                verse_data, resolved_translation, resolved_secondary_translation = self._resolve_verse(at)
+                entry = {
+                    'verse_data': verse_data,
+                    'translation': resolved_translation,
+                    'secondary_translation': resolved_secondary_translation,
+                    'expires': expires
+                }
+                future.set_result(entry)
+            except BaseException as e:
+                future.set_exception(e)
+                raise
+            finally:
+                with self._slots_lock:
+                    if self._slot_futures.get(key) is future:
+                        del self._slot_futures[key]
+                    if entry and entry['verse_data'] and generation == self._slots_generation:
+                        self._remember_slot(key, entry)
+        
+        # Callers (and the renderer) may annotate the dict, so the memoised copy stays untouched
+        return {
+            'at': at,
+            'verse_data': dict(entry['verse_data']) if entry['verse_data'] else entry['verse_data'],
+            'translation': entry['translation'],
+            'secondary_translation': entry['secondary_translation']
+        }
+    
+    def commit_verse(self, prepared: Dict) -> Dict:
+        """Record statistics for a prepared verse once its frame has been pushed to the display."""
+        self._record_verse_statistics(prepared['verse_data'], prepared['at'],
+                                      prepared['translation'], prepared['secondary_translation'])
+        return prepared['verse_data']
+    
+    def _get_slot_key(self, at: datetime) -> tuple:
+        """(mode, slot index, translation pair, time format) for a time, plus the slot's end as a timestamp."""
+        slot_seconds = self.NEWS_SLOT_SECONDS if self.display_mode == 'news' else 60
+        slot = int(at.timestamp()) // slot_seconds
+        secondary = getattr(self, 'secondary_translation', None) if self.parallel_mode else None
+        return (self.display_mode, slot, (self.translation, secondary), self.time_format), (slot + 1) * slot_seconds
+    
+    def _remember_slot(self, key: tuple, entry: Dict):
+        """Memoise a resolved slot, dropping expired slots and slots resolved with other settings (caller holds the slots lock)."""
+        now_ts = datetime.now().timestamp()
+        settings = (key[0],) + key[2:]
+        self._verse_slots = {
+            other_key: other for other_key, other in self._verse_slots.items()
+            if other['expires'] > now_ts and (other_key[0],) + other_key[2:] == settings
+        }
+        self._verse_slots[key] = entry
+        while len(self._verse_slots) > self.MAX_VERSE_SLOTS:
+            del self._verse_slots[next(iter(self._verse_slots))]
+    
+    def invalidate_verse_slots(self):
+        """Forget memoised verses (after settings or content changes that the slot key does not cover)."""
+        with self._slots_lock:
+            self._verse_slots = {}
+            self._slot_futures = {}
+            self._slots_generation += 1
+    
+    def get_settings_signature(self) -> tuple:
+        """Settings that decide which verse is resolved (used to validate prefetched verses)."""
+        return (self.display_mode, self.translation, getattr(self, 'secondary_translation', None),
+                self.parallel_mode, self.time_format)
+    
+    def _now(self) -> datetime:
+        """Current time, or the target time while resolving a prefetched verse."""
+        return getattr(self._clock, 'at', None) or datetime.now()
+    
+    def _resolve_verse(self, now: datetime):
+        """Resolve verse data for the given time; returns (verse_data, translation, secondary_translation)."""
+        with self._resolve_lock, tracer.span('verse.select', mode=self.display_mode):
+            self._clock.at = now
+            try:
+                return self._resolve_verse_locked(now)
+            finally:
+                self._clock.at = None
+    
+    def _resolve_verse_locked(self, now: datetime):
+        """Resolve verse data for the current display mode (caller holds the resolve lock)."""
         # Handle random translation selection
         original_translation = self.translation
         original_secondary_translation = getattr(self, 'secondary_translation', 'amp')
@@ -478,15 +622,40 @@ class VerseManager:
             
             # Add current_time for random mode to show actual time with verse
             if self.display_mode == 'random':
-                now = datetime.now()
                 hour_12 = now.hour % 12
                 if hour_12 == 0:
                     hour_12 = 12
                 verse_data['current_time'] = f"{hour_12:02d}:{now.minute:02d} {now.strftime('%p')}"
         
+        # IMPORTANT: Restore original translation settings for UI persistence
+        # This ensures that if the user selected "random", the UI dropdown stays on "random"
+        # instead of changing to whatever translation was randomly selected
+        self.translation = original_translation
+        if hasattr(self, 'secondary_translation'):
+            self.secondary_translation = original_secondary_translation
+        
+        return verse_data, resolved_translation, resolved_secondary_translation
+    
+    def _record_verse_statistics(self, verse_data: Dict, now: datetime, resolved_translation: str,
+                                 resolved_secondary_translation: str):
+        """Update usage statistics for a verse that is being displayed."""
+        # Check if we need to reset daily counter
+        if now.date() > self.daily_reset_time.date():
+            self.statistics['verses_today'] = 0
+            self.daily_reset_time = now.replace(hour=0, minute=0, second=0, microsecond=0)
+        
+        self.statistics['verses_displayed'] += 1
+        self.statistics['verses_today'] += 1
         
-        # Update statistics with rotation
-        self.statistics['mode_usage'][self.display_mode] += 1
+        # Track daily activity with rotation
+        today_str = now.strftime('%Y-%m-%d')
+        self.statistics['daily_activity'][today_str] = self.statistics['daily_activity'].get(today_str, 0) + 1
+        
+        # Rotate old daily activity data to prevent unbounded growth
+        self._rotate_daily_activity()
+        
+        # Update statistics with rotation (the only place mode usage is counted, so peeks never count)
+        self.statistics['mode_usage'][self.display_mode] = self.statistics['mode_usage'].get(self.display_mode, 0) + 1
         
         # Track parallel mode usage separately
         if self.parallel_mode and verse_data and verse_data.get('parallel_mode'):
@@ -514,15 +683,6 @@ class VerseManager:
         
         # Rotate enhanced statistics to prevent storage issues
         self._rotate_enhanced_statistics()
-        
-        # IMPORTANT: Restore original translation settings for UI persistence
-        # This ensures that if the user selected "random", the UI dropdown stays on "random"
-        # instead of changing to whatever translation was randomly selected
-        self.translation = original_translation
-        if hasattr(self, 'secondary_translation'):
-            self.secondary_translation = original_secondary_translation
-        
-        return verse_data
     
     def _get_devotional_verse(self) -> Dict:
         """Get devotional content using the devotional manager."""
@@ -565,7 +725,7 @@ class VerseManager:
     
     def _get_time_based_verse(self) -> Dict:
         """Time-based verse logic: HH:MM = Chapter:Verse, minute 00 = book summary."""
-        now = datetime.now()
+        now = self._now()
         hour_24 = now.hour
         minute = now.minute
         
@@ -579,23 +739,7 @@ class VerseManager:
             return self._get_random_book_summary()
         
         # Determine chapter based on time format setting
-        if self.time_format == '12':
-            # 12-hour format mapping:
-            # 00:XX (12:XX AM) = Chapter 12
-            # 01:XX (1:XX AM) = Chapter 1, 02:XX (2:XX AM) = Chapter 2, etc.
-            # 12:XX (12:XX PM) = Chapter 12  
-            # 13:XX (1:XX PM) = Chapter 1, 14:XX (2:XX PM) = Chapter 2, etc.
-            if hour_24 == 0:
-                chapter = 12  # 12:XX AM = Chapter 12
-            elif hour_24 <= 12:
-                chapter = hour_24  # 1:XX AM to 12:XX PM = Chapter 1-12
-            else:
-                chapter = hour_24 - 12  # 1:XX PM to 11:XX PM = Chapter 1-11
-        else:  # 24-hour format
-            # 24-hour format mapping:
-            # 00:XX = Chapter 24, 01:XX = Chapter 1, etc.
-            chapter = hour_24 if hour_24 > 0 else 24
-        
+        chapter = self._get_time_chapter(hour_24)
         verse = minute
         
         verse_data = self._get_verse_from_api(chapter, verse)
@@ -609,13 +753,12 @@ class VerseManager:
     
     def _get_time_based_summary_or_fallback(self, chapter: int, verse: int) -> Dict:
         """Get a time-based book summary when no exact verse exists, or fallback."""
-        now = datetime.now()
+        now = self._now()
         
         # Get books that have the requested chapter
-        books_with_chapter = []
-        for book in self.available_books:
-            if self._book_has_chapter(book, chapter):
-                books_with_chapter.append(book)
+        books_with_chapter = getattr(self, 'books_by_chapter', {}).get(chapter)
+        if books_with_chapter is None:
+            books_with_chapter = [book for book in self.available_books if self._book_has_chapter(book, chapter)]
         
         if books_with_chapter:
             # Select a book based on time + daily rotation for diversity
@@ -654,7 +797,7 @@ class VerseManager:
                 'summary': f'{book} is a book of the Bible containing wisdom and spiritual guidance.'
             }
         
-        now = datetime.now()
+        now = self._now()
         # Format time with leading zeros for hours
         if self.time_format == '12':
             hour_12 = now.hour % 12
@@ -681,7 +824,7 @@ class VerseManager:
     
     def _get_date_based_verse(self) -> Dict:
         """Get verse based on today's date and biblical events with enhanced hierarchical cycling."""
-        now = datetime.now()
+        now = self._now()
         today = now.date()
         
         # Calculate which event and verse to show based on 1-minute intervals for frequent cycling
@@ -797,7 +940,7 @@ class VerseManager:
     
     def _get_fallback_verse(self, match_type: str) -> Dict:
         """Get fallback verse for date mode with time display."""
-        now = datetime.now()
+        now = self._now()
         today = now.date()
         
         # Format current time for display
@@ -849,7 +992,7 @@ class VerseManager:
     
     def _get_random_verse(self) -> Dict:
         """Get a completely random verse with time display."""
-        now = datetime.now()
+        now = self._now()
         if self.time_format == '12':
             hour_12 = now.hour % 12
             if hour_12 == 0:
@@ -866,12 +1009,13 @@ class VerseManager:
     
     def _get_random_book_summary(self) -> Dict:
         """Get a random book summary, using cached summary for pagination within the same minute."""
-        now = datetime.now()
+        now = self._now()
         current_minute = now.minute
+        minute_key = now.strftime('%Y-%m-%d %H:%M')
         
         # Check if we need a new book summary (new minute or no cached summary)
-        if (self.current_book_summary is None or 
-            self.book_summary_minute != current_minute):
+        summary = self.book_summary_slots.get(minute_key)
+        if summary is None:
             
             # Generate new book summary
             if self.book_summaries:
@@ -890,15 +1034,18 @@ class VerseManager:
                     'summary': f'{book} is a book of the Bible containing wisdom and spiritual guidance.'
                 }
             
-            # Cache the book summary for this minute
-            self.current_book_summary = summary
-            self.book_summary_minute = current_minute
+            # Cache the book summary for this minute (keep the previous minute for prefetch overlap)
+            self.book_summary_slots[minute_key] = summary
+            while len(self.book_summary_slots) > 2:
+                del self.book_summary_slots[next(iter(self.book_summary_slots))]
             self.logger.debug(f"Generated new book summary for minute {current_minute}: {summary['title']}")
         else:
             # Use cached book summary
-            summary = self.current_book_summary
             self.logger.debug(f"Using cached book summary for minute {current_minute}: {summary['title']}")
         
+        self.current_book_summary = summary
+        self.book_summary_minute = current_minute
+        
         # For time-based display, the reference will show current time
         if self.time_format == '12':
             hour_12 = now.hour % 12
@@ -926,31 +1073,14 @@ class VerseManager:
             return None
         
         try:
-            # Get all books that have this chapter systematically
-            all_candidate_books = self._get_all_books_with_valid_verse(chapter, verse)
+            # Candidates are precomputed per chapter:verse in the time verse table
+            selected_book_data = self._select_time_verse_candidate(chapter, verse, self._now())
             
-            if not all_candidate_books:
+            if not selected_book_data:
                 self.logger.debug(f"No books found with valid verse {chapter}:{verse}")
                 return None
             
-            # Prioritize books with exact verse match, then use time-based selection
-            exact_match_books = [book for book in all_candidate_books if book['exact_match']]
-            
-            if exact_match_books:
-                # Use time + day-based selection for better diversity
-                now = datetime.now()
-                # Add day of year to create daily rotation while maintaining time correlation
-                day_offset = now.timetuple().tm_yday  # Day of year (1-365/366)
-                book_index = (now.hour + now.minute + day_offset) % len(exact_match_books)
-                selected_book_data = exact_match_books[book_index]
-                self.logger.debug(f"Selected exact match: {selected_book_data['book']} {chapter}:{selected_book_data['verse']} (day offset: {day_offset})")
-            else:
-                # Fall back to any valid book with daily rotation
-                now = datetime.now()
-                day_offset = now.timetuple().tm_yday  # Day of year (1-365/366)
-                book_index = (now.hour + now.minute + day_offset) % len(all_candidate_books)
-                selected_book_data = all_candidate_books[book_index]
-                self.logger.debug(f"Selected adjusted verse: {selected_book_data['book']} {chapter}:{selected_book_data['verse']} (requested {verse}, day offset: {day_offset})")
+            self.logger.debug(f"Selected {selected_book_data['book']} {chapter}:{selected_book_data['verse']} (requested {verse})")
             
             book = selected_book_data['book']
             actual_verse = selected_book_data['verse']
@@ -960,7 +1090,7 @@ class VerseManager:
             url += f"?translation={self.translation}"
             
             try:
-                response = requests.get(url, timeout=self.timeout)
+                response = http_client.get(url, timeout=self.timeout, retries=0)
                 response.raise_for_status()
                 
                 data = response.json()
@@ -1000,7 +1130,7 @@ class VerseManager:
                 return None
             
             # Use daily rotation for consistent but diverse selection
-            now = datetime.now()
+            now = self._now()
             day_offset = now.timetuple().tm_yday  # Day of year for daily rotation
             # Sort books consistently, then rotate based on time + day
             books_with_chapter = sorted(books_with_chapter)
@@ -1008,9 +1138,7 @@ class VerseManager:
             books_with_chapter = books_with_chapter[rotation_offset:] + books_with_chapter[:rotation_offset]
             
             for book in books_with_chapter:
-                book_data = self.kjv_bible.get(book, {})
-                chapter_data = book_data.get(str(chapter), {})
-                verse_text = chapter_data.get(str(verse))
+                verse_text = self.bible_store.get('kjv', book, chapter, verse)
                 
                 if verse_text:
                     return {
@@ -1023,12 +1151,11 @@ class VerseManager:
             
             # If exact verse not found, try to find a verse in the chapter
             for book in books_with_chapter:
-                book_data = self.kjv_bible.get(book, {})
-                chapter_data = book_data.get(str(chapter), {})
+                chapter_data = self.bible_store.chapter_verses('kjv', book, chapter)
                 
                 if chapter_data:
                     # Get the highest verse number available in this chapter
-                    available_verses = [int(v) for v in chapter_data.keys() if v.isdigit()]
+                    available_verses = list(chapter_data.keys())
                     if available_verses:
                         # Use the verse number closest to what we want, but not exceeding it
                         suitable_verses = [v for v in available_verses if v <= verse]
@@ -1037,7 +1164,7 @@ class VerseManager:
                         else:
                             actual_verse = min(available_verses)
                         
-                        verse_text = chapter_data[str(actual_verse)]
+                        verse_text = chapter_data[actual_verse]
                         
                         return {
                             'reference': f"{book} {chapter:02d}:{actual_verse:02d}",
@@ -1184,6 +1311,7 @@ class VerseManager:
         """Set display mode."""
         if mode in ['time', 'date', 'random', 'devotional', 'weather', 'news']:
             self.display_mode = mode
+            self.invalidate_verse_slots()
             self.logger.info(f"Display mode changed to: {mode}")
         else:
             raise ValueError(f"Invalid display mode: {mode}")
@@ -1287,6 +1415,54 @@ class VerseManager:
             self.logger.warning(f"Unsupported translation: {translation}, falling back to KJV")
             translation = 'kjv'
         
+        # Get the fallback chain for this translation
+        chain = self._get_fallback_chain(translation)
+        
+        # Local cache is instant - check it before touching the network
+        remote_chain = []
+        for api_source, source_code in chain:
+            if api_source == 'local_cache':
+                result = self._fetch_from_local_cache(book, chapter, verse, source_code)
+                if result and result.get('text'):
+                    return self._annotate_source_result(result, api_source, source_code, translation)
+            else:
+                remote_chain.append((api_source, source_code))
+        
+        # Same-translation sources are raced with hedging; cross-translation fallbacks only run if they all fail
+        primary_sources = []
+        primary_codes = {}
+        fallback_sources = []
+        for api_source, source_code in remote_chain:
+            fetch_func = self._get_source_fetch_function(api_source, book, chapter, verse, source_code)
+            if not fetch_func:
+                continue
+            if self._is_same_translation(translation, source_code):
+                primary_sources.append((api_source, fetch_func))
+                primary_codes[api_source] = source_code
+            else:
+                fallback_sources.append((api_source, fetch_func, source_code))
+        
+        api_source, result = self.source_fetcher.fetch(primary_sources)
+        if result:
+            return self._annotate_source_result(result, api_source, primary_codes.get(api_source), translation)
+        
+        for api_source, fetch_func, source_code in fallback_sources:
+            _, result = self.source_fetcher.fetch([(api_source, fetch_func)])
+            if result:
+                return self._annotate_source_result(result, api_source, source_code, translation)
+        
+        # Final fallback to default verses
+        self.logger.warning(f"All API sources failed for {translation} {book} {chapter}:{verse}")
+        
+        # Track translation failures for statistics
+        if 'translation_failures' not in self.statistics:
+            self.statistics['translation_failures'] = {}
+        self.statistics['translation_failures'][translation] = self.statistics['translation_failures'].get(translation, 0) + 1
+        
+        return self._get_final_fallback_verse(book, chapter, verse, translation)
+    
+    def _get_fallback_chain(self, translation: str) -> List[tuple]:
+        """Ordered (api_source, source_code) chain used to fetch a translation."""
         # Define optimized hierarchical fallback chains for each translation
         fallback_chains = {
             # Primary translation - highest reliability (bible-api.com)
@@ -1344,83 +1520,87 @@ class VerseManager:
             ]
         }
         
-        # Get the fallback chain for this translation
-        chain = fallback_chains.get(translation, [('bible-api', 'kjv')])
-        
-        for api_source, source_code in chain:
-            try:
-                result = None
-                
-                if api_source == 'local_cache':
-                    result = self._fetch_from_local_cache(book, chapter, verse, source_code)
-                elif api_source == 'local_amp':  # Legacy support
-                    result = self._fetch_from_local_amp(book, chapter, verse)
-                elif api_source == 'local_kjv':  # Legacy support
-                    result = self._fetch_from_local_kjv(book, chapter, verse)
-                elif api_source == 'youversion':
-                    result = self._fetch_from_youversion(book, chapter, verse, source_code)
-                elif api_source == 'web_scraping':
-                    result = self._fetch_from_web_scraping(book, chapter, verse, source_code)
-                elif api_source == 'bible_scraper':
-                    result = self._fetch_from_bible_scraper(book, chapter, verse, source_code)
-                elif api_source == 'wldeh_api':
-                    result = self._fetch_from_wldeh_api(book, chapter, verse, source_code)
-                elif api_source == 'bible-api':
-                    result = self._fetch_from_bible_api(book, chapter, verse, source_code)
-                elif api_source == 'esv_api':
-                    result = self._fetch_from_esv_api(book, chapter, verse)
-                elif api_source == 'scripture_api':
-                    result = self._fetch_from_scripture_api(book, chapter, verse, source_code)
-                elif api_source == 'biblegateway':
-                    result = self._fetch_from_biblegateway_api(book, chapter, verse, source_code)
-                    
-                if result and result.get('text'):
-                    # Add source information for debugging
-                    result['api_source'] = api_source
-                    result['source_translation'] = source_code or translation
-                    
-                    # Add fallback notation if not the original translation
-                    # Special case: treat NASB and NASB1995 as equivalent
-                    is_nasb_equivalent = (
-                        (translation.lower() == 'nasb' and source_code.lower() == 'nasb1995') or
-                        (translation.lower() == 'nasb1995' and source_code.lower() == 'nasb')
-                    )
-                    
-                    if source_code and source_code.lower() != translation.lower() and not is_nasb_equivalent:
-                        result['text'] = f"[{translation.upper()} unavailable - showing {source_code.upper()}] {result['text']}"
-                        result['translation'] = f"{translation.upper()} (fallback: {source_code.upper()})"
-                    else:
-                        result['translation'] = translation.upper()
-                    
-                    self.logger.info(f"Successfully fetched {source_code or translation} verse from {api_source}")
-                    return result
-                    
-            except Exception as e:
-                self.logger.debug(f"Failed to fetch from {api_source} for {translation}: {e}")
+        return fallback_chains.get(translation, [('bible-api', 'kjv')])
+    
+    def get_cache_fill_sources(self, book: str, chapter: int, verse: int, translation: str) -> List[tuple]:
+        """Remote (api_source, fetch_func) pairs that return this exact translation, in priority order."""
+        sources = []
+        for api_source, source_code in self._get_fallback_chain(translation):
+            if api_source == 'local_cache' or not self._is_same_translation(translation, source_code):
                 continue
+            fetch_func = self._get_source_fetch_function(api_source, book, chapter, verse, source_code)
+            if fetch_func:
+                sources.append((api_source, fetch_func))
+        return sources
+    
+    def get_source_host(self, api_source: str) -> str:
+        """Host a source sends its requests to (used for per-host rate limiting)."""
+        hosts = {
+            'web_scraping': urlsplit(self.biblegateway_url).netloc,
+            'biblegateway': 'api.biblegateway.com',
+            'bible_scraper': 'www.bible.com',
+            'youversion': 'api.bibleapi.net',
+            'esv_api': 'api.esv.org',
+            'scripture_api': 'api.scripture.api.bible',
+            'bible-api': urlsplit(self.api_url).netloc,
+            'wldeh_api': urlsplit(self.wldeh_api_url).netloc,
+        }
+        return hosts.get(api_source, api_source)
+    
+    def _get_source_fetch_function(self, api_source: str, book: str, chapter: int, verse: int, source_code: str):
+        """Map a fallback chain entry to a zero-argument fetch callable."""
+        fetchers = {
+            'local_cache': lambda: self._fetch_from_local_cache(book, chapter, verse, source_code),
+            'local_amp': lambda: self._fetch_from_local_amp(book, chapter, verse),  # Legacy support
+            'local_kjv': lambda: self._fetch_from_local_kjv(book, chapter, verse),  # Legacy support
+            'youversion': lambda: self._fetch_from_youversion(book, chapter, verse, source_code),
+            'web_scraping': lambda: self._fetch_from_web_scraping(book, chapter, verse, source_code),
+            'bible_scraper': lambda: self._fetch_from_bible_scraper(book, chapter, verse, source_code),
+            'wldeh_api': lambda: self._fetch_from_wldeh_api(book, chapter, verse, source_code),
+            'bible-api': lambda: self._fetch_from_bible_api(book, chapter, verse, source_code),
+            'esv_api': lambda: self._fetch_from_esv_api(book, chapter, verse),
+            'scripture_api': lambda: self._fetch_from_scripture_api(book, chapter, verse, source_code),
+            'biblegateway': lambda: self._fetch_from_biblegateway_api(book, chapter, verse, source_code),
+        }
+        return fetchers.get(api_source)
+    
+    def _is_same_translation(self, translation: str, source_code: Optional[str]) -> bool:
+        """Check whether a chain entry serves the requested translation (NASB and NASB1995 are equivalent)."""
+        if not source_code:
+            return True
+        codes = {translation.lower(), source_code.lower()}
+        return len(codes) == 1 or codes == {'nasb', 'nasb1995'}
+    
+    def _annotate_source_result(self, result: Dict, api_source: str, source_code: Optional[str], translation: str) -> Dict:
+        """Add source information and fallback notation to a fetched verse."""
+        # Add source information for debugging
+        result['api_source'] = api_source
+        result['source_translation'] = source_code or translation
+        
+        # Add fallback notation if not the original translation
+        if not self._is_same_translation(translation, source_code):
+            result['text'] = f"[{translation.upper()} unavailable - showing {source_code.upper()}] {result['text']}"
+            result['translation'] = f"{translation.upper()} (fallback: {source_code.upper()})"
+        else:
+            result['translation'] = translation.upper()
         
-        # Final fallback to default verses
-        self.logger.warning(f"All API sources failed for {translation} {book} {chapter}:{verse}")
-        
-        # Track translation failures for statistics
-        if 'translation_failures' not in self.statistics:
-            self.statistics['translation_failures'] = {}
-        self.statistics['translation_failures'][translation] = self.statistics['translation_failures'].get(translation, 0) + 1
-        
-        return self._get_final_fallback_verse(book, chapter, verse, translation)
+        self.logger.info(f"Successfully fetched {source_code or translation} verse from {api_source}")
+        return result
+    
+    def get_source_stats(self) -> Dict[str, Dict]:
+        """Per-source fetch latency, success rate and circuit breaker state."""
+        return self.source_fetcher.get_stats()
     
     def _fetch_from_local_amp(self, book: str, chapter: int, verse: int) -> Optional[Dict]:
         """Fetch verse from local AMP Bible file (limited sample data only)."""
-        if not hasattr(self, 'amp_bible') or not self.amp_bible:
+        if not self.bible_store.count('amp'):
             self.logger.debug("No local AMP Bible data available")
             return None
             
         try:
-            if (book in self.amp_bible and 
-                str(chapter) in self.amp_bible[book] and 
-                str(verse) in self.amp_bible[book][str(chapter)]):
-                
-                amp_text = self.amp_bible[book][str(chapter)][str(verse)]
+            amp_text = self.bible_store.get('amp', book, chapter, verse)
+            translation_cache_lookups.inc(translation='amp', result='hit' if amp_text else 'miss')
+            if amp_text:
                 self.logger.info(f"Found AMP verse in limited local data: {book} {chapter}:{verse}")
                 return {
                     'reference': f"{book} {chapter:02d}:{verse:02d}",
@@ -1440,15 +1620,13 @@ class VerseManager:
     
     def _fetch_from_local_kjv(self, book: str, chapter: int, verse: int) -> Optional[Dict]:
         """Fetch verse from local KJV Bible file."""
-        if not hasattr(self, 'kjv_bible') or not self.kjv_bible:
+        if not self.bible_store.count('kjv'):
             return None
             
         try:
-            if (book in self.kjv_bible and 
-                str(chapter) in self.kjv_bible[book] and 
-                str(verse) in self.kjv_bible[book][str(chapter)]):
-                
-                kjv_text = self.kjv_bible[book][str(chapter)][str(verse)]
+            kjv_text = self.bible_store.get('kjv', book, chapter, verse)
+            translation_cache_lookups.inc(translation='kjv', result='hit' if kjv_text else 'miss')
+            if kjv_text:
                 return {
                     'reference': f"{book} {chapter:02d}:{verse:02d}",
                     'text': kjv_text,
@@ -1514,8 +1692,6 @@ class VerseManager:
     def _fetch_from_wldeh_api(self, book: str, chapter: int, verse: int, translation_code: str) -> Optional[Dict]:
         """Fetch verse from wldeh bible-api (free GitHub-hosted API with 200+ versions)."""
         try:
-            import requests
-            
             # Book name mapping for the wldeh API
             book_mapping = {
                 'Genesis': 'GEN', 'Exodus': 'EXO', 'Leviticus': 'LEV', 'Numbers': 'NUM',
@@ -1548,9 +1724,9 @@ class VerseManager:
             
             api_translation = wldeh_translation_map.get(translation_code.lower(), 'engWEB2019eb')
             
-            url = f"https://cdn.jsdelivr.net/gh/wldeh/bible-api/bibles/{api_translation}/books/{book_code}/chapters/{chapter}/verses/{verse}.json"
+            url = f"{self.wldeh_api_url}/bibles/{api_translation}/books/{book_code}/chapters/{chapter}/verses/{verse}.json"
             
-            response = requests.get(url, timeout=self.timeout)
+            response = http_client.get(url, timeout=self.timeout, retries=0)
             response.raise_for_status()
             
             data = response.json()
@@ -1749,7 +1925,7 @@ getVerse();
         # Always add translation parameter - bible-api.com default is NOT KJV
         url += f"?translation={translation_code}"
         
-        response = requests.get(url, timeout=self.timeout)
+        response = http_client.get(url, timeout=self.timeout, retries=0)
         response.raise_for_status()
         
         data = response.json()
@@ -1790,7 +1966,7 @@ getVerse();
             'include-passage-references': False
         }
         
-        response = requests.get(url, headers=headers, params=params, timeout=self.timeout)
+        response = http_client.get(url, headers=headers, params=params, timeout=self.timeout, retries=0)
         response.raise_for_status()
         
         data = response.json()
@@ -1817,10 +1993,10 @@ getVerse();
     def _fetch_from_scripture_api(self, book: str, chapter: int, verse: int, bible_id: str) -> Optional[Dict]:
         """Fetch verse from local AMP Bible or scripture.api.bible."""
         # First, try to get verse from local AMP Bible
-        if hasattr(self, 'amp_bible') and self.amp_bible:
+        if self.bible_store.count('amp'):
             try:
-                if book in self.amp_bible and str(chapter) in self.amp_bible[book] and str(verse) in self.amp_bible[book][str(chapter)]:
-                    amp_text = self.amp_bible[book][str(chapter)][str(verse)]
+                amp_text = self.bible_store.get('amp', book, chapter, verse)
+                if amp_text:
                     return {
                         'reference': f"{book} {chapter:02d}:{verse:02d}",
                         'text': amp_text,
@@ -1864,7 +2040,7 @@ getVerse();
             'include-verse-numbers': 'false'
         }
         
-        response = requests.get(url, headers=headers, params=params, timeout=self.timeout)
+        response = http_client.get(url, headers=headers, params=params, timeout=self.timeout, retries=0)
         response.raise_for_status()
         
         data = response.json()
@@ -1903,7 +2079,7 @@ getVerse();
                 'translation-list': translation_code
             }
             
-            response = requests.get(url, params=params, timeout=self.timeout)
+            response = http_client.get(url, params=params, timeout=self.timeout, retries=0)
             response.raise_for_status()
             
             data = response.json()
@@ -1943,7 +2119,7 @@ getVerse();
                 'password': self.biblegateway_password
             }
             
-            response = requests.get(url, params=params, timeout=self.timeout)
+            response = http_client.get(url, params=params, timeout=self.timeout, retries=0)
             response.raise_for_status()
             
             data = response.json()
@@ -1962,7 +2138,6 @@ getVerse();
     def _fetch_from_web_scraping(self, book: str, chapter: int, verse: int, translation_code: str) -> Optional[Dict]:
         """Fetch verse by scraping Bible websites directly."""
         try:
-            import requests
             try:
                 from bs4 import BeautifulSoup
                 has_bs4 = True
@@ -1973,7 +2148,7 @@ getVerse();
             
             # BibleGateway URL format for direct verse lookup
             verse_ref = f"{book} {chapter}:{verse}"
-            url = f"https://www.biblegateway.com/passage/?search={verse_ref}&version={translation_code}"
+            url = f"{self.biblegateway_url}/passage/?search={verse_ref}&version={translation_code}"
             
             # Log the attempt
             self.logger.info(f"Attempting web scraping for {verse_ref} {translation_code}")
@@ -1982,7 +2157,7 @@ getVerse();
                 'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
             }
             
-            response = requests.get(url, headers=headers, timeout=self.timeout)
+            response = http_client.get(url, headers=headers, timeout=self.timeout, retries=0)
             response.raise_for_status()
             
             verse_text = None
@@ -2109,7 +2284,7 @@ getVerse();
             # First, we need to find the Bible ID for AMP translation
             # This is a simplified approach - in practice you'd cache these IDs
             bibles_url = f"{base_url}/bibles"
-            response = requests.get(bibles_url, headers=headers, timeout=self.timeout)
+            response = http_client.get(bibles_url, headers=headers, timeout=self.timeout, retries=0)
             response.raise_for_status()
             
             bibles_data = response.json()
@@ -2144,7 +2319,7 @@ getVerse();
                 'include-verse-numbers': 'false'
             }
             
-            response = requests.get(verse_url, headers=headers, params=params, timeout=self.timeout)
+            response = http_client.get(verse_url, headers=headers, params=params, timeout=self.timeout, retries=0)
             response.raise_for_status()
             
             data = response.json()
@@ -2316,28 +2491,25 @@ getVerse();
 
     def _fetch_from_local_cache(self, book: str, chapter: int, verse: int, translation: str) -> Optional[Dict]:
         """Fetch verse from local translation cache."""
-        if not hasattr(self, 'translation_caches') or translation not in self.translation_caches:
+        if not hasattr(self, 'bible_store') or translation not in self.bible_store:
             self.logger.debug(f"No local cache available for {translation}")
+            translation_cache_lookups.inc(translation=translation, result='miss')
             return None
             
         try:
-            cache = self.translation_caches[translation]
-            if (book in cache and 
-                str(chapter) in cache[book] and 
-                str(verse) in cache[book][str(chapter)]):
-                
-                verse_text = cache[book][str(chapter)][str(verse)]
-                if verse_text and verse_text.strip():
-                    self.logger.debug(f"Found {translation.upper()} verse in local cache: {book} {chapter}:{verse}")
-                    return {
-                        'reference': f"{book} {chapter:02d}:{verse:02d}",
-                        'text': verse_text.strip(),
-                        'book': book,
-                        'chapter': chapter,
-                        'verse': verse,
-                        'translation': translation.upper(),
-                        'source_note': 'Local cache'
-                    }
+            verse_text = self.bible_store.get(translation, book, chapter, verse)
+            translation_cache_lookups.inc(translation=translation, result='hit' if verse_text else 'miss')
+            if verse_text:
+                self.logger.debug(f"Found {translation.upper()} verse in local cache: {book} {chapter}:{verse}")
+                return {
+                    'reference': f"{book} {chapter:02d}:{verse:02d}",
+                    'text': verse_text,
+                    'book': book,
+                    'chapter': chapter,
+                    'verse': verse,
+                    'translation': translation.upper(),
+                    'source_note': 'Local cache'
+                }
             else:
                 self.logger.debug(f"{translation.upper()} verse not in local cache: {book} {chapter}:{verse}")
                 
@@ -2355,34 +2527,19 @@ getVerse();
         if normalized_translation == 'nasb1995':
             normalized_translation = 'nasb'  # Map nasb1995 to nasb for consistency
         
-        if not hasattr(self, 'translation_caches'):
-            self.translation_caches = {}
-        
-        if normalized_translation not in self.translation_caches:
-            self.translation_caches[normalized_translation] = {}
-        
         try:
-            # Ensure the structure exists
-            cache = self.translation_caches[normalized_translation]
-            if book not in cache:
-                cache[book] = {}
-            if str(chapter) not in cache[book]:
-                cache[book][str(chapter)] = {}
-            
             # Only cache if we don't already have this verse
-            if str(verse) not in cache[book][str(chapter)]:
-                cache[book][str(chapter)][str(verse)] = text.strip()
+            if self.bible_store.put(normalized_translation, book, chapter, verse, text):
                 
                 # Track daily cache additions
                 self._increment_daily_cache_count()
                 
-                # Save to file immediately (to persist across restarts)
-                self._save_translation_cache(normalized_translation)
+                # The store journals the verse; the compactor folds it into the files later
                 
-                # Update completion percentage
-                old_completion = self.translation_completion.get(normalized_translation, 0.0)
-                self.translation_completion = self._calculate_all_translation_completion()
-                new_completion = self.translation_completion.get(normalized_translation, 0.0)
+                # Update completion percentage for this translation only
+                old_completion = self._translation_completion.get(normalized_translation, 0.0)
+                new_completion = self._get_translation_completion(normalized_translation)
+                self._translation_completion[normalized_translation] = new_completion
                 
                 if new_completion > old_completion:
                     self.logger.info(f"{translation.upper()} Bible cache updated: {book} {chapter}:{verse} - "
@@ -2394,48 +2551,102 @@ getVerse();
         
         return False
     
-    def _save_translation_cache(self, translation: str):
-        """Save a specific translation cache to file."""
+    def compact_translation_cache(self) -> List[str]:
+        """Fold journaled cache additions into the translation files."""
         try:
-            # Handle special case for NASB which uses nasb1995 file
-            file_name = translation
-            if translation == 'nasb':
-                file_name = 'nasb1995'
-            
-            cache_path = Path(f'data/translations/bible_{file_name}.json')
-            cache_path.parent.mkdir(parents=True, exist_ok=True)
-            
-            with open(cache_path, 'w') as f:
-                json.dump(self.translation_caches[translation], f, indent=2)
-            
+            compacted = self.bible_store.compact()
+            if compacted:
+                self.logger.info(f"Compacted translation caches: {', '.join(t.upper() for t in compacted)}")
+            return compacted
+        except Exception as e:
+            self.logger.error(f"Failed to compact translation caches: {e}")
+            error_log_manager.log_error('verse_manager', 'cache_compaction_failure',
+                                      f"Failed to compact translation caches: {e}", exception=e)
+            return []
+    
+    def _start_cache_compactor(self):
+        """Start the background thread that periodically compacts the translation cache journal."""
+        self._compactor_stop = threading.Event()
+        
+        def compactor_loop():
+            while not self._compactor_stop.wait(self.cache_compact_interval):
+                if self.bible_store.dirty_translations():
+                    self.compact_translation_cache()
+        
+        self._compactor_thread = threading.Thread(target=compactor_loop, daemon=True, name='cache-compactor')
+        self._compactor_thread.start()
+    
+    def start_translation_prefetcher(self):
+        """Start the rate-limited background job that fills missing translation verses (TRANSLATION_PREFETCH_ENABLED)."""
+        if self.translation_prefetcher or os.getenv('TRANSLATION_PREFETCH_ENABLED', 'true').lower() != 'true':
+            return
+        try:
+            translations = [t.strip().lower() for t in os.getenv('TRANSLATION_PREFETCH_TRANSLATIONS', 'amp,nlt,esv,msg,nasb').split(',')
+                            if t.strip().lower() in self.bible_store]
+            if not translations or not self.bible_structure:
+                return
+            self.translation_prefetcher = TranslationPrefetcher(
+                self,
+                translations,
+                max_workers=int(os.getenv('TRANSLATION_PREFETCH_WORKERS', '2')),
+                host_interval=float(os.getenv('TRANSLATION_PREFETCH_HOST_INTERVAL', '3.0')),
+                checkpoint_path=os.getenv('TRANSLATION_PREFETCH_CHECKPOINT', 'data/translations/prefetch_checkpoint.json'),
+                start_delay=float(os.getenv('TRANSLATION_PREFETCH_START_DELAY', '60'))
+            )
+            self.translation_prefetcher.start()
         except Exception as e:
-            self.logger.error(f"Failed to save {translation} cache: {e}")
+            self.logger.error(f"Failed to start translation prefetcher: {e}")
+            self.translation_prefetcher = None
+    
+    def get_translation_prefetch_progress(self) -> Optional[Dict]:
+        """Progress of the background translation prefetch, or None if it is disabled."""
+        if not self.translation_prefetcher:
+            return None
+        return self.translation_prefetcher.get_progress()
+    
+    def stop_translation_prefetcher(self):
+        """Stop the background translation prefetch if it is running."""
+        prefetcher, self.translation_prefetcher = self.translation_prefetcher, None
+        if prefetcher:
+            prefetcher.stop()
+    
+    def shutdown(self):
+        """Stop background work and flush the translation cache journal."""
+        self.stop_translation_prefetcher()
+        if hasattr(self, '_compactor_stop'):
+            self._compactor_stop.set()
+        self.compact_translation_cache()
+        self.bible_store.close()
+        self.source_fetcher.shutdown()
+    
+    def _get_translation_completion(self, translation: str) -> float:
+        """Completion percentage for one translation from the store's running count."""
+        total_verses = self.total_bible_verses
+        return (self.bible_store.count(translation) / total_verses * 100.0) if total_verses > 0 else 0.0
     
     def _calculate_all_translation_completion(self) -> Dict[str, float]:
-        """Calculate completion percentage for all translations."""
-        if not self.bible_structure or not hasattr(self, 'translation_caches'):
+        """Completion percentage for every translation whose count is known without opening it."""
+        if not self.bible_structure or not hasattr(self, 'bible_store'):
             return {}
         
         completion = {}
-        total_verses = self._get_total_bible_verses()
-        
-        for translation in self.translation_caches:
-            cached_verses = 0
-            cache = self.translation_caches[translation]
-            
-            # Count cached verses for this translation
-            for book in self.available_books:
-                if book in cache:
-                    for chapter_str in cache[book]:
-                        chapter_data = cache[book][chapter_str]
-                        for verse_str, verse_text in chapter_data.items():
-                            if verse_text and verse_text.strip():
-                                cached_verses += 1
-            
-            completion[translation] = (cached_verses / total_verses * 100.0) if total_verses > 0 else 0.0
+        total_verses = self.total_bible_verses
+        for translation in self.bible_store.translations():
+            count = self.bible_store.peek_count(translation)
+            if count is not None:
+                completion[translation] = (count / total_verses * 100.0) if total_verses > 0 else 0.0
         
         return completion
     
+    @property
+    def translation_completion(self) -> Dict[str, float]:
+        """Completion percentage per translation (translations not counted yet are opened on this first request)."""
+        if self.bible_structure:
+            for translation in self.bible_store.translations():
+                if translation not in self._translation_completion:
+                    self._translation_completion[translation] = self._get_translation_completion(translation)
+        return dict(self._translation_completion)
+    
     def _get_total_bible_verses(self) -> int:
         """Get total number of verses in the complete Bible."""
         if not self.bible_structure:
@@ -2450,11 +2661,11 @@ getVerse();
     
     def _format_completion_summary(self) -> str:
         """Format a summary of translation completion percentages."""
-        if not hasattr(self, 'translation_completion'):
+        if not hasattr(self, '_translation_completion'):
             return "0 translations cached"
         
         completed = [f"{trans.upper()}: {pct:.1f}%" 
-                    for trans, pct in self.translation_completion.items() 
+                    for trans, pct in self._translation_completion.items() 
                     if pct > 0]
         
         if not completed:
@@ -2465,32 +2676,14 @@ getVerse();
 
     def _calculate_amp_completion(self) -> float:
         """Calculate what percentage of the Bible we have in AMP translation."""
-        if not self.bible_structure or not self.amp_bible:
+        if not self.bible_structure or not self.bible_store.count('amp'):
             return 0.0
         
-        total_verses = 0
-        cached_verses = 0
-        
-        # Count total verses and cached verses
-        for book in self.bible_structure:
-            if book in self.available_books:  # Only count books we recognize
-                for chapter_str, verse_count in self.bible_structure[book].items():
-                    chapter = int(chapter_str)
-                    total_verses += verse_count
-                    
-                    # Count how many verses we have cached for this chapter
-                    if (book in self.amp_bible and 
-                        str(chapter) in self.amp_bible[book]):
-                        chapter_data = self.amp_bible[book][str(chapter)]
-                        # Count actual verse entries (not just keys)
-                        for verse_num in range(1, verse_count + 1):
-                            if str(verse_num) in chapter_data and chapter_data[str(verse_num)].strip():
-                                cached_verses += 1
-        
+        total_verses = self._get_total_bible_verses()
         if total_verses == 0:
             return 0.0
         
-        return (cached_verses / total_verses) * 100.0
+        return (self.bible_store.count('amp') / total_verses) * 100.0
     
     def _cache_amp_verse(self, book: str, chapter: int, verse: int, text: str) -> bool:
         """Cache a newly scraped AMP verse to build the complete Bible."""
@@ -2498,15 +2691,8 @@ getVerse();
             return False
         
         try:
-            # Ensure the structure exists
-            if book not in self.amp_bible:
-                self.amp_bible[book] = {}
-            if str(chapter) not in self.amp_bible[book]:
-                self.amp_bible[book][str(chapter)] = {}
-            
             # Only cache if we don't already have this verse
-            if str(verse) not in self.amp_bible[book][str(chapter)]:
-                self.amp_bible[book][str(chapter)][str(verse)] = text.strip()
+            if self.bible_store.put('amp', book, chapter, verse, text):
                 
                 # Save to file immediately (to persist across restarts)
                 self._save_amp_bible()
@@ -2528,11 +2714,7 @@ getVerse();
     def _save_amp_bible(self):
         """Save the AMP Bible cache to file."""
         try:
-            amp_path = Path('data/translations/bible_amp.json')
-            amp_path.parent.mkdir(parents=True, exist_ok=True)
-            
-            with open(amp_path, 'w') as f:
-                json.dump(self.amp_bible, f, indent=2)
+            self.bible_store.save_file('amp', self._get_translation_cache_path('amp'))
             
         except Exception as e:
             self.logger.error(f"Failed to save AMP Bible cache: {e}")
@@ -2548,19 +2730,8 @@ getVerse();
         
         for book in self.available_books:
             if book in self.bible_structure:
-                book_total = 0
-                book_cached = 0
-                
-                for chapter_str, verse_count in self.bible_structure[book].items():
-                    chapter = int(chapter_str)
-                    book_total += verse_count
-                    
-                    if (book in self.amp_bible and 
-                        str(chapter) in self.amp_bible[book]):
-                        chapter_data = self.amp_bible[book][str(chapter)]
-                        for verse_num in range(1, verse_count + 1):
-                            if str(verse_num) in chapter_data and chapter_data[str(verse_num)].strip():
-                                book_cached += 1
+                book_total = sum(self.bible_structure[book].values())
+                book_cached = self.bible_store.count_book('amp', book)
                 
                 book_stats[book] = {
                     "total_verses": book_total,
@@ -2609,6 +2780,14 @@ getVerse();
                 'reference': verse_data.get('reference')
             }
             
+            event_log.record_verse(
+                verse_data.get('book'), verse_data.get('chapter'), verse_data.get('verse'),
+                self.translation, self.display_mode,
+                secondary_translation=self.secondary_translation if verse_data.get('parallel_mode') else None,
+                at=timestamp
+            )
+            
+            # The bounded in-memory history only feeds the recent-verses list in the UI
             self.statistics['detailed_verse_history'].append(history_entry)
             # Limit history size to prevent memory growth
             if len(self.statistics['detailed_verse_history']) > self.MAX_DETAILED_HISTORY:
@@ -2738,25 +2917,16 @@ getVerse();
     def _get_daily_stats(self, date_str: str) -> Dict:
         """Get statistics for a specific day."""
         try:
-            verses_on_date = [entry for entry in self.statistics['detailed_verse_history'] if entry['date'] == date_str]
-            
-            books_accessed = set(entry['book'] for entry in verses_on_date if entry['book'])
-            translations_used = {}
-            modes_used = {}
-            
-            for entry in verses_on_date:
-                trans = entry.get('translation', 'unknown')
-                mode = entry.get('mode', 'unknown')
-                translations_used[trans] = translations_used.get(trans, 0) + 1
-                modes_used[mode] = modes_used.get(mode, 0) + 1
+            day = datetime.strptime(date_str, '%Y-%m-%d').date()
+            stats = event_log.verse_stats(day, day)
             
             return {
                 'date': date_str,
-                'total_verses': len(verses_on_date),
-                'books_accessed': list(books_accessed),
-                'translations_used': translations_used,
-                'modes_used': modes_used,
-                'verses_by_hour': self._get_hourly_breakdown(verses_on_date)
+                'total_verses': stats['total'],
+                'books_accessed': list(stats['by_book']),
+                'translations_used': stats['by_translation'],
+                'modes_used': stats['by_mode'],
+                'verses_by_hour': stats['by_hour']
             }
         except Exception as e:
             self.logger.warning(f"Daily stats failed: {e}")
@@ -2765,21 +2935,15 @@ getVerse();
     def _get_weekly_stats(self) -> Dict:
         """Get statistics for the current week."""
         try:
-            now = datetime.now()
-            week_start = now - timedelta(days=now.weekday())
-            week_dates = [(week_start + timedelta(days=i)).strftime('%Y-%m-%d') for i in range(7)]
-            
-            week_verses = [entry for entry in self.statistics['detailed_verse_history'] 
-                          if entry['date'] in week_dates]
-            
-            daily_breakdown = {}
-            for date in week_dates:
-                daily_breakdown[date] = len([v for v in week_verses if v['date'] == date])
+            today = date.today()
+            week_start = today - timedelta(days=today.weekday())
+            stats = event_log.verse_stats(week_start, week_start + timedelta(days=6))
+            daily_breakdown = stats['by_day']
             
             return {
-                'week_start': week_dates[0],
-                'week_end': week_dates[-1],
-                'total_verses': len(week_verses),
+                'week_start': week_start.isoformat(),
+                'week_end': (week_start + timedelta(days=6)).isoformat(),
+                'total_verses': stats['total'],
                 'daily_breakdown': daily_breakdown,
                 'most_active_day': max(daily_breakdown.items(), key=lambda x: x[1]) if daily_breakdown else ('', 0)
             }
@@ -2790,15 +2954,14 @@ getVerse();
     def _get_monthly_stats(self) -> Dict:
         """Get statistics for the current month."""
         try:
-            this_month = datetime.now().strftime('%Y-%m')
-            month_verses = [entry for entry in self.statistics['detailed_verse_history'] 
-                           if entry['timestamp'].startswith(this_month)]
+            today = date.today()
+            stats = event_log.verse_stats(today.replace(day=1), today)
             
             return {
-                'month': this_month,
-                'total_verses': len(month_verses),
-                'books_this_month': len(set(entry['book'] for entry in month_verses if entry['book'])),
-                'avg_verses_per_day': len(month_verses) / datetime.now().day if month_verses else 0
+                'month': today.strftime('%Y-%m'),
+                'total_verses': stats['total'],
+                'books_this_month': stats['unique_books'],
+                'avg_verses_per_day': stats['total'] / today.day
             }
         except Exception as e:
             self.logger.warning(f"Monthly stats failed: {e}")
@@ -2807,16 +2970,18 @@ getVerse();
     def _get_yearly_stats(self) -> Dict:
         """Get statistics for the current year."""
         try:
-            this_year = datetime.now().strftime('%Y')
-            year_verses = [entry for entry in self.statistics['detailed_verse_history'] 
-                          if entry['timestamp'].startswith(this_year)]
+            today = date.today()
+            stats = event_log.verse_stats(today.replace(month=1, day=1), today)
+            
+            monthly_breakdown = {month: 0 for month in range(1, 13)}
+            for date_str, count in stats['by_day'].items():
+                monthly_breakdown[int(date_str[5:7])] += count
             
             return {
-                'year': this_year,
-                'total_verses': len(year_verses),
-                'unique_books': len(set(entry['book'] for entry in year_verses if entry['book'])),
-                'monthly_breakdown': {month: self.statistics['monthly_stats'].get(f"{this_year}-{month:02d}", 0) 
-                                    for month in range(1, 13)}
+                'year': today.strftime('%Y'),
+                'total_verses': stats['total'],
+                'unique_books': stats['unique_books'],
+                'monthly_breakdown': monthly_breakdown
             }
         except Exception as e:
             self.logger.warning(f"Yearly stats failed: {e}")
@@ -2825,36 +2990,25 @@ getVerse();
     def _get_custom_range_stats(self, start_date: str, end_date: str) -> Dict:
         """Get statistics for a custom date range."""
         try:
-            range_verses = [entry for entry in self.statistics['detailed_verse_history'] 
-                           if start_date <= entry['date'] <= end_date]
+            start = datetime.strptime(start_date, '%Y-%m-%d').date()
+            end = datetime.strptime(end_date, '%Y-%m-%d').date()
+            stats = event_log.verse_stats(start, end)
+            range_days = (end - start).days + 1
             
             return {
                 'start_date': start_date,
                 'end_date': end_date,
-                'total_verses': len(range_verses),
-                'date_range_days': (datetime.strptime(end_date, '%Y-%m-%d') - 
-                                   datetime.strptime(start_date, '%Y-%m-%d')).days + 1,
-                'avg_verses_per_day': len(range_verses) / max(1, (datetime.strptime(end_date, '%Y-%m-%d') - 
-                                                                datetime.strptime(start_date, '%Y-%m-%d')).days + 1)
+                'total_verses': stats['total'],
+                'date_range_days': range_days,
+                'avg_verses_per_day': stats['total'] / max(1, range_days),
+                'books_accessed': stats['by_book'],
+                'translations_used': stats['by_translation'],
+                'modes_used': stats['by_mode']
             }
         except Exception as e:
             self.logger.warning(f"Custom range stats failed: {e}")
             return {'start_date': start_date, 'end_date': end_date, 'total_verses': 0}
     
-    def _get_hourly_breakdown(self, verse_entries: List[Dict]) -> Dict:
-        """Get hourly breakdown of verses for a given day."""
-        try:
-            hourly_counts = {}
-            for entry in verse_entries:
-                timestamp = datetime.fromisoformat(entry['timestamp'])
-                hour = timestamp.hour
-                hourly_counts[hour] = hourly_counts.get(hour, 0) + 1
-            
-            return hourly_counts
-        except Exception as e:
-            self.logger.warning(f"Hourly breakdown failed: {e}")
-            return {}
-    
     def _rotate_enhanced_statistics(self):
         """Rotate enhanced statistics to prevent unbounded growth."""
         try:
@@ -2951,9 +3105,6 @@ getVerse();
             
             summary_text = " | ".join(summary_parts) if summary_parts else "Weather forecast available"
             
-            # Update mode usage statistics
-            self.statistics['mode_usage']['weather'] = self.statistics['mode_usage'].get('weather', 0) + 1
-            
             weather_verse_data = {
                 'text': summary_text,
                 'reference': 'Weather Forecast',
@@ -3027,9 +3178,6 @@ getVerse();
             
             summary_text = " | ".join(summary_parts)
             
-            # Update mode usage statistics
-            self.statistics['mode_usage']['news'] = self.statistics['mode_usage'].get('news', 0) + 1
-            
             news_verse_data = {
                 'text': summary_text,
                 'reference': f'{source} News',
@@ -3146,7 +3294,8 @@ class VerseScheduler:
     def _update_verse(self):
         """Update the displayed verse."""
         try:
-            verse_data = self.verse_manager.get_current_verse()
-            self.update_callback(verse_data)
+            prepared = self.verse_manager.prepare_verse(datetime.now())
+            self.update_callback(prepared['verse_data'])
+            self.verse_manager.commit_verse(prepared)
         except Exception as e:
             self.logger.error(f"Verse update failed: {e}")
\ No newline at end of file
@@ -587,7 +587,7 @@ class BibleClockVoiceControl:
         
         # Update current verse context
         try:
-            self.current_verse_context = self.verse_manager.get_current_verse()
+            self.current_verse_context = self.verse_manager.peek_verse()
         except Exception as e:
             self.logger.error(f"Error getting current verse: {e}")
         
@@ -651,7 +651,7 @@ class BibleClockVoiceControl:
         if any(phrase in text_lower for phrase in verse_explanation_phrases):
             if self.chatgpt_enabled:
                 try:
-                    current_verse = self.verse_manager.get_current_verse()
+                    current_verse = self.verse_manager.peek_verse()
                     if current_verse:
                         explanation_query = f"Explain this Bible verse: {current_verse.get('reference', '')} - {current_verse.get('text', '')}"
                         self.logger.info(f"Verse explanation request for: {current_verse.get('reference', '')}")
@@ -942,7 +942,7 @@ class BibleClockVoiceControl:
     def _speak_current_verse(self):
         """Speak the current verse aloud."""
         try:
-            verse_data = self.verse_manager.get_current_verse()
+            verse_data = self.verse_manager.peek_verse()
             
             if verse_data.get('is_summary'):
                 text_to_speak = f"Here is a summary for the book of {verse_data['book']}. {verse_data['text']}"
@@ -960,7 +960,7 @@ class BibleClockVoiceControl:
     def _speak_current_verse_info(self):
         """Speak information about the current verse."""
         try:
-            verse_data = self.verse_manager.get_current_verse()
+            verse_data = self.verse_manager.peek_verse()
             
             if verse_data.get('is_summary'):
                 info = f"Currently displaying a summary for the book of {verse_data['book']}"
@@ -1187,7 +1187,7 @@ class BibleClockVoiceControl:
     def _refresh_display(self):
         """Refresh the display with current verse."""
         try:
-            verse_data = self.verse_manager.get_current_verse()
+            verse_data = self.verse_manager.peek_verse()
             image = self.image_generator.create_verse_image(verse_data)
             self.display_manager.display_image(image, force_refresh=True, is_news_mode=False)
             
@@ -1664,7 +1664,7 @@ class BibleClockVoiceControl:
     def _refresh_display_silent(self):
         """Silently refresh the display without speaking."""
         try:
-            verse_data = self.verse_manager.get_current_verse()
+            verse_data = self.verse_manager.peek_verse()
             image = self.image_generator.create_verse_image(verse_data)
             self.display_manager.display_image(image, force_refresh=True, is_news_mode=False)
             self.logger.info("Display silently refreshed after speech")
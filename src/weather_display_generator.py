@@ -4,11 +4,12 @@ Generates 7-day weather forecasts for current location and Jerusalem with moon p
 """
 
 import logging
-from PIL import Image, ImageDraw, ImageFont
+from PIL import Image, ImageDraw
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple
 import os
 from weather_service import weather_service
+from font_cache import font_cache
 
 
 class WeatherDisplayGenerator:
@@ -76,22 +77,22 @@ class WeatherDisplayGenerator:
             
             if font_path:
                 self.fonts = {
-                    'title': ImageFont.truetype(font_path, 36),
-                    'header': ImageFont.truetype(font_path, 24),
-                    'day': ImageFont.truetype(font_path, 18),
-                    'temp': ImageFont.truetype(font_path, 16),
-                    'small': ImageFont.truetype(font_path, 12),
-                    'icon': ImageFont.truetype(font_path, 20)
+                    'title': font_cache.get(font_path, 36),
+                    'header': font_cache.get(font_path, 24),
+                    'day': font_cache.get(font_path, 18),
+                    'temp': font_cache.get(font_path, 16),
+                    'small': font_cache.get(font_path, 12),
+                    'icon': font_cache.get(font_path, 20)
                 }
             else:
                 # Fallback to default font
                 self.fonts = {
-                    'title': ImageFont.load_default(),
-                    'header': ImageFont.load_default(),
-                    'day': ImageFont.load_default(),
-                    'temp': ImageFont.load_default(),
-                    'small': ImageFont.load_default(),
-                    'icon': ImageFont.load_default()
+                    'title': font_cache.default(),
+                    'header': font_cache.default(),
+                    'day': font_cache.default(),
+                    'temp': font_cache.default(),
+                    'small': font_cache.default(),
+                    'icon': font_cache.default()
                 }
             
             self.logger.info(f"Fonts loaded: {font_path or 'default'}")
@@ -100,12 +101,12 @@ class WeatherDisplayGenerator:
             self.logger.error(f"Failed to load fonts: {e}")
             # Use default fonts as fallback
             self.fonts = {
-                'title': ImageFont.load_default(),
-                'header': ImageFont.load_default(),
-                'day': ImageFont.load_default(),
-                'temp': ImageFont.load_default(),
-                'small': ImageFont.load_default(),
-                'icon': ImageFont.load_default()
+                'title': font_cache.default(),
+                'header': font_cache.default(),
+                'day': font_cache.default(),
+                'temp': font_cache.default(),
+                'small': font_cache.default(),
+                'icon': font_cache.default()
             }
     
     def generate_weather_display(self) -> Optional[Image.Image]:
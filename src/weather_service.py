@@ -3,12 +3,13 @@ Weather Service - Handles weather data, location detection, and moon phases for
 Provides 7-day forecasts for current location and Jerusalem.
 """
 
-import requests
 import logging
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple
 import json
 
+from http_client import http_client
+
 
 class WeatherService:
     """Handles weather data retrieval and location detection."""
@@ -57,7 +58,7 @@ class WeatherService:
                 return self._location_cache
             
             # IP-API.com - free, no API key required
-            response = requests.get('http://ip-api.com/json/', timeout=10)
+            response = http_client.get('http://ip-api.com/json/', timeout=10)
             response.raise_for_status()
             
             data = response.json()
@@ -108,7 +109,7 @@ class WeatherService:
                 'forecast_days': 7
             }
             
-            response = requests.get(url, params=params, timeout=15)
+            response = http_client.get(url, params=params, timeout=15)
             response.raise_for_status()
             
             data = response.json()
@@ -29,7 +29,11 @@ def create_app(verse_manager, image_generator, display_manager, service_manager,
     app.service_manager = service_manager
     app.performance_monitor = performance_monitor
     app.conversation_manager = ConversationManager()
-    app.time_aggregator = TimeAggregator()
+    try:
+        from time_aggregator import time_aggregator  # Same rollups the service keeps up to date
+        app.time_aggregator = time_aggregator
+    except ImportError:
+        app.time_aggregator = TimeAggregator()
     app.bible_metrics = service_manager.bible_metrics  # Use the same instance
     
     # Rate limiting for display mode changes to prevent GPIO errors
@@ -234,7 +238,7 @@ def create_app(verse_manager, image_generator, display_manager, service_manager,
     def get_current_verse():
         """Get the current verse as JSON."""
         try:
-            verse_data = current_app.verse_manager.get_current_verse()
+            verse_data = current_app.verse_manager.peek_verse()
             verse_data['timestamp'] = datetime.now().isoformat()
             
             return jsonify({
@@ -277,11 +281,47 @@ def create_app(verse_manager, image_generator, display_manager, service_manager,
             if current_app.performance_monitor:
                 status['performance'] = current_app.performance_monitor.get_performance_summary()
             
+            # Verse source health: latency, success rate and circuit breaker state per source
+            if hasattr(current_app.verse_manager, 'get_source_stats'):
+                status['verse_sources'] = current_app.verse_manager.get_source_stats()
+            
             return jsonify({'success': True, 'data': status})
         except Exception as e:
             current_app.logger.error(f"Status API error: {e}")
             return jsonify({'success': False, 'error': str(e)}), 500
     
+    @app.route('/metrics', methods=['GET'])
+    def get_metrics():
+        """Prometheus text exposition of the in-process counters, gauges and histograms."""
+        try:
+            # Flat import so this is the same registry the render/display modules update
+            from prometheus_metrics import metrics
+            return current_app.response_class(metrics.render(), mimetype='text/plain; version=0.0.4; charset=utf-8')
+        except Exception as e:
+            current_app.logger.error(f"Metrics endpoint error: {e}")
+            return current_app.response_class(f"# metrics unavailable: {e}\n", status=500, mimetype='text/plain')
+    
+    @app.route('/api/perf/traces', methods=['GET'])
+    def get_perf_traces():
+        """Recent hot-path tracing spans and histograms; ?format=chrome downloads Chrome trace-event JSON."""
+        try:
+            if not current_app.performance_monitor:
+                return jsonify({'success': False, 'error': 'Performance monitor not available'}), 503
+            
+            if request.args.get('format') == 'chrome':
+                trace = current_app.performance_monitor.export_chrome_trace()
+                response = current_app.response_class(json.dumps(trace), mimetype='application/json')
+                filename = f"bible-clock-trace-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json"
+                response.headers['Content-Disposition'] = f'attachment; filename="{filename}"'
+                return response
+            
+            limit = min(int(request.args.get('limit', 500)), 5000)
+            name = request.args.get('name')
+            return jsonify({'success': True, 'data': current_app.performance_monitor.get_traces(limit=limit, name=name)})
+        except Exception as e:
+            current_app.logger.error(f"Perf traces API error: {e}")
+            return jsonify({'success': False, 'error': str(e)}), 500
+    
     @app.route('/api/storage', methods=['GET'])
     def get_storage_stats():
         """Get hard drive storage statistics."""
@@ -606,7 +646,7 @@ def create_app(verse_manager, image_generator, display_manager, service_manager,
             
             if should_update_display:
                 try:
-                    verse_data = current_app.verse_manager.get_current_verse()
+                    verse_data = current_app.verse_manager.peek_verse()
                     image = current_app.image_generator.create_verse_image(verse_data)
                     
                     # Determine refresh type: full refresh for background changes and parallel mode changes, partial for other settings
@@ -1067,7 +1107,7 @@ def create_app(verse_manager, image_generator, display_manager, service_manager,
     def force_refresh():
         """Force display refresh."""
         try:
-            verse_data = current_app.verse_manager.get_current_verse()
+            verse_data = current_app.verse_manager.peek_verse()
             image = current_app.image_generator.create_verse_image(verse_data)
             current_app.display_manager.display_image(image, force_refresh=True, is_news_mode=False)
             
@@ -1088,7 +1128,7 @@ def create_app(verse_manager, image_generator, display_manager, service_manager,
             else:
                 # Fallback to multiple full refreshes
                 for i in range(3):
-                    verse_data = current_app.verse_manager.get_current_verse()
+                    verse_data = current_app.verse_manager.peek_verse()
                     image = current_app.image_generator.create_verse_image(verse_data)
                     current_app.display_manager.display_image(image, force_refresh=True, is_news_mode=False)
                     if i < 2:  # Don't sleep after last refresh
@@ -1126,7 +1166,7 @@ def create_app(verse_manager, image_generator, display_manager, service_manager,
             
             # Update display if requested - always use full refresh for background changes
             if request.get_json() and request.get_json().get('update_display', False):
-                verse_data = current_app.verse_manager.get_current_verse()
+                verse_data = current_app.verse_manager.peek_verse()
                 image = current_app.image_generator.create_verse_image(verse_data)
                 current_app.display_manager.display_image(image, force_refresh=True, is_news_mode=False)
                 current_app.logger.info("Background cycled with full refresh")
@@ -1149,7 +1189,7 @@ def create_app(verse_manager, image_generator, display_manager, service_manager,
             
             # Update display if requested - always use full refresh for background changes
             if request.get_json() and request.get_json().get('update_display', False):
-                verse_data = current_app.verse_manager.get_current_verse()
+                verse_data = current_app.verse_manager.peek_verse()
                 image = current_app.image_generator.create_verse_image(verse_data)
                 current_app.display_manager.display_image(image, force_refresh=True, is_news_mode=False)
                 current_app.logger.info("Background randomized with full refresh")
@@ -1232,7 +1272,7 @@ def create_app(verse_manager, image_generator, display_manager, service_manager,
             
             # Update display if requested
             if data.get('update_display', False):
-                verse_data = current_app.verse_manager.get_current_verse()
+                verse_data = current_app.verse_manager.peek_verse()
                 image = current_app.image_generator.create_verse_image(verse_data)
                 current_app.display_manager.display_image(image, force_refresh=True, is_news_mode=False)
                 current_app.logger.info("Display updated with new background")
@@ -1257,7 +1297,7 @@ def create_app(verse_manager, image_generator, display_manager, service_manager,
             
             # Update display if requested
             if data.get('update_display', False):
-                verse_data = current_app.verse_manager.get_current_verse()
+                verse_data = current_app.verse_manager.peek_verse()
                 image = current_app.image_generator.create_verse_image(verse_data)
                 current_app.display_manager.display_image(image, force_refresh=True, is_news_mode=False)
                 current_app.logger.info("Display updated with new border")
@@ -1361,7 +1401,7 @@ def create_app(verse_manager, image_generator, display_manager, service_manager,
                     )
                 
                 # Generate preview
-                verse_data = current_app.verse_manager.get_current_verse()
+                verse_data = current_app.verse_manager.peek_verse()
                 image = current_app.image_generator.create_verse_image(verse_data)
                 
                 # Apply same transformations as actual display for accurate preview
@@ -2325,7 +2365,7 @@ def create_app(verse_manager, image_generator, display_manager, service_manager,
             
             # Check API connectivity
             try:
-                test_verse = current_app.verse_manager.get_current_verse()
+                test_verse = current_app.verse_manager.peek_verse()
                 if not test_verse or 'error' in test_verse:
                     issues.append("Bible API connectivity issues")
             except Exception:
@@ -2478,7 +2518,7 @@ def create_app(verse_manager, image_generator, display_manager, service_manager,
         """Check if Bible API is accessible."""
         try:
             # Quick test of verse retrieval
-            test_verse = current_app.verse_manager.get_current_verse()
+            test_verse = current_app.verse_manager.peek_verse()
             return bool(test_verse and 'error' not in test_verse and test_verse.get('text'))
         except Exception:
             return False
@@ -2530,6 +2570,11 @@ def create_app(verse_manager, image_generator, display_manager, service_manager,
                 if hasattr(current_app.verse_manager, 'statistics') and 'verses_cached_today' in current_app.verse_manager.statistics:
                     daily_cached = current_app.verse_manager.statistics['verses_cached_today']
                 
+                # Background bulk prefetch progress (None when disabled)
+                prefetch = None
+                if hasattr(current_app.verse_manager, 'get_translation_prefetch_progress'):
+                    prefetch = current_app.verse_manager.get_translation_prefetch_progress()
+                
                 return jsonify({
                     'success': True, 
                     'data': {
@@ -2540,7 +2585,8 @@ def create_app(verse_manager, image_generator, display_manager, service_manager,
                             'total_bible_verses': total_verses,
                             'overall_progress': current_app.verse_manager._format_completion_summary() if hasattr(current_app.verse_manager, '_format_completion_summary') else 'Not available',
                             'verses_cached_today': daily_cached
-                        }
+                        },
+                        'prefetch': prefetch
                     }
                 })
             else:
@@ -2665,33 +2711,13 @@ def create_app(verse_manager, image_generator, display_manager, service_manager,
     def _apply_display_transformations(image):
         """Apply transformations to show what the final display looks like after hardware processing."""
         try:
-            from PIL import Image as PILImage
-            import logging
-            
-            logger = logging.getLogger(__name__)
-            
-            # Create a copy to avoid modifying the original
-            transformed_image = image.copy()
-            
-            # The image generation creates a "raw" image, but the hardware applies transformations
-            # To show what users actually see, we need to apply the REVERSE of hardware transformations
-            # Hardware: mirror=true, rotation=180
-            # So preview should show: rotation=180 first, then reverse mirror
-            
-            # Step 1: Apply software rotation (same as hardware)
-            rotation_setting = os.getenv('DISPLAY_PHYSICAL_ROTATION', '180')
-            logger.info(f"Preview transformation - Rotation setting: {rotation_setting}")
-            
-            if rotation_setting == '180':
-                transformed_image = transformed_image.rotate(180)
-                logger.info("Applied 180-degree rotation to preview")
-            
-            # Step 2: Do NOT apply mirroring - the raw image is already correct for reading
-            # Hardware mirroring corrects the display, so preview should show the corrected result
-            mirror_setting = os.getenv('DISPLAY_MIRROR', 'false').lower()
-            logger.info(f"Preview transformation - Mirror setting: {mirror_setting} (not applied to preview)")
-            
-            return transformed_image
+            # The preview shows the physical rotation but not the hardware mirror (which only corrects
+            # the panel); together with the renderer's pending mirror this is at most one transpose
+            try:
+                from display_transform import TARGET_PREVIEW, display_transform
+            except ImportError:
+                from src.display_transform import TARGET_PREVIEW, display_transform
+            return display_transform.apply(image, TARGET_PREVIEW)
             
         except Exception as e:
             # If transformation fails, return original image
@@ -0,0 +1,53 @@
+"""BibleStore lazy opening, journaling and compaction."""
+
+from pathlib import Path
+
+from bible_store import BibleStore
+
+STRUCTURE = {'John': {'1': 5, '2': 3}}
+
+
+def make_store(tmp_path: Path) -> BibleStore:
+    store = BibleStore(STRUCTURE)
+    store.register('kjv', tmp_path / 'kjv.json', tmp_path / 'kjv.bin')
+    store.open_journal(tmp_path / 'journal.jsonl')
+    return store
+
+
+def test_compact_writes_files_and_truncates_journal(tmp_path):
+    store = make_store(tmp_path)
+    store.put('kjv', 'John', 1, 1, 'In the beginning was the Word')
+
+    assert store.compact() == ['kjv']
+    assert store.is_mapped('kjv')
+    assert store.get('kjv', 'John', 1, 1) == 'In the beginning was the Word'
+    assert (tmp_path / 'journal.jsonl').read_text() == ''
+
+    reopened = BibleStore(STRUCTURE)
+    reopened.register('kjv', tmp_path / 'kjv.json', tmp_path / 'kjv.bin')
+    assert reopened.peek_count('kjv') == 1
+    assert not reopened.is_mapped('kjv')  # Counting did not open the translation
+
+
+def test_verse_put_while_writing_stays_journaled(tmp_path):
+    store = make_store(tmp_path)
+    store.put('kjv', 'John', 1, 1, 'In the beginning was the Word')
+    write_json = store._write_json
+
+    def write_with_concurrent_put(data, path):
+        store.put('kjv', 'John', 2, 1, 'And the third day')
+        write_json(data, path)
+
+    store._write_json = write_with_concurrent_put
+    assert store.compact() == ['kjv']
+
+    # The late verse is not in the files yet, so it stays dirty, on the heap and in the journal
+    assert store.dirty_translations() == ['kjv']
+    assert not store.is_mapped('kjv')
+    assert store.get('kjv', 'John', 2, 1) == 'And the third day'
+    assert '"John", 2, 1' in (tmp_path / 'journal.jsonl').read_text()
+
+    replayed = BibleStore(STRUCTURE)
+    replayed.register('kjv', tmp_path / 'kjv.json', tmp_path / 'kjv.bin')
+    assert replayed.open_journal(tmp_path / 'journal.jsonl') == 1
+    assert replayed.count('kjv') == 2
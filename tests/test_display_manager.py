@@ -0,0 +1,61 @@
+import logging
+
+import pytest
+
+np = pytest.importorskip('numpy')
+Image = pytest.importorskip('PIL.Image')
+pytest.importorskip('psutil')
+
+from display_manager import DisplayManager
+from frame_diff import FrameDiffer
+
+
+class FakeDevice:
+    """Records update() calls the way the IT8951 AutoDisplay receives them."""
+
+    def __init__(self):
+        self.updates = []
+        self.prev_frame = None
+
+    def update(self, data, xy, dims, mode):
+        self.updates.append((xy, dims, len(data)))
+
+
+def make_manager(rotation):
+    manager = DisplayManager.__new__(DisplayManager)
+    manager.logger = logging.getLogger('test')
+    manager.rotation = rotation
+    manager.region_refresh_enabled = True
+    manager.frame_differ = FrameDiffer(tile_size=32)
+    manager.display_device = FakeDevice()
+    manager.last_refresh_regions = []
+    return manager
+
+
+def push(manager, image):
+    driver_image = manager._driver_oriented(image)
+    frame = np.asarray(driver_image)
+    refreshed = manager._refresh_changed_regions(driver_image, frame)
+    manager._last_pushed_frame = frame
+    return refreshed
+
+
+@pytest.mark.parametrize('rotation, xy, dims', [
+    (None, (0, 0), (32, 32)),
+    ('flip', (128, 64), (32, 32)),
+    ('CW', (64, 0), (32, 32)),
+    ('CCW', (0, 128), (32, 32)),
+])
+def test_regions_use_driver_orientation(rotation, xy, dims):
+    manager = make_manager(rotation)
+    image = Image.new('L', (160, 96), 255)
+    push(manager, image)
+
+    changed = image.copy()
+    changed.putpixel((3, 5), 0)
+    assert push(manager, changed)
+
+    assert manager.display_device.updates == [(xy, dims, dims[0] * dims[1])]
+    prev = manager.display_device.prev_frame
+    assert prev.size == manager._driver_oriented(changed).size
+    assert prev.tobytes() == manager._driver_oriented(changed).tobytes()
@@ -0,0 +1,68 @@
+"""Orientation planner against the transpose chain it replaced."""
+
+import pytest
+
+Image = pytest.importorskip('PIL.Image')
+
+from display_transform import (PENDING_INFO_KEY, TARGET_FRAME, TARGET_PANEL, TARGET_PREVIEW,
+                               DisplayTransformPlanner)
+
+MIRRORS = ('false', 'true', 'vertical', 'both')
+ROTATIONS = ('0', '180')
+
+
+def asymmetric_frame():
+    image = Image.new('L', (5, 3))
+    image.putdata(list(range(0, 150, 10)))
+    return image
+
+
+def legacy_chain(image, target, mirror, rotation):
+    """Step-by-step transposes as the renderer, panel push and web preview applied them."""
+    if mirror == 'true':
+        # Renderer: DISPLAY_MIRROR=true flipped every frame both ways
+        image = image.transpose(Image.FLIP_LEFT_RIGHT).transpose(Image.FLIP_TOP_BOTTOM)
+    if target == TARGET_PANEL:
+        if mirror in ('true', 'both'):
+            image = image.transpose(Image.FLIP_LEFT_RIGHT)
+        if mirror in ('vertical', 'both'):
+            image = image.transpose(Image.FLIP_TOP_BOTTOM)
+        if rotation == '180':
+            image = image.transpose(Image.ROTATE_180)
+    elif target == TARGET_PREVIEW and rotation == '180':
+        image = image.rotate(180)
+    return image
+
+
+@pytest.mark.parametrize('target', (TARGET_FRAME, TARGET_PANEL, TARGET_PREVIEW))
+@pytest.mark.parametrize('rotation', ROTATIONS)
+@pytest.mark.parametrize('mirror', MIRRORS)
+def test_matches_legacy_chain(monkeypatch, mirror, rotation, target):
+    monkeypatch.setenv('DISPLAY_MIRROR', mirror)
+    monkeypatch.setenv('DISPLAY_PHYSICAL_ROTATION', rotation)
+    planner = DisplayTransformPlanner()
+
+    rendered = planner.defer(asymmetric_frame())
+    oriented = planner.apply(rendered, target)
+
+    expected = legacy_chain(asymmetric_frame(), target, mirror, rotation)
+    assert oriented.tobytes() == expected.tobytes()
+    assert PENDING_INFO_KEY not in oriented.info
+
+
+def test_identity_returns_input(monkeypatch):
+    monkeypatch.setenv('DISPLAY_MIRROR', 'false')
+    monkeypatch.setenv('DISPLAY_PHYSICAL_ROTATION', '0')
+    planner = DisplayTransformPlanner()
+    frame = planner.defer(asymmetric_frame())
+    for target in (TARGET_FRAME, TARGET_PANEL, TARGET_PREVIEW):
+        assert planner.apply(frame, target) is frame
+
+
+def test_plan_follows_setting_changes(monkeypatch):
+    planner = DisplayTransformPlanner()
+    monkeypatch.setenv('DISPLAY_MIRROR', 'false')
+    monkeypatch.setenv('DISPLAY_PHYSICAL_ROTATION', '180')
+    assert planner.plan(TARGET_PANEL) == Image.ROTATE_180
+    monkeypatch.setenv('DISPLAY_PHYSICAL_ROTATION', '0')
+    assert planner.plan(TARGET_PANEL) is None
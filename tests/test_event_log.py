@@ -0,0 +1,38 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+pytest.importorskip('numpy')
+
+from event_log import EventLog
+
+
+@pytest.fixture
+def log(tmp_path):
+    return EventLog(directory=str(tmp_path / 'events'))
+
+
+def midnight(days_ago=0):
+    return datetime.now().replace(hour=0, minute=0, second=0, microsecond=0) - timedelta(days=days_ago)
+
+
+def test_range_opens_in_mode_of_earlier_change(log):
+    log.record_mode_change('weather', at=midnight(3) + timedelta(hours=10))
+    today = midnight().date()
+    usage = log.mode_usage_seconds(today, today, until=midnight() + timedelta(hours=6))
+    assert usage == {'weather': 6 * 3600.0}
+
+
+def test_seed_is_followed_by_changes_in_range(log):
+    log.record_mode_change('time', at=midnight(5) + timedelta(hours=1))
+    log.record_mode_change('weather', at=midnight(9) + timedelta(hours=1))  # Older and superseded
+    log.record_mode_change('news', at=midnight(1) + timedelta(hours=2))
+    start = midnight(1).date()
+    usage = log.mode_usage_seconds(start, start, until=midnight(1) + timedelta(hours=3))
+    assert usage == {'time': 2 * 3600.0, 'news': 3600.0}
+
+
+def test_no_mode_history_is_empty(log):
+    log.record_verse('John', 3, 16, 'kjv', 'time', at=midnight(2))
+    today = midnight().date()
+    assert log.mode_usage_seconds(today, today) == {}
@@ -0,0 +1,60 @@
+import pytest
+
+pytest.importorskip('numpy')
+Image = pytest.importorskip('PIL.Image')
+
+from frame_cache import FrameCache
+from frame_pipeline import packed_size
+
+SIZE = (8, 8)
+FRAME_BYTES = packed_size(SIZE)
+
+
+def frame(shade):
+    return Image.new('L', SIZE, shade)
+
+
+def test_lru_eviction_keeps_within_byte_budget():
+    cache = FrameCache(max_bytes=2 * FRAME_BYTES)
+    cache.put(('a',), frame(0))
+    cache.put(('b',), frame(85))
+    assert cache.get(('a',)) is not None  # 'a' is now the most recently used
+    cache.put(('c',), frame(170))
+
+    assert cache.get(('b',)) is None
+    image, pages = cache.get(('a',))
+    assert image.getpixel((0, 0)) == 0 and pages == 1
+    assert cache.get(('c',)) is not None
+    stats = cache.get_stats()
+    assert stats['frames'] == 2 and stats['bytes'] == 2 * FRAME_BYTES
+
+
+def test_frame_larger_than_budget_is_not_kept():
+    cache = FrameCache(max_bytes=FRAME_BYTES - 1)
+    cache.put(('a',), frame(0))
+    assert cache.get(('a',)) is None
+    assert cache.get_stats()['bytes'] == 0
+
+
+def test_disk_tier_survives_restart_and_rejects_truncated_frames(tmp_path):
+    FrameCache(disk_dir=str(tmp_path)).put(('a',), frame(255), pages=3)
+    FrameCache(disk_dir=str(tmp_path)).put(('b',), frame(255))
+
+    restarted = FrameCache(disk_dir=str(tmp_path))
+    image, pages = restarted.get(('a',))
+    assert image.getpixel((7, 7)) == 255 and pages == 3
+    assert restarted.disk_hits == 1
+
+    stored = restarted._disk_path(('b',))
+    stored.write_bytes(stored.read_bytes()[:-1])
+    assert FrameCache(disk_dir=str(tmp_path)).get(('b',)) is None
+
+
+def test_disabled_cache_is_a_no_op(tmp_path):
+    cache = FrameCache(disk_dir=str(tmp_path), enabled=False)
+    cache.put(('a',), frame(0))
+    assert cache.get(('a',)) is None
+    assert not list(tmp_path.iterdir())
+    stats = cache.get_stats()
+    assert stats['enabled'] is False
+    assert stats['frames'] == 0 and stats['hits'] == 0 and stats['misses'] == 0
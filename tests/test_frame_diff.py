@@ -0,0 +1,85 @@
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from display_constants import DisplayModes
+from frame_diff import FrameDiffer
+
+
+def blank(height=128, width=160):
+    return np.full((height, width), 255, dtype=np.uint8)
+
+
+def test_no_baseline_or_new_size_needs_whole_frame():
+    differ = FrameDiffer(tile_size=32)
+    assert differ.diff_regions(None, blank()) is None
+    assert differ.diff_regions(blank(128, 128), blank()) is None
+
+
+def test_identical_frames_have_no_regions():
+    assert FrameDiffer(tile_size=32).diff_regions(blank(), blank()) == []
+
+
+def test_diagonal_tiles_merge_into_one_region():
+    differ = FrameDiffer(tile_size=32)
+    current = blank()
+    current[5, 5] = 0     # tile (0, 0)
+    current[40, 40] = 0   # tile (1, 1), touching diagonally
+    assert differ.diff_regions(blank(), current) == [(0, 0, 64, 64)]
+
+
+def test_separate_changes_stay_separate():
+    differ = FrameDiffer(tile_size=32)
+    current = blank()
+    current[5, 5] = 0
+    current[100, 130] = 0
+    assert sorted(differ.diff_regions(blank(), current)) == [(0, 0, 32, 32), (128, 96, 160, 128)]
+
+
+def test_overlapping_boxes_are_merged():
+    differ = FrameDiffer(tile_size=4, max_area_ratio=1.0)
+    current = blank(32, 32)
+    # An L around a separate tile: their bounding boxes overlap, so they become one region
+    current[0:4, 0:24] = 0
+    current[0:24, 0:4] = 0
+    current[12, 12] = 0
+    assert differ.diff_regions(blank(32, 32), current) == [(0, 0, 24, 24)]
+
+
+def test_regions_are_aligned_to_four_pixels():
+    differ = FrameDiffer(tile_size=30)
+    assert differ.tile_size == 28
+    current = blank(100, 100)
+    current[60, 30] = 0
+    current[99, 99] = 0
+    for left, top, right, bottom in differ.diff_regions(blank(100, 100), current):
+        assert left % 4 == 0 and (right - left) % 4 == 0
+        assert right <= 100 and bottom <= 100
+
+
+def test_large_changes_fall_back_to_whole_frame():
+    differ = FrameDiffer(tile_size=32, max_area_ratio=0.5)
+    current = blank()
+    current[:, :96] = 0
+    assert differ.diff_regions(blank(), current) is None
+    current = blank()
+    current[:, :64] = 0
+    assert differ.diff_regions(blank(), current) == [(0, 0, 64, 128)]
+
+
+def test_too_many_regions_fall_back_to_whole_frame():
+    differ = FrameDiffer(tile_size=4, max_regions=2, max_area_ratio=1.0)
+    current = blank(32, 32)
+    for offset in (0, 12, 24):
+        current[offset, offset] = 0
+    assert differ.diff_regions(blank(32, 32), current) is None
+
+
+def test_mode_is_du_for_black_and_white_and_gc16_for_grayscale():
+    differ = FrameDiffer()
+    text = blank(32, 32)
+    text[8:24, 8:24] = 0
+    assert differ.choose_mode(text) == DisplayModes.DU
+    assert differ.choose_mode(blank(32, 32)) == DisplayModes.DU
+    gradient = np.tile(np.arange(0, 256, 8, dtype=np.uint8), (32, 1))
+    assert differ.choose_mode(gradient) == DisplayModes.GC16
@@ -0,0 +1,43 @@
+import pytest
+
+pytest.importorskip('numpy')
+Image = pytest.importorskip('PIL.Image')
+
+from frame_pipeline import (QUANTISED_INFO_KEY, is_quantised, mark_unquantised, pack_4bpp, packed_size,
+                            quantize_for_panel, unpack_4bpp)
+
+
+def gradient(size, mode='L'):
+    width, height = size
+    image = Image.new('L', size)
+    image.putdata([(x * 37 + y * 11) % 256 for y in range(height) for x in range(width)])
+    return image.convert(mode)
+
+
+def test_quantise_rounds_to_nearest_panel_level():
+    image = Image.new('L', (4, 1))
+    image.putdata([8, 9, 246, 255])
+    assert list(quantize_for_panel(image).getdata()) == [0, 17, 238, 255]
+
+
+def test_quantise_converts_and_tags_non_grey_input():
+    quantised = quantize_for_panel(gradient((6, 4), 'RGB'))
+    assert quantised.mode == 'L'
+    assert is_quantised(quantised)
+    assert all(value % 17 == 0 for value in quantised.getdata())
+    assert quantize_for_panel(quantised) is quantised
+    assert not is_quantised(mark_unquantised(quantised))
+
+
+@pytest.mark.parametrize('size', [(8, 3), (7, 3), (1, 5)])
+def test_pack_round_trip(size):
+    image = gradient(size)
+    assert not is_quantised(image)
+    packed = pack_4bpp(image)
+    assert len(packed) == packed_size(size)
+
+    restored = unpack_4bpp(packed, size)
+    assert restored.size == size
+    assert restored.info[QUANTISED_INFO_KEY] == 16
+    assert restored.tobytes() == quantize_for_panel(image).tobytes()
+    assert pack_4bpp(restored) == packed
@@ -0,0 +1,68 @@
+"""HttpClient retry policy against a local stub HTTP server."""
+
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+pytest.importorskip('requests')
+
+from http_client import HttpClient
+
+
+class ThrottlingHandler(BaseHTTPRequestHandler):
+    """/throttled answers 429 with a long Retry-After, /error answers 500."""
+
+    def do_GET(self):
+        with self.server.lock:
+            self.server.requests.append(self.path)
+        self.send_response(429 if self.path == '/throttled' else 500)
+        if self.path == '/throttled':
+            self.send_header('Retry-After', '30')
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def stub_server():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), ThrottlingHandler)
+    server.daemon_threads = True
+    server.lock = threading.Lock()
+    server.requests = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def url(server, path):
+    return f"http://127.0.0.1:{server.server_address[1]}{path}"
+
+
+def test_no_retries_returns_throttling_at_once(stub_server):
+    client = HttpClient(retries=2, backoff_factor=0)
+    start = time.monotonic()
+    response = client.get(url(stub_server, '/throttled'), timeout=5, retries=0)
+    assert response.status_code == 429
+    assert time.monotonic() - start < 5
+    assert stub_server.requests == ['/throttled']
+
+
+def test_default_session_still_retries_server_errors(stub_server):
+    client = HttpClient(retries=2, backoff_factor=0)
+    response = client.get(url(stub_server, '/error'), timeout=5)
+    assert response.status_code == 500
+    assert stub_server.requests == ['/error'] * 3
+
+
+def test_sessions_are_kept_per_retry_policy(stub_server):
+    client = HttpClient(retries=2)
+    target = url(stub_server, '/error')
+    assert client.session_for(target) is client.session_for(target, 2)
+    assert client.session_for(target, 0) is not client.session_for(target)
+    assert client.get_stats()['hosts'] == [url(stub_server, '')]
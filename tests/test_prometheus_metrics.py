@@ -0,0 +1,41 @@
+"""Prometheus metrics rendering."""
+
+import gc
+import threading
+
+from prometheus_metrics import MetricsRegistry, _GCPauseRecorder
+
+
+def test_histogram_render_format():
+    registry = MetricsRegistry()
+    histogram = registry.histogram('test_seconds', 'Test latency', ['mode'], buckets=(0.1, 1.0))
+    histogram.observe(0.05, mode='verse')
+    histogram.observe(0.5, mode='verse')
+
+    lines = registry.render().splitlines()
+    assert 'test_seconds_bucket{mode="verse",le="0.1"} 1' in lines
+    assert 'test_seconds_bucket{mode="verse",le="+Inf"} 2' in lines
+    assert 'test_seconds_count{mode="verse"} 2' in lines
+
+
+def test_gc_pause_recording_does_not_deadlock_a_scrape():
+    registry = MetricsRegistry()
+    histogram = registry.gc_pause_histogram('test_gc_pause_seconds', 'GC pauses', buckets=(0.001, 0.01))
+    recorder = _GCPauseRecorder(histogram)
+    thresholds = gc.get_threshold()
+    gc.callbacks.append(recorder)
+    gc.set_threshold(1, 1, 1)  # Collect on nearly every allocation, including inside render()
+    try:
+        rendered = []
+        scraper = threading.Thread(target=lambda: rendered.extend(registry.render() for _ in range(50)),
+                                   daemon=True)
+        scraper.start()
+        scraper.join(10)
+        assert not scraper.is_alive(), "render() deadlocked against the gc callback"
+    finally:
+        gc.set_threshold(*thresholds)
+        gc.callbacks.remove(recorder)
+
+    assert len(rendered) == 50
+    count_lines = [line for line in rendered[-1].splitlines() if line.startswith('test_gc_pause_seconds_count')]
+    assert sum(int(line.split()[-1]) for line in count_lines) > 0
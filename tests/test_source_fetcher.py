@@ -0,0 +1,162 @@
+"""HedgedFetcher against a local stub HTTP server."""
+
+import json
+import threading
+import time
+import urllib.error
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from source_fetcher import CircuitBreaker, HedgedFetcher
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """/fast answers at once, /slow after a delay, /fail with a 500, /empty with no text, /flaky as configured."""
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.requests.append(self.path)
+        if self.path == '/slow':
+            time.sleep(server.slow_delay)
+        if self.path == '/fail' or (self.path == '/flaky' and server.flaky_failing):
+            self.send_response(500)
+            self.end_headers()
+            return
+        body = json.dumps({'text': '' if self.path == '/empty' else f"verse from {self.path[1:]}"}).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def stub_server():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StubHandler)
+    server.daemon_threads = True
+    server.lock = threading.Lock()
+    server.requests = []
+    server.slow_delay = 1.0
+    server.flaky_failing = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def http_source(server, path):
+    def fetch():
+        url = f"http://127.0.0.1:{server.server_address[1]}{path}"
+        with urllib.request.urlopen(url, timeout=5) as response:
+            return json.loads(response.read().decode('utf-8'))
+    return path[1:], fetch
+
+
+@pytest.fixture
+def fetcher():
+    fetcher = HedgedFetcher(max_workers=4, hedge_delay=0.1, timeout=5.0,
+                            failure_threshold=2, base_cooldown=0.2, max_cooldown=1.0)
+    yield fetcher
+    fetcher.shutdown()
+
+
+def test_slow_leader_is_hedged_by_the_next_source(stub_server, fetcher):
+    start = time.monotonic()
+    name, result = fetcher.fetch([http_source(stub_server, '/slow'), http_source(stub_server, '/fast')])
+
+    assert name == 'fast'
+    assert result['text'] == 'verse from fast'
+    assert time.monotonic() - start < stub_server.slow_delay
+    # The configured priority order is kept: the slow source was started first
+    assert stub_server.requests[:2] == ['/slow', '/fast']
+
+
+def test_first_valid_result_wins_after_failures(stub_server, fetcher):
+    fetcher.hedge_delay = 5.0  # Failures must move on without waiting for the hedge
+    start = time.monotonic()
+    name, result = fetcher.fetch([http_source(stub_server, '/fail'), http_source(stub_server, '/empty'),
+                                  http_source(stub_server, '/fast')])
+
+    assert name == 'fast'
+    assert result['text'] == 'verse from fast'
+    assert time.monotonic() - start < 2.0
+    stats = fetcher.get_stats()
+    assert stats['fail']['failures'] == 1
+    assert stats['empty']['failures'] == 1
+    assert stats['fast']['successes'] == 1
+
+
+def test_no_valid_source_returns_nothing(stub_server, fetcher):
+    assert fetcher.fetch([http_source(stub_server, '/fail'), http_source(stub_server, '/empty')]) == (None, None)
+
+
+def test_breaker_opens_probes_half_open_and_closes(stub_server, fetcher):
+    flaky = http_source(stub_server, '/flaky')
+    fast = http_source(stub_server, '/fast')
+
+    for _ in range(2):
+        assert fetcher.fetch([flaky]) == (None, None)
+    assert fetcher.breakers['flaky'].state == CircuitBreaker.OPEN
+
+    # While open the source is skipped entirely
+    requests_before = len(stub_server.requests)
+    assert fetcher.fetch([flaky, fast])[0] == 'fast'
+    assert '/flaky' not in stub_server.requests[requests_before:]
+
+    # After the cool-down a single half-open probe is let through, and its success closes the breaker
+    time.sleep(0.25)
+    stub_server.flaky_failing = False
+    seen_states = []
+
+    def probe():
+        seen_states.append(fetcher.breakers['flaky'].state)
+        return flaky[1]()
+
+    assert fetcher.fetch([('flaky', probe)])[0] == 'flaky'
+    assert seen_states == [CircuitBreaker.HALF_OPEN]
+    assert fetcher.breakers['flaky'].state == CircuitBreaker.CLOSED
+    assert fetcher.breakers['flaky'].consecutive_failures == 0
+
+
+def test_failed_probe_reopens_with_longer_cooldown(stub_server, fetcher):
+    flaky = http_source(stub_server, '/flaky')
+    for _ in range(2):
+        fetcher.fetch([flaky])
+    time.sleep(0.25)
+
+    assert fetcher.fetch([flaky]) == (None, None)
+    breaker = fetcher.breakers['flaky']
+    assert breaker.state == CircuitBreaker.OPEN
+    assert breaker.cooldown == pytest.approx(0.4)
+
+
+def test_release_unlaunched_returns_probe_slots(fetcher):
+    a = ('a', lambda: {'text': 'a'})
+    b = ('b', lambda: {'text': 'b'})
+    for _ in range(2):
+        fetcher.record('b', False, 0.01, 'down')
+    time.sleep(0.25)
+
+    # order_sources() claims b's probe slot; a succeeds first, so b is never started
+    sources = fetcher.order_sources([a, b])
+    assert [name for name, _ in sources] == ['a', 'b']
+    fetcher.release_unlaunched(sources, {'a'})
+
+    assert fetcher.breakers['b'].state == CircuitBreaker.HALF_OPEN
+    assert [name for name, _ in fetcher.order_sources([a, b])] == ['a', 'b']
+
+
+def test_next_retry_in_reports_earliest_cooldown(fetcher):
+    assert fetcher.next_retry_in(['untried']) == 0.0
+    for _ in range(2):
+        fetcher.record('b', False, 0.01, 'down')
+    assert 0.0 < fetcher.next_retry_in(['b']) <= 0.2
+    fetcher.record('a', True, 0.01)
+    assert fetcher.next_retry_in(['a', 'b']) == 0.0
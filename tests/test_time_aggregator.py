@@ -0,0 +1,42 @@
+"""TimeAggregator incremental rollups."""
+
+from time_aggregator import TimeAggregator
+
+
+def day_record(conversations, hour):
+    return {
+        'total_conversations': conversations,
+        'categories': {'verse': conversations},
+        'keywords': {'peace': conversations},
+        'hourly_distribution': {str(hour): conversations},
+        'avg_response_time': 1.5,
+        'success_rate': 100,
+        'translation_usage': {'kjv': conversations},
+        'bible_books_accessed': {'John': conversations}
+    }
+
+
+def test_incremental_rollups_match_a_full_rebuild(tmp_path):
+    aggregator = TimeAggregator(data_dir=str(tmp_path))
+    aggregator.apply_day('2026-03-02', day_record(3, 9))
+    aggregator.apply_day('2026-03-03', day_record(2, 10))
+    aggregator.apply_day('2026-03-03', day_record(5, 11))  # The open day changed during the day
+
+    incremental = aggregator.get_filtered_data('monthly', '2026-03-03')
+    aggregator.update_all_aggregations()
+    assert aggregator.get_filtered_data('monthly', '2026-03-03') == incremental
+    assert incremental['total_conversations'] == 8
+    assert incremental['daily_breakdown'] == {'2026-03-02': 3, '2026-03-03': 5}
+
+
+def test_materialized_metrics_do_not_share_bucket_dicts(tmp_path):
+    aggregator = TimeAggregator(data_dir=str(tmp_path))
+    aggregator.apply_day('2026-03-02', day_record(3, 9))
+    week = aggregator.weekly_data[aggregator.get_week_key('2026-03-02')]
+
+    aggregator.apply_day('2026-03-03', day_record(2, 10))
+
+    # Readers copying an older snapshot never see the service thread mutate it
+    assert week.daily_breakdown == {'2026-03-02': 3}
+    chart = aggregator.get_chart_data('weekly', 'daily_trend', '2026-03-03')
+    assert chart == {'labels': ['2026-03-02', '2026-03-03'], 'data': [3, 2]}
@@ -0,0 +1,77 @@
+"""TranslationPrefetcher source handling against shared circuit breakers."""
+
+import time
+
+import pytest
+
+from bible_store import BibleStore
+from source_fetcher import CircuitBreaker, HedgedFetcher
+from translation_prefetcher import TranslationPrefetcher
+
+STRUCTURE = {'John': {'1': 3}}
+
+
+class FakeVerseManager:
+    def __init__(self, sources):
+        self.bible_structure = STRUCTURE
+        self.bible_store = BibleStore(STRUCTURE)
+        self.source_fetcher = HedgedFetcher(hedge_delay=0.05, failure_threshold=2, base_cooldown=0.3)
+        self.sources = sources
+
+    def get_cache_fill_sources(self, book, chapter, verse, translation):
+        return self.sources
+
+    def get_source_host(self, api_source):
+        return api_source
+
+    def _cache_translation_verse(self, book, chapter, verse, text, translation):
+        self.bible_store.put(translation, book, chapter, verse, text)
+
+
+@pytest.fixture
+def make_prefetcher(tmp_path):
+    created = []
+
+    def make(sources):
+        vm = FakeVerseManager(sources)
+        prefetcher = TranslationPrefetcher(vm, ['kjv'], host_interval=0.0,
+                                           checkpoint_path=str(tmp_path / 'checkpoint.json'), start_delay=0)
+        created.append(vm)
+        return prefetcher, vm
+
+    yield make
+    for vm in created:
+        vm.source_fetcher.shutdown()
+
+
+def test_skipped_sources_do_not_keep_probe_slots(make_prefetcher):
+    prefetcher, vm = make_prefetcher([('a', lambda: {'text': 'In the beginning'}), ('b', lambda: {'text': 'unused'})])
+    for _ in range(2):
+        vm.source_fetcher.record('b', False, 0.01, 'down')
+    time.sleep(0.35)
+
+    assert prefetcher._fetch_verse('kjv', 'John', 1, 1) is True
+    assert vm.source_fetcher.breakers['b'].state == CircuitBreaker.HALF_OPEN
+    assert [name for name, _ in vm.source_fetcher.order_sources(vm.sources)] == ['a', 'b']
+
+
+def test_open_breakers_pause_instead_of_failing(make_prefetcher):
+    prefetcher, vm = make_prefetcher([('a', lambda: {'text': 'In the beginning'})])
+    for _ in range(2):
+        vm.source_fetcher.record('a', False, 0.01, 'down')
+
+    start = time.monotonic()
+    assert prefetcher._fetch_verse('kjv', 'John', 1, 1) is True
+    assert time.monotonic() - start >= 0.25
+    assert prefetcher.progress['kjv']['failed'] == 0
+    assert vm.bible_store.get('kjv', 'John', 1, 1) == 'In the beginning'
+
+
+def test_stop_interrupts_the_pause(make_prefetcher):
+    prefetcher, vm = make_prefetcher([('a', lambda: {'text': 'In the beginning'})])
+    for _ in range(2):
+        vm.source_fetcher.record('a', False, 0.01, 'down')
+    prefetcher._stop.set()
+
+    assert prefetcher._fetch_verse('kjv', 'John', 1, 1) is None
+    assert prefetcher.progress['kjv']['failed'] == 0